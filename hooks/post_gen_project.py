@@ -85,12 +85,43 @@ def main() -> None:
     if include_entity and include_entity.lower().strip() == "no":
         entity_files = [
             "app/services/entity_service.py",
+            "app/services/entity_loader.py",
+            "app/repositories/sqlite_repository.py",
+            "app/repositories/caching_repository.py",
+            "app/repositories/columnar_store.py",
+            "app/repositories/shared_memory_repository.py",
+            "app/repositories/persistent_repository.py",
+            "app/repositories/instrumented_repository.py",
+            "app/repositories/coalescing_repository.py",
             "app/schemas/entity.py",
             "app/api/v1/endpoints/entities.py",
             "tests/unit/domain/test_entity.py",
             "tests/unit/services/test_entity_service.py",
+            "tests/unit/services/test_entity_loader.py",
             "tests/unit/api/test_entity_endpoint.py",
             "tests/integration/test_entity_flow.py",
+            "tests/benchmarks/test_list_entities_benchmark.py",
+            "tests/benchmarks/test_entity_query_benchmark.py",
+            "tests/benchmarks/test_export_benchmark.py",
+            "tests/benchmarks/test_import_benchmark.py",
+            "tests/unit/repositories/test_sqlite_repository.py",
+            "tests/benchmarks/test_sqlite_repository_benchmark.py",
+            "tests/unit/repositories/test_caching_repository.py",
+            "tests/benchmarks/test_caching_repository_benchmark.py",
+            "tests/benchmarks/test_coalescing_repository_benchmark.py",
+            "tests/benchmarks/test_entity_loader_benchmark.py",
+            "tests/benchmarks/test_serialization_benchmark.py",
+            "tests/unit/repositories/test_columnar_store.py",
+            "tests/unit/repositories/test_shared_memory_repository.py",
+            "tests/benchmarks/test_shared_memory_repository_benchmark.py",
+            "tests/unit/repositories/test_persistent_repository.py",
+            "tests/unit/repositories/test_instrumented_repository.py",
+            "tests/unit/repositories/test_coalescing_repository.py",
+            "tests/benchmarks/test_persistent_repository_benchmark.py",
+            "tests/benchmarks/test_storage_engine_benchmark.py",
+            "tests/benchmarks/test_repository_benchmark.py",
+            "app/core/loadtest.py",
+            "tests/unit/core/test_loadtest.py",
             # Note: tests/unit/repositories/test_memory_repository.py is NOT removed
             # because it's conditionally included in the template and will be empty/commented
             # when include_entity_example == "no"
@@ -0,0 +1,59 @@
+"""
+Helpers for conditional requests (ETag, If-None-Match, If-Match).
+
+Kept free of domain knowledge: callers decide what an ETag is derived from,
+these helpers only format and compare entity tags as defined in RFC 9110.
+"""
+
+from fastapi import Response
+from fastapi import status
+
+ANY = "*"
+
+
+def make_etag(value: int | str) -> str:
+    """Format a strong entity tag."""
+    return f'"{value}"'
+
+
+def parse_etag(tag: str) -> int | None:
+    """Return the integer in a strong tag made by `make_etag`, or None for any other tag."""
+    value = tag.removeprefix('"').removesuffix('"')
+    if tag != make_etag(value) or not value.isdigit():
+        return None
+    return int(value)
+
+
+def parse_etags(header: str) -> list[str]:
+    """Split an If-Match/If-None-Match header into its entity tags.
+
+    `*` is returned as a single-element list.
+    """
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def none_match(header: str | None, etag: str) -> bool:
+    """Evaluate If-None-Match: True if the client's copy is still current.
+
+    Uses weak comparison, as required for If-None-Match.
+    """
+    if header is None:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(tag == ANY or tag.removeprefix("W/") == opaque for tag in parse_etags(header))
+
+
+def matching_etags(header: str) -> set[str] | None:
+    """Return the strong entity tags an If-Match header accepts, or None for `*`.
+
+    Weak tags never satisfy If-Match, so they are dropped.
+    """
+    tags = parse_etags(header)
+    if ANY in tags:
+        return None
+    return {tag for tag in tags if not tag.startswith("W/")}
+
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 response carrying the current entity tag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -1,24 +1,51 @@
-from app.core.container import get_container
-from app.domain.protocols import Repository
+"""
+Request dependencies.
+
+Dependencies are resolved once, when the application starts, and stored on
+`app.state` (see the lifespan in app/api/router.py). The providers below only
+read them back. They are async so FastAPI calls them on the event loop rather
+than sending each call to its threadpool. Tests can replace any of them with
+`app.dependency_overrides`.
+"""
 {% if cookiecutter.include_entity_example == "yes" %}
+from fastapi import Depends
+{%- endif %}
+from fastapi import Request
+
+from app.domain.protocols import Repository
+{%- if cookiecutter.include_entity_example == "yes" %}
+from app.services.entity_loader import EntityLoader
 from app.services.entity_service import EntityService
-{% endif %}
+{%- endif %}
 
 
-def get_repository() -> Repository:
-    """Get repository instance from container."""
-    return get_container().repository
+async def get_repository(request: Request) -> Repository:
+    """Get the repository resolved at application startup."""
+    return request.app.state.repository
+{%- if cookiecutter.include_entity_example == "yes" %}
+
+
+async def get_entity_service(request: Request) -> EntityService:
+    """Get the EntityService resolved at application startup."""
+    return request.app.state.entity_service
+
+
+async def get_entity_loader(
+    service: EntityService = Depends(get_entity_service),
+) -> EntityLoader:
+    """Get a new EntityLoader, batching and caching entity lookups for this request.
+
+    It reads from the entity service's repository, so overriding
+    `get_entity_service` also changes where the loader reads from.
+    """
+    return EntityLoader(service.repository)
+{%- else %}
 
 
-{% if cookiecutter.include_entity_example == "yes" %}
-def get_entity_service() -> EntityService:
-    """Get EntityService instance from container."""
-    return get_container().entity_service
-{% else %}
 # Example: Add your service dependency functions here
 # from app.services.entity_service import EntityService
-# 
-# def get_entity_service() -> EntityService:
-#     """Get EntityService instance from container."""
-#     return get_container().entity_service
-{% endif %}
+#
+# async def get_entity_service(request: Request) -> EntityService:
+#     """Get the EntityService resolved at application startup."""
+#     return request.app.state.entity_service
+{%- endif %}
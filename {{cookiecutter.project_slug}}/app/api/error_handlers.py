@@ -11,8 +11,10 @@ from fastapi import status
 from fastapi.responses import JSONResponse
 
 {% if cookiecutter.include_entity_example == "yes" %}
+from app.api.conditional import make_etag
 from app.domain.errors import EntityNotFoundError
 from app.domain.errors import EntityValidationError
+from app.domain.errors import EntityVersionConflictError
 
 
 async def entity_not_found_handler(
@@ -39,6 +41,29 @@ async def entity_validation_error_handler(
         status_code=status.HTTP_400_BAD_REQUEST,
         content={"error": str(exc)},
     )
+
+
+async def entity_version_conflict_handler(
+    request: Request,
+    exc: Exception,
+) -> JSONResponse:
+    """Handle EntityVersionConflictError exceptions.
+
+    Conflicts with a version from an If-Match header get 412 Precondition
+    Failed; others, such as a stale `expected_version` in the body, get 409
+    Conflict. Either way the current ETag is returned so the client can
+    refetch and retry.
+    """
+    if not isinstance(exc, EntityVersionConflictError):
+        raise TypeError("Expected EntityVersionConflictError")
+    status_code = (
+        status.HTTP_412_PRECONDITION_FAILED if exc.from_if_match else status.HTTP_409_CONFLICT
+    )
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": str(exc), "entity_id": exc.entity_id, "version": exc.actual_version},
+        headers={"ETag": make_etag(exc.actual_version)},
+    )
 {% else %}
 # Example: Add your error handlers here
 # from app.domain.errors import EntityNotFoundError
@@ -0,0 +1,386 @@
+"""
+ASGI middleware.
+
+Written as plain ASGI callables rather than BaseHTTPMiddleware, which adds a
+task and a response stream wrapper to every request.
+"""
+
+import asyncio
+import cProfile
+import io
+import logging
+import math
+import pstats
+import re
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from starlette.datastructures import MutableHeaders
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from app.core.logging import request_id
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAMETER = "profile"
+PROFILE_FILE_HEADER = "X-Profile-File"
+# Functions listed in the logged profile summary
+PROFILE_SUMMARY_LINES = 20
+
+# Route label for requests that matched no route, so scans cannot add series
+UNMATCHED_ROUTE = "unmatched"
+
+_KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code.",
+    ("method", "route", "status"),
+)
+
+RATE_LIMITED = registry.counter(
+    "http_requests_rate_limited_total",
+    "HTTP requests rejected with 429 by the rate limiter.",
+)
+
+# Suffix of a rate limit cost key pricing GET requests sent without a limit parameter
+UNPAGINATED = " unpaginated"
+
+_RATE_LIMITED_BODY = b'{"detail":"Too many requests"}'
+_LIMIT_PARAMETER = re.compile(rb"(?:^|&)limit(?:=|&|$)")
+
+# Incoming IDs end up in log lines, so anything else is replaced
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+
+class RequestIdMiddleware:
+    """Give each request an ID for log records and echo it in the response.
+
+    A well-formed incoming X-Request-ID header is reused, so one request can be
+    followed across services; otherwise a new ID is generated.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap an ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle one ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        incoming = next(
+            (value for name, value in scope["headers"] if name == b"x-request-id"), b""
+        ).decode("latin-1")
+        value = incoming if _VALID_REQUEST_ID.fullmatch(incoming) else uuid.uuid4().hex
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = value
+            await send(message)
+
+        token = request_id.set(value)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id.reset(token)
+
+
+class RouteTemplates:
+    """Full path templates of the routes of included routers.
+
+    FastAPI puts the included router's own route in the scope, whose path lacks
+    the prefix it was included with, so the prefix is recorded at include time.
+    Routes are told apart by identity: two routers may share a relative path.
+    """
+
+    def __init__(self) -> None:
+        """Start with no included routes."""
+        self._templates: dict[int, str] = {}
+
+    def include(self, routes: Iterable[BaseRoute], prefix: str) -> None:
+        """Record the routes of a router included with `prefix`."""
+        for route in routes:
+            path = getattr(route, "path", None)
+            if isinstance(path, str):
+                self._templates[id(route)] = prefix + path
+
+    def label(self, route: object) -> str:
+        """Return the full template of a matched route, or UNMATCHED_ROUTE for none."""
+        if route is None:
+            return UNMATCHED_ROUTE
+        template = self._templates.get(id(route))
+        return template if template is not None else getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """Record the latency of every HTTP request by method, route and status.
+
+    Routes are labelled by their full template (e.g. /api/v1/entities/{entity_id}),
+    so the number of series stays bounded. Routes of included routers are only
+    labelled with their prefix if it was recorded in `route_templates`.
+    """
+
+    def __init__(self, app: ASGIApp, route_templates: RouteTemplates | None = None) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app: ASGI application
+            route_templates: Prefixes of the included routers' routes
+        """
+        self.app = app
+        self._route_templates = route_templates if route_templates is not None else RouteTemplates()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle one ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            method = scope["method"]
+            route = self._route_templates.label(scope.get("route"))
+            REQUEST_DURATION.labels(
+                method if method in _KNOWN_METHODS else "OTHER", route, str(status)
+            ).observe(elapsed)
+
+
+class ProfilingMiddleware:
+    """Profile the requests that ask for it with cProfile.
+
+    A request is profiled when its X-Profile header or `profile` query
+    parameter matches `token` (any value when no token is set). The stats are
+    written as a pstats file to `directory`, whose name the response carries
+    in X-Profile-File, and the functions with the highest cumulative time are
+    logged. Open the file with `python -m pstats` or a viewer such as snakeviz.
+
+    cProfile follows the event loop thread, so other requests that run while a
+    profiled one awaits show up in its profile; profile on an otherwise idle
+    worker. Only one request is profiled at a time; others asking meanwhile
+    are served without profiling. Work handed to other threads is not covered.
+    """
+
+    def __init__(self, app: ASGIApp, directory: str, token: str | None = None) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app: ASGI application
+            directory: Directory the profiles are written to
+            token: Value the trigger must carry (None accepts any value)
+        """
+        self.app = app
+        self._directory = Path(directory)
+        self._token = token
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle one ASGI connection, profiling it if requested."""
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if self._active:
+            logger.warning("Not profiling %s: another request is being profiled", scope["path"])
+            await self.app(scope, receive, send)
+            return
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._directory / _profile_name(scope)
+
+        async def send_with_file(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILE_FILE_HEADER] = path.name
+            await send(message)
+
+        self._active = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_file)
+        finally:
+            profiler.disable()
+            self._active = False
+            await asyncio.to_thread(_save_profile, profiler, path)
+
+    def _requested(self, scope: Scope) -> bool:
+        """Return whether the request asks to be profiled with a valid token."""
+        header = PROFILE_HEADER.lower().encode()
+        values = [value.decode("latin-1") for name, value in scope["headers"] if name == header]
+        if scope["query_string"]:
+            query = parse_qs(scope["query_string"].decode("latin-1"))
+            values.extend(query.get(PROFILE_QUERY_PARAMETER, []))
+        return any(self._token is None or value == self._token for value in values)
+
+
+@dataclass(slots=True)
+class _Bucket:
+    tokens: float
+    updated: float
+
+
+class RateLimitMiddleware:
+    """Limit the request rate of each client with a token bucket.
+
+    Clients are told apart by `key_header` when one is configured and sent, and
+    by their address otherwise. A bucket holds up to `burst` tokens and refills
+    at `per_second`; each request takes its route's cost, or is answered 429
+    with a Retry-After header when the bucket holds too few tokens.
+
+    Costs are looked up by method and exact path (`"GET /entities/export"`), so
+    nothing is matched before the router runs; routes with path parameters cost
+    1. A key ending in " unpaginated" prices GET requests without a `limit`
+    query parameter. Costs above `burst` are capped at it, and a cost of 0
+    exempts a route.
+
+    Only the `max_clients` most recently seen clients are tracked; a forgotten
+    client starts again with a full bucket. Buckets are per worker process.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        per_second: float,
+        burst: float,
+        costs: Mapping[str, float] | None = None,
+        key_header: str | None = None,
+        max_clients: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app: ASGI application
+            per_second: Tokens added to each client's bucket per second
+            burst: Tokens a bucket holds at most, and holds when first seen
+            costs: Tokens taken by requests to a route, keyed "METHOD /path"
+            key_header: Header identifying clients, e.g. an API key; only use one
+                that is authenticated upstream, or clients can pick a new value
+                for every request (None keys clients by address)
+            max_clients: Clients tracked at once; the least recently seen are
+                forgotten first
+            clock: Monotonic time source, in seconds
+
+        Raises:
+            ValueError: If a cost key is not of the form "METHOD /path"
+        """
+        self.app = app
+        self._rate = per_second
+        self._burst = burst
+        self._key_header = None if key_header is None else key_header.lower().encode()
+        self._max_clients = max_clients
+        self._clock = clock
+        self._costs: dict[tuple[str, str], float] = {}
+        self._unpaginated_costs: dict[tuple[str, str], float] = {}
+        for key, cost in (costs or {}).items():
+            route = key.removesuffix(UNPAGINATED)
+            method, _, path = route.partition(" ")
+            if not method or not path.startswith("/"):
+                raise ValueError(f"Rate limit cost key '{key}' is not of the form 'METHOD /path'")
+            target = self._costs if route == key else self._unpaginated_costs
+            target[method.upper(), path] = min(cost, burst)
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle one ASGI connection, rejecting it if its client is over the limit."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        cost = self._cost(scope)
+        if cost:
+            retry_after = self._take(self._client(scope), cost)
+            if retry_after:
+                RATE_LIMITED.labels().inc()
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 429,
+                        "headers": [
+                            (b"content-type", b"application/json"),
+                            (b"content-length", str(len(_RATE_LIMITED_BODY)).encode()),
+                            (b"retry-after", str(retry_after).encode()),
+                        ],
+                    }
+                )
+                await send({"type": "http.response.body", "body": _RATE_LIMITED_BODY})
+                return
+        await self.app(scope, receive, send)
+
+    def _cost(self, scope: Scope) -> float:
+        """Return the tokens a request takes."""
+        route = (scope["method"], scope["path"])
+        unpaginated = self._unpaginated_costs.get(route)
+        if unpaginated is not None and not _LIMIT_PARAMETER.search(scope["query_string"]):
+            return unpaginated
+        return self._costs.get(route, 1.0)
+
+    def _client(self, scope: Scope) -> str:
+        """Return the identity a request is limited under."""
+        if self._key_header is not None:
+            for name, value in scope["headers"]:
+                if name == self._key_header:
+                    return "key:" + value.decode("latin-1")
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    def _take(self, client: str, cost: float) -> int:
+        """Take `cost` tokens from a client's bucket.
+
+        Returns:
+            0 if they were taken, otherwise the seconds until the bucket holds enough
+        """
+        now = self._clock()
+        buckets = self._buckets
+        bucket = buckets.get(client)
+        if bucket is None:
+            bucket = buckets[client] = _Bucket(self._burst, now)
+            if len(buckets) > self._max_clients:
+                buckets.popitem(last=False)
+        else:
+            buckets.move_to_end(client)
+            bucket.tokens = min(self._burst, bucket.tokens + (now - bucket.updated) * self._rate)
+            bucket.updated = now
+        if bucket.tokens < cost:
+            return max(1, math.ceil((cost - bucket.tokens) / self._rate))
+        bucket.tokens -= cost
+        return 0
+
+
+def _profile_name(scope: Scope) -> str:
+    """Name a profile after the time, method, path and request ID."""
+    path = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+    identifier = request_id.get() or uuid.uuid4().hex
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{scope['method']}-{path}-{identifier}.prof"
+
+
+def _save_profile(profiler: cProfile.Profile, path: Path) -> None:
+    """Write the profile to `path` and log its most expensive functions."""
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.dump_stats(path)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_SUMMARY_LINES)
+    logger.info("Saved request profile to %s\n%s", path, summary.getvalue())
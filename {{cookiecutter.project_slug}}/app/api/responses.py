@@ -0,0 +1,28 @@
+"""
+Response classes with a fast JSON encoding path.
+
+FastJSONResponse is the application's default response class: it renders with
+pydantic-core's Rust encoder instead of the stdlib json module. Endpoints that
+already hold encoded bytes return EncodedJSONResponse, which sends the body
+as-is and skips FastAPI's response_model validation entirely.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with pydantic-core."""
+
+    def render(self, content: Any) -> bytes:
+        """Encode content (dicts, lists, models or dataclasses) to JSON bytes."""
+        return to_json(content)
+
+
+class EncodedJSONResponse(Response):
+    """JSON response whose body has already been encoded."""
+
+    media_type = "application/json"
@@ -1,31 +1,97 @@
+import asyncio
 import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-
+from fastapi import Response
+from fastapi import status
 {% if cookiecutter.include_entity_example == "yes" %}
 from app.api.error_handlers import entity_not_found_handler
 from app.api.error_handlers import entity_validation_error_handler
+from app.api.error_handlers import entity_version_conflict_handler
+{%- endif %}
+from app.api.middleware import MetricsMiddleware
+from app.api.middleware import ProfilingMiddleware
+from app.api.middleware import RateLimitMiddleware
+from app.api.middleware import RequestIdMiddleware
+from app.api.middleware import RouteTemplates
+from app.api.responses import FastJSONResponse
+{%- if cookiecutter.include_entity_example == "yes" %}
 from app.api.v1.endpoints import entities
-from app.domain.errors import EntityNotFoundError
-from app.domain.errors import EntityValidationError
-{% endif %}
+{%- endif %}
 from app.core.config import settings
 from app.core.container import get_container
 from app.core.container import reset_container
 from app.core.logging import setup_logging
+from app.core.logging import shutdown_logging
+from app.core.metrics import CONTENT_TYPE
+from app.core.metrics import registry
+{%- if cookiecutter.include_entity_example == "yes" %}
+from app.domain.errors import EntityNotFoundError
+from app.domain.errors import EntityValidationError
+from app.domain.errors import EntityVersionConflictError
+{%- endif %}
+
+logger = logging.getLogger(__name__)
+
+# Tokens taken per request by route; settings.rate_limit_costs is merged over these
+RATE_LIMIT_COSTS: dict[str, float] = {
+    "GET /health": 0,
+    "GET /ready": 0,
+    "GET /metrics": 0,
+    {%- if cookiecutter.include_entity_example == "yes" %}
+    "GET {{ cookiecutter.api_prefix }}/entities unpaginated": 10,
+    "GET {{ cookiecutter.api_prefix }}/entities/export": 20,
+    "POST {{ cookiecutter.api_prefix }}/entities/import": 20,
+    "POST {{ cookiecutter.api_prefix }}/entities:batch": 10,
+    "PUT {{ cookiecutter.api_prefix }}/entities:batch": 10,
+    "DELETE {{ cookiecutter.api_prefix }}/entities:batch": 10,
+    {%- endif %}
+}
+
+# Full path templates of included routes, for the metrics route label; see include_router below
+route_templates = RouteTemplates()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Manage application lifespan events."""
     log_level = logging.DEBUG if settings.debug else logging.INFO
-    setup_logging(level=log_level)
+    setup_logging(
+        level=log_level,
+        log_format=settings.log_format,
+        queue_size=settings.log_queue_size,
+        sample_rates=settings.log_sample_rates,
+        rate_limit_per_second=settings.log_rate_limit_per_second,
+    )
     container = get_container()
     app.state.container = container
+    # Resolved once here so request dependencies only read them from app.state
+    app.state.repository = container.repository
+    {%- if cookiecutter.include_entity_example == "yes" %}
+    app.state.entity_service = container.entity_service
+    {%- endif %}
+    # Startup and warmup run in the background so that /health and /ready can answer meanwhile
+    startup = asyncio.create_task(container.startup())
+    startup.add_done_callback(_log_startup_failure)
     yield
-    reset_container()
+    startup.cancel()
+    await asyncio.wait([startup])
+    try:
+        await container.shutdown()
+    finally:
+        reset_container()
+        shutdown_logging()
+    # A failed startup is reported when the server stops, not only in the log
+    if not startup.cancelled() and (error := startup.exception()) is not None:
+        raise error
+
+
+def _log_startup_failure(startup: asyncio.Task[None]) -> None:
+    """Log the exception a background container startup failed with."""
+    if not startup.cancelled() and (error := startup.exception()) is not None:
+        logger.error("Startup failed, /health and /ready report 'failed'", exc_info=error)
 
 
 app = FastAPI(
@@ -33,7 +99,26 @@ app = FastAPI(
     description="{{ cookiecutter.description }}",
     lifespan=lifespan,
     debug=settings.debug,
+    default_response_class=FastJSONResponse,
 )
+# Middleware added last runs first: profiling sees the request ID, metrics time everything
+# (rejected requests included)
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware, directory=settings.profiling_dir, token=settings.profiling_token
+    )
+if settings.rate_limit_enabled:
+    app.add_middleware(
+        RateLimitMiddleware,
+        per_second=settings.rate_limit_per_second,
+        burst=settings.rate_limit_burst,
+        costs={**RATE_LIMIT_COSTS, **settings.rate_limit_costs},
+        key_header=settings.rate_limit_key_header,
+        max_clients=settings.rate_limit_max_clients,
+    )
+app.add_middleware(RequestIdMiddleware)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, route_templates=route_templates)
 
 
 @app.get("/")
@@ -43,24 +128,66 @@ async def root() -> dict[str, str]:
 
 
 @app.get("/health")
-async def health() -> dict[str, str]:
-    """Health check endpoint."""
+async def health(response: Response) -> dict[str, str]:
+    """Health check endpoint.
+
+    Responds 503 until persisted data has been recovered on startup, or for good
+    if startup failed or the write-ahead log could not be written.
+    """
+    container = get_container()
+    if container.error is not None:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "failed"}
+    if not container.recovered:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "recovering"}
     return {"status": "healthy"}
 
 
-{% if cookiecutter.include_entity_example == "yes" %}
+@app.get("/ready")
+async def ready(response: Response) -> dict[str, str]:
+    """Readiness check endpoint.
+
+    Responds 503 until dependencies have started and warmed up, so traffic is
+    only routed to the instance once the first requests will not pay cold-start latency.
+    Reports "failed" if startup raised; the cause is logged.
+    """
+    container = get_container()
+    if container.error is not None:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "failed"}
+    if not container.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting"}
+    return {"status": "ready"}
+
+
+if settings.metrics_enabled:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """Serve request and repository metrics in the Prometheus text format."""
+        return Response(registry.expose(), media_type=CONTENT_TYPE)
+{%- if cookiecutter.include_entity_example == "yes" %}
+
+
 # Include API routes
 app.include_router(entities.router, prefix="{{ cookiecutter.api_prefix }}", tags=["entities"])
+route_templates.include(entities.router.routes, "{{ cookiecutter.api_prefix }}")
 
 # Register error handlers
 app.add_exception_handler(EntityNotFoundError, entity_not_found_handler)
 app.add_exception_handler(EntityValidationError, entity_validation_error_handler)
-{% else %}
+app.add_exception_handler(EntityVersionConflictError, entity_version_conflict_handler)
+{%- else %}
+
+
 # Example: Include your API routes here
 # app.include_router(entities.router, prefix="{{ cookiecutter.api_prefix }}", tags=["entities"])
+# route_templates.include(entities.router.routes, "{{ cookiecutter.api_prefix }}")
 
 # Example: Register error handlers here
 # from app.domain.errors import EntityNotFoundError
 # from app.api.error_handlers import entity_not_found_handler
 # app.add_exception_handler(EntityNotFoundError, entity_not_found_handler)
-{% endif %}
+{%- endif %}
@@ -0,0 +1,71 @@
+"""
+Helpers for streaming large collections in and out of HTTP bodies.
+
+Each helper consumes an async iterator of chunks and yields one piece at a time,
+so the memory held by a request or response is bounded by the chunk size rather
+than by the size of the collection.
+"""
+
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+from typing import Any
+
+from pydantic_core import to_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+JSON_MEDIA_TYPE = "application/json"
+
+
+async def ndjson_stream(chunks: AsyncIterator[Sequence[Any]]) -> AsyncIterator[bytes]:
+    """Encode chunks of items as newline-delimited JSON, one line per item."""
+    async for chunk in chunks:
+        if chunk:
+            yield b"".join(to_json(item) + b"\n" for item in chunk)
+
+
+async def json_array_stream(chunks: AsyncIterator[Sequence[Any]]) -> AsyncIterator[bytes]:
+    """Encode chunks of items as a single JSON array streamed piece by piece."""
+    yield b"["
+    first = True
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        # Strip the brackets of the per-chunk array and join chunks with commas
+        body = to_json(chunk)[1:-1]
+        yield body if first else b"," + body
+        first = False
+    yield b"]"
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    """Split a byte stream into lines without buffering more than one line.
+
+    Yields (line number, stripped line) for every non-blank line. Lines longer than
+    `max_line_bytes` are discarded as they stream in and yielded as None, so a
+    single oversized line cannot exhaust memory.
+    """
+    buffer = bytearray()
+    line_number = 0
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            line_number += 1
+            line = bytes(buffer[start:end]).strip()
+            start = end + 1
+            if oversized or len(line) > max_line_bytes:
+                oversized = False
+                yield line_number, None
+            elif line:
+                yield line_number, line
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            oversized = True
+            buffer.clear()
+
+    tail = bytes(buffer).strip()
+    if oversized or tail:
+        yield line_number + 1, None if oversized or len(tail) > max_line_bytes else tail
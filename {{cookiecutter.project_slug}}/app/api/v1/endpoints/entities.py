@@ -8,58 +8,338 @@ To create a new endpoint:
 4. Import and include in app/api/router.py
 """
 
+from collections.abc import Sequence
 from typing import Annotated
+from typing import Literal
 from uuid import uuid4
 
 from fastapi import APIRouter
 from fastapi import Body
 from fastapi import Depends
+from fastapi import Header
 from fastapi import Path
 from fastapi import Query
+from fastapi import Request
 from fastapi import status
+from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
+from app.api.conditional import make_etag
+from app.api.conditional import matching_etags
+from app.api.conditional import none_match
+from app.api.conditional import not_modified
+from app.api.conditional import parse_etag
+from app.api.dependencies import get_entity_loader
 from app.api.dependencies import get_entity_service
+from app.api.responses import EncodedJSONResponse
+from app.api.streaming import JSON_MEDIA_TYPE
+from app.api.streaming import NDJSON_MEDIA_TYPE
+from app.api.streaming import iter_lines
+from app.api.streaming import json_array_stream
+from app.api.streaming import ndjson_stream
+from app.domain.errors import EntityNotFoundError
+from app.domain.errors import EntityValidationError
+from app.domain.errors import EntityVersionConflictError
+from app.domain.models import BatchItemResult
 from app.domain.models import Entity
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
+from app.schemas.entity import MAX_BATCH_SIZE
+from app.schemas.entity import EntitiesListResponse
+from app.schemas.entity import EntityBatchCreateRequest
+from app.schemas.entity import EntityBatchDeleteRequest
+from app.schemas.entity import EntityBatchItemResult
+from app.schemas.entity import EntityBatchResponse
+from app.schemas.entity import EntityBatchUpdateRequest
 from app.schemas.entity import EntityCreateRequest
+from app.schemas.entity import EntityImportRecord
+from app.schemas.entity import EntityImportResponse
+from app.schemas.entity import EntityPatchRequest
 from app.schemas.entity import EntitySchema
-from app.schemas.entity import EntitiesListResponse
 from app.schemas.entity import EntityUpdateRequest
+from app.schemas.entity import dump_entities_list_json
+from app.schemas.entity import dump_entity_json
+from app.services.entity_loader import EntityLoader
 from app.services.entity_service import EntityService
 
 router = APIRouter()
 
+EXPORT_CHUNK_SIZE = 1000
+IMPORT_CHUNK_SIZE = 1000
+MAX_IMPORT_LINE_BYTES = 64 * 1024
+
 
 @router.get("/entities", response_model=EntitiesListResponse, status_code=status.HTTP_200_OK)
 async def list_entities(
     offset: int = Query(0, ge=0, description="Number of entities to skip"),
     limit: int | None = Query(None, ge=1, description="Maximum number of entities to return"),
+    cursor: str | None = Query(
+        None, description="Opaque cursor from a previous response's next_cursor"
+    ),
+    in_stock: bool | None = Query(None, description="Only entities with this stock status"),
+    min_price: float | None = Query(None, ge=0, description="Minimum price (inclusive)"),
+    max_price: float | None = Query(None, ge=0, description="Maximum price (inclusive)"),
+    name_prefix: str | None = Query(
+        None, min_length=1, description="Only entities whose name starts with this"
+    ),
+    ids: str | None = Query(
+        None,
+        description="Comma-separated IDs to fetch in one request (no filters or pagination)",
+    ),
+    if_none_match: str | None = Header(
+        None, description="ETag of a previously fetched page; 304 if nothing changed since"
+    ),
+    service: EntityService = Depends(get_entity_service),
+    loader: EntityLoader = Depends(get_entity_loader),
+) -> Response:
+    """List all entities with optional filtering and pagination.
+
+    Pages requested with `limit` (and no `offset`) use keyset pagination and carry a
+    `next_cursor`; pass it back as `cursor` to fetch the following page. Offset
+    pagination is still supported but gets slower the deeper the page. `count` is
+    the number of entities matching the filters.
+
+    With `ids`, the listed entities are fetched through the request's
+    EntityLoader instead, with a single repository call, in the order given;
+    IDs that do not exist are left out and `count` is the number found.
+
+    The ETag is derived from the store-wide revision, so it changes whenever any
+    entity does. A matching If-None-Match gets an empty 304 without querying.
+    """
+    if cursor is not None and offset > 0:
+        raise EntityValidationError("offset cannot be combined with cursor")
+    if cursor is not None and limit is None:
+        raise EntityValidationError("limit is required when paginating with cursor")
+    if cursor is not None:
+        service.validate_cursor(cursor)
+    try:
+        query = EntityQuery(
+            in_stock=in_stock,
+            min_price=min_price,
+            max_price=max_price,
+            name_prefix=name_prefix,
+        )
+    except ValueError as e:
+        raise EntityValidationError(str(e)) from e
+    entity_ids = None if ids is None else _entity_ids(ids)
+    if entity_ids is not None and (
+        offset > 0 or limit is not None or cursor is not None or not query.is_empty
+    ):
+        raise EntityValidationError("ids cannot be combined with filters or pagination")
+
+    # Checked only once the request is known to be valid. The revision is read
+    # before the data: a write in between can only make the ETag stale (forcing
+    # a refetch later), never attach it to older data.
+    etag = make_etag(f"r{await service.get_revision()}")
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+
+    if entity_ids is not None:
+        entities = await service.get_entities_by_ids(entity_ids, loader)
+        return EncodedJSONResponse(
+            dump_entities_list_json(entities, len(entities)), headers={"ETag": etag}
+        )
+    next_cursor: str | None = None
+    if limit is not None and offset == 0:
+        page = await service.get_entities_page(limit=limit, cursor=cursor, query=query)
+        entities = page.entities
+        next_cursor = page.next_cursor
+    else:
+        entities = await service.get_entities(offset=offset, limit=limit, query=query)
+    count = await service.count_entities(query)
+    return EncodedJSONResponse(
+        dump_entities_list_json(entities, count, next_cursor), headers={"ETag": etag}
+    )
+
+
+@router.get(
+    "/entities/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {NDJSON_MEDIA_TYPE: {}, JSON_MEDIA_TYPE: {}},
+            "description": "All entities, streamed",
+        }
+    },
+)
+async def export_entities(
+    export_format: Literal["ndjson", "json"] = Query(
+        "ndjson", alias="format", description="ndjson (one entity per line) or a JSON array"
+    ),
+    service: EntityService = Depends(get_entity_service),
+) -> StreamingResponse:
+    """Stream every entity without building the full list in memory.
+
+    Entities are read from the repository in chunks and encoded chunk by chunk, so
+    server memory stays bounded regardless of how many entities exist.
+    """
+    chunks = service.iter_entities(chunk_size=EXPORT_CHUNK_SIZE)
+    if export_format == "json":
+        return StreamingResponse(json_array_stream(chunks), media_type=JSON_MEDIA_TYPE)
+    return StreamingResponse(ndjson_stream(chunks), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.post(
+    "/entities/import",
+    response_model=EntityImportResponse,
+    status_code=status.HTTP_200_OK,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                NDJSON_MEDIA_TYPE: {"schema": EntityImportRecord.model_json_schema()},
+            },
+        }
+    },
+)
+async def import_entities(
+    request: Request,
+    service: EntityService = Depends(get_entity_service),
+) -> EntityImportResponse:
+    """Import entities from a newline-delimited JSON request body.
+
+    The body is parsed incrementally as it arrives. Each line is validated against
+    the Entity invariants and valid entities are written in batches of
+    IMPORT_CHUNK_SIZE, so memory stays proportional to the chunk size however
+    large the upload is. Lines that fail are reported by line number.
+    """
+    summary = EntityImportResponse()
+    pending: list[tuple[int, Entity]] = []
+
+    async def flush() -> None:
+        results = await service.create_entities([entity for _, entity in pending])
+        for (line_number, _), result in zip(pending, results, strict=True):
+            if result.error is None:
+                summary.accepted += 1
+            else:
+                summary.reject(line_number, str(result.error))
+        pending.clear()
+
+    async for line_number, line in iter_lines(request.stream(), MAX_IMPORT_LINE_BYTES):
+        if line is None:
+            summary.reject(line_number, f"Line exceeds {MAX_IMPORT_LINE_BYTES} bytes")
+            continue
+        try:
+            record = EntityImportRecord.model_validate_json(line)
+            entity = Entity(
+                id=record.id if record.id is not None else str(uuid4()),
+                name=record.name,
+                price=record.price,
+                in_stock=record.in_stock,
+            )
+        except ValidationError as e:
+            summary.reject(line_number, _describe_validation_error(e))
+            continue
+        except ValueError as e:
+            summary.reject(line_number, str(e))
+            continue
+        pending.append((line_number, entity))
+        if len(pending) >= IMPORT_CHUNK_SIZE:
+            await flush()
+
+    if pending:
+        await flush()
+    return summary
+
+
+@router.post("/entities:batch", response_model=EntityBatchResponse, status_code=status.HTTP_200_OK)
+async def create_entities(
+    request: EntityBatchCreateRequest,
+    service: EntityService = Depends(get_entity_service),
+) -> EntityBatchResponse:
+    """Create entities in bulk.
+
+    Every item is reported on its own; invalid items do not prevent the rest of the
+    batch from being created.
+    """
+    rejected: dict[int, EntityBatchItemResult] = {}
+    applied: list[int] = []
+    entities: list[Entity] = []
+    for index, item in enumerate(request.items):
+        try:
+            entity = Entity(
+                id=str(uuid4()),
+                name=item.name,
+                price=item.price,
+                in_stock=item.in_stock,
+            )
+        except ValueError as e:
+            rejected[index] = _rejected_item(index, None, e)
+            continue
+        applied.append(index)
+        entities.append(entity)
+
+    results = await service.create_entities(entities)
+    return _batch_response(len(request.items), rejected, applied, results, status.HTTP_201_CREATED)
+
+
+@router.put("/entities:batch", response_model=EntityBatchResponse, status_code=status.HTTP_200_OK)
+async def update_entities(
+    request: EntityBatchUpdateRequest,
+    service: EntityService = Depends(get_entity_service),
+) -> EntityBatchResponse:
+    """Replace entities in bulk.
+
+    Each item carries the full new state of an existing entity. Missing or invalid
+    items are reported on their own without aborting the batch.
+    """
+    rejected: dict[int, EntityBatchItemResult] = {}
+    applied: list[int] = []
+    entities: list[Entity] = []
+    for index, item in enumerate(request.items):
+        try:
+            entity = Entity(id=item.id, name=item.name, price=item.price, in_stock=item.in_stock)
+        except ValueError as e:
+            rejected[index] = _rejected_item(index, item.id, e)
+            continue
+        applied.append(index)
+        entities.append(entity)
+
+    results = await service.update_entities(entities)
+    return _batch_response(len(request.items), rejected, applied, results, status.HTTP_200_OK)
+
+
+@router.delete(
+    "/entities:batch", response_model=EntityBatchResponse, status_code=status.HTTP_200_OK
+)
+async def delete_entities(
+    request: EntityBatchDeleteRequest,
     service: EntityService = Depends(get_entity_service),
-) -> EntitiesListResponse:
-    """List all entities with optional pagination."""
-    entities = await service.get_entities(offset=offset, limit=limit)
-    # Get total count for response (without pagination)
-    all_entities = await service.get_entities()
-    return EntitiesListResponse(
-        entities=[EntitySchema.from_domain(e) for e in entities],
-        count=len(all_entities),
+) -> EntityBatchResponse:
+    """Delete entities in bulk, reporting missing IDs per item."""
+    results = await service.delete_entities(request.ids)
+    return _batch_response(
+        len(request.ids), {}, list(range(len(request.ids))), results, status.HTTP_204_NO_CONTENT
     )
 
 
 @router.get("/entities/{entity_id}", response_model=EntitySchema, status_code=status.HTTP_200_OK)
 async def get_entity(
     entity_id: Annotated[str, Path(description="Entity ID")],
+    if_none_match: str | None = Header(
+        None, description="ETag of a previously fetched copy; 304 if it is still current"
+    ),
     service: EntityService = Depends(get_entity_service),
-) -> EntitySchema:
-    """Get an entity by ID."""
+) -> Response:
+    """Get an entity by ID.
+
+    The response carries a strong ETag of the entity's version. A matching
+    If-None-Match gets an empty 304 without serializing the entity.
+    """
     entity = await service.get_entity_by_id(entity_id)
-    return EntitySchema.from_domain(entity)
+    etag = make_etag(entity.version)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    return _entity_response(entity)
 
 
 @router.post("/entities", response_model=EntitySchema, status_code=status.HTTP_201_CREATED)
 async def create_entity(
     request: EntityCreateRequest,
     service: EntityService = Depends(get_entity_service),
-) -> EntitySchema:
+) -> Response:
     """Create a new entity."""
     entity = Entity(
         id=str(uuid4()),
@@ -68,28 +348,74 @@ async def create_entity(
         in_stock=request.in_stock,
     )
     created = await service.create_entity(entity)
-    return EntitySchema.from_domain(created)
+    return _entity_response(created, status.HTTP_201_CREATED)
 
 
 @router.put("/entities/{entity_id}", response_model=EntitySchema, status_code=status.HTTP_200_OK)
 async def update_entity(
     entity_id: Annotated[str, Path(description="Entity ID")],
     request: Annotated[EntityUpdateRequest, Body()],
+    if_match: str | None = Header(
+        None, description="Only update if the entity still has one of these ETags"
+    ),
     service: EntityService = Depends(get_entity_service),
-) -> EntitySchema:
-    """Update an existing entity."""
-    existing_entity = await service.get_entity_by_id(entity_id)
-
-    # Create updated entity with new values or keep existing ones
-    updated_entity = Entity(
-        id=entity_id,
-        name=request.name if request.name is not None else existing_entity.name,
-        price=request.price if request.price is not None else existing_entity.price,
-        in_stock=request.in_stock if request.in_stock is not None else existing_entity.in_stock,
-    )
+) -> Response:
+    """Update an existing entity.
+
+    Fields left out of the body keep their stored values. With If-Match, the
+    update is only applied if the entity is still at the version the client
+    last saw; otherwise the response is 412 with the current ETag.
+    """
+    changes = _entity_patch(request.name, request.price, request.in_stock)
+    if if_match is None:
+        updated = await service.patch_entity(entity_id, changes)
+    else:
+        existing_entity = await service.get_entity_by_id(entity_id)
+        expected_version = _expected_version(entity_id, if_match, existing_entity.version)
+        try:
+            updated = await service.update_entity(
+                changes.apply(existing_entity), expected_version=expected_version
+            )
+        except EntityVersionConflictError as e:
+            raise _if_match_conflict(e) from e
+    return _entity_response(updated)
+
 
-    updated = await service.update_entity(updated_entity)
-    return EntitySchema.from_domain(updated)
+@router.patch("/entities/{entity_id}", response_model=EntitySchema, status_code=status.HTTP_200_OK)
+async def patch_entity(
+    entity_id: Annotated[str, Path(description="Entity ID")],
+    request: Annotated[EntityPatchRequest, Body()],
+    if_match: str | None = Header(
+        None, description="Only change the entity if it still has this ETag"
+    ),
+    service: EntityService = Depends(get_entity_service),
+) -> Response:
+    """Change some fields of an entity.
+
+    Only the fields in the body are sent to the repository, which reads and
+    writes the entity in one atomic operation, so concurrent changes are never
+    overwritten with values read before them. With `expected_version` the change
+    is only applied if the entity is still at that version, otherwise the
+    response is 409 with the current ETag; If-Match with a single ETag does the
+    same with 412.
+    """
+    changes = _entity_patch(request.name, request.price, request.in_stock)
+    if changes.is_empty:
+        raise EntityValidationError("Patch must change at least one field")
+    expected_version = request.expected_version
+    if_match_version: int | None = None
+    if if_match is not None and (accepted := matching_etags(if_match)) is not None:
+        if_match_version = await _if_match_version(entity_id, accepted, service)
+        if expected_version is not None and if_match_version != expected_version:
+            raise EntityValidationError("If-Match and expected_version disagree")
+        expected_version = if_match_version
+    try:
+        patched = await service.patch_entity(entity_id, changes, expected_version)
+    except EntityVersionConflictError as e:
+        if if_match_version is None:
+            raise
+        raise _if_match_conflict(e) from e
+    return _entity_response(patched)
 
 
 @router.delete("/entities/{entity_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -99,3 +425,118 @@ async def delete_entity(
 ) -> None:
     """Delete an entity by ID."""
     await service.delete_entity(entity_id)
+
+
+def _entity_response(entity: Entity, status_code: int = status.HTTP_200_OK) -> Response:
+    """Encode an entity straight from the domain model, with its ETag."""
+    return EncodedJSONResponse(
+        dump_entity_json(entity),
+        status_code=status_code,
+        headers={"ETag": make_etag(entity.version)},
+    )
+
+
+def _expected_version(entity_id: str, if_match: str | None, current_version: int) -> int | None:
+    """Resolve an If-Match header into the version an update must find.
+
+    The repository re-checks the returned version atomically with the write, so
+    a concurrent update between this check and the write is still detected.
+
+    Raises:
+        EntityVersionConflictError: If no tag in the header matches the current version
+    """
+    if if_match is None:
+        return None
+    accepted = matching_etags(if_match)
+    if accepted is None:
+        return None
+    if make_etag(current_version) not in accepted:
+        raise EntityVersionConflictError(entity_id, current_version, from_if_match=True)
+    return current_version
+
+
+async def _if_match_version(entity_id: str, accepted: set[str], service: EntityService) -> int:
+    """Resolve the ETags an If-Match header accepts into the version a patch must find.
+
+    A single version is checked by the repository atomically with the write, so
+    the entity is not read first. A header without any ETag this API could have
+    issued can never match, so the conflict is raised with the current version.
+
+    Raises:
+        EntityValidationError: If the header lists more than one ETag
+        EntityVersionConflictError: If the header lists no ETag this API issues
+        EntityNotFoundError: If the entity does not exist
+    """
+    versions = {version for tag in accepted if (version := parse_etag(tag)) is not None}
+    if len(versions) > 1:
+        raise EntityValidationError("If-Match on PATCH accepts a single ETag")
+    if not versions:
+        current = await service.get_entity_by_id(entity_id)
+        raise EntityVersionConflictError(entity_id, current.version, from_if_match=True)
+    return versions.pop()
+
+
+def _if_match_conflict(error: EntityVersionConflictError) -> EntityVersionConflictError:
+    """Report a repository's version conflict as a failed If-Match precondition."""
+    return EntityVersionConflictError(
+        error.entity_id, error.actual_version, error.expected_version, from_if_match=True
+    )
+
+
+def _entity_ids(ids: str) -> list[str]:
+    """Parse the comma-separated `ids` query parameter."""
+    entity_ids = [entity_id for entity_id in (part.strip() for part in ids.split(",")) if entity_id]
+    if not entity_ids:
+        raise EntityValidationError("ids must list at least one ID")
+    if len(entity_ids) > MAX_BATCH_SIZE:
+        raise EntityValidationError(f"ids can list at most {MAX_BATCH_SIZE} IDs")
+    return entity_ids
+
+
+def _entity_patch(name: str | None, price: float | None, in_stock: bool | None) -> EntityPatch:
+    """Build the domain patch for a request, reporting invalid values as a 400."""
+    try:
+        return EntityPatch(name=name, price=price, in_stock=in_stock)
+    except ValueError as e:
+        raise EntityValidationError(str(e)) from e
+
+
+def _describe_validation_error(error: ValidationError) -> str:
+    """Summarize a Pydantic validation error on one line."""
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
+
+
+def _rejected_item(index: int, entity_id: str | None, error: Exception) -> EntityBatchItemResult:
+    """Build the result of a batch item that failed validation or was not applied."""
+    error_status = (
+        status.HTTP_404_NOT_FOUND
+        if isinstance(error, EntityNotFoundError)
+        else status.HTTP_400_BAD_REQUEST
+    )
+    return EntityBatchItemResult(index=index, id=entity_id, status=error_status, error=str(error))
+
+
+def _batch_response(
+    size: int,
+    rejected: dict[int, EntityBatchItemResult],
+    applied: Sequence[int],
+    results: Sequence[BatchItemResult],
+    success_status: int,
+) -> EntityBatchResponse:
+    """Merge pre-validation rejections and repository results in request order."""
+    items = dict(rejected)
+    for index, result in zip(applied, results, strict=True):
+        if result.error is not None:
+            items[index] = _rejected_item(index, result.entity_id, result.error)
+            continue
+        items[index] = EntityBatchItemResult(
+            index=index,
+            id=result.entity_id,
+            status=success_status,
+            entity=None if result.entity is None else EntitySchema.from_domain(result.entity),
+        )
+    ordered = [items[index] for index in range(size)]
+    failed = sum(1 for item in ordered if item.error is not None)
+    return EntityBatchResponse(results=ordered, succeeded=size - failed, failed=failed)
@@ -1,4 +1,5 @@
 from typing import Annotated
+from typing import Literal
 
 from dotenv import load_dotenv
 from pydantic import Field
@@ -21,6 +22,347 @@ class Settings(BaseSettings):
         ),
     ] = False
 
+    log_format: Annotated[
+        Literal["text", "json"],
+        Field(
+            description=(
+                "Log output format: 'text' for readable lines, 'json' for one JSON object "
+                "per line including the request ID."
+            ),
+        ),
+    ] = "text"
+
+    log_queue_size: Annotated[
+        int,
+        Field(
+            ge=1,
+            description=(
+                "Log records buffered for the writer thread. Records logged while the "
+                "buffer is full are dropped instead of blocking requests."
+            ),
+        ),
+    ] = 10_000
+
+    log_sample_rates: Annotated[
+        dict[str, Annotated[float, Field(ge=0, le=1)]],
+        Field(
+            description=(
+                "Fraction of records below WARNING to keep, by logger name "
+                '(e.g. {"uvicorn.access": 0.1}). Applies to child loggers too.'
+            ),
+        ),
+    ] = {}
+
+    log_rate_limit_per_second: Annotated[
+        float,
+        Field(
+            ge=0,
+            description=(
+                "Records let through per second for each logger and message; repeats "
+                "beyond it are dropped and counted (0 disables)."
+            ),
+        ),
+    ] = 0.0
+
+    server_host: Annotated[
+        str,
+        Field(description="Address the server binds to."),
+    ] = "0.0.0.0"
+
+    server_port: Annotated[
+        int,
+        Field(ge=0, le=65535, description="Port the server binds to."),
+    ] = 8000
+
+    server_workers: Annotated[
+        int | None,
+        Field(
+            ge=1,
+            description=(
+                "Number of worker processes (defaults to the CPU count). "
+                "Debug mode always runs a single reloading process."
+            ),
+        ),
+    ] = None
+
+    server_backlog: Annotated[
+        int,
+        Field(ge=1, description="Maximum number of pending connections on the socket."),
+    ] = 2048
+
+    server_keep_alive_seconds: Annotated[
+        int,
+        Field(ge=1, description="Seconds an idle keep-alive connection is held open."),
+    ] = 5
+
+    server_event_loop: Annotated[
+        Literal["auto", "asyncio", "uvloop"],
+        Field(description="Event loop implementation ('auto' uses uvloop when installed)."),
+    ] = "auto"
+
+    server_http_parser: Annotated[
+        Literal["auto", "h11", "httptools"],
+        Field(description="HTTP parser implementation ('auto' uses httptools when installed)."),
+    ] = "auto"
+
+    server_graceful_timeout_seconds: Annotated[
+        int,
+        Field(
+            ge=1,
+            description=(
+                "Seconds a stopping worker waits for in-flight requests before it is killed."
+            ),
+        ),
+    ] = 30
+
+    server_max_requests: Annotated[
+        int,
+        Field(
+            ge=0,
+            description=(
+                "Recycle a worker after it has served this many requests, to bound "
+                "memory creep (0 disables). The worker stops accepting connections and "
+                "finishes the requests it has before exiting."
+            ),
+        ),
+    ] = 0
+
+    server_max_requests_jitter: Annotated[
+        int,
+        Field(
+            ge=0,
+            description=(
+                "Random extra requests added to server_max_requests per worker, so "
+                "workers do not all recycle at once."
+            ),
+        ),
+    ] = 0
+
+    repository_type: Annotated[
+        Literal["memory", "shared", "sqlite"],
+        Field(
+            description=(
+                "Storage backend for the repository: 'memory' keeps data in process, "
+                "'shared' keeps it in a memory-mapped file shared by all workers, "
+                "'sqlite' persists it to the file given by database_url."
+            ),
+        ),
+    ] = "memory"
+
+    shared_store_path: Annotated[
+        str,
+        Field(
+            description=(
+                "File backing the shared backend. Put it on tmpfs (e.g. /dev/shm) "
+                "to keep the data purely in memory."
+            ),
+        ),
+    ] = "./app.shm"
+
+    shared_store_capacity: Annotated[
+        int,
+        Field(
+            ge=1,
+            description="Maximum number of entities when the shared store file is created.",
+        ),
+    ] = 100_000
+
+    database_url: Annotated[
+        str,
+        Field(description="Database URL used by the sqlite backend (sqlite:///<path>)."),
+    ] = "sqlite:///./app.db"
+
+    database_pool_size: Annotated[
+        int,
+        Field(
+            ge=1,
+            description="Number of reader connections (and threads) for the sqlite backend.",
+        ),
+    ] = 4
+
+    storage_engine: Annotated[
+        Literal["dict", "columnar"],
+        Field(
+            description=(
+                "Storage engine for the memory backend: 'dict' keeps one Entity object "
+                "per record, 'columnar' packs fields into arrays to cut memory per entity."
+            ),
+        ),
+    ] = "dict"
+
+    persistence_enabled: Annotated[
+        bool,
+        Field(
+            description=(
+                "Persist the memory backend to a write-ahead log and snapshots in "
+                "persistence_dir, and recover them on startup."
+            ),
+        ),
+    ] = False
+
+    persistence_dir: Annotated[
+        str,
+        Field(description="Directory holding the write-ahead log and snapshots."),
+    ] = "./data"
+
+    persistence_fsync: Annotated[
+        bool,
+        Field(
+            description=(
+                "Acknowledge writes only once they are fsynced. When disabled, a power "
+                "failure can lose the most recent writes."
+            ),
+        ),
+    ] = True
+
+    persistence_group_commit_ms: Annotated[
+        float,
+        Field(
+            ge=0,
+            description=(
+                "Milliseconds a log commit waits to batch concurrent writes into one fsync."
+            ),
+        ),
+    ] = 2.0
+
+    persistence_snapshot_interval_seconds: Annotated[
+        float,
+        Field(gt=0, description="Seconds between checks for whether to write a snapshot."),
+    ] = 60.0
+
+    persistence_snapshot_min_records: Annotated[
+        int,
+        Field(
+            ge=1,
+            description="Log records written since the last snapshot that trigger a new one.",
+        ),
+    ] = 10_000
+
+    coalescing_enabled: Annotated[
+        bool,
+        Field(
+            description=(
+                "Let concurrent identical reads (by ID, or list queries with the same "
+                "arguments) share one repository call."
+            ),
+        ),
+    ] = False
+
+    cache_enabled: Annotated[
+        bool,
+        Field(description="Cache entity lookups by ID in front of the repository."),
+    ] = False
+
+    cache_max_entries: Annotated[
+        int,
+        Field(ge=1, description="Maximum number of cached entity lookups (LRU eviction)."),
+    ] = 10_000
+
+    cache_ttl_seconds: Annotated[
+        float,
+        Field(gt=0, description="Seconds a cached entity stays valid."),
+    ] = 60.0
+
+    cache_negative_ttl_seconds: Annotated[
+        float,
+        Field(
+            ge=0,
+            description="Seconds a lookup for a missing entity stays cached (0 disables).",
+        ),
+    ] = 5.0
+
+    cache_warmup_entries: Annotated[
+        int,
+        Field(
+            ge=0,
+            description=(
+                "Stored entities loaded into the cache at startup, before the app reports "
+                "ready (capped at cache_max_entries)."
+            ),
+        ),
+    ] = 1_000
+
+    metrics_enabled: Annotated[
+        bool,
+        Field(
+            description=(
+                "Record request and repository latencies and serve them at /metrics "
+                "in the Prometheus text format."
+            ),
+        ),
+    ] = True
+
+    profiling_enabled: Annotated[
+        bool,
+        Field(
+            description=(
+                "Allow requests to ask for a cProfile profile with the X-Profile header "
+                "or the profile query parameter. When disabled, requests pay nothing."
+            ),
+        ),
+    ] = False
+
+    profiling_dir: Annotated[
+        str,
+        Field(description="Directory request profiles (pstats files) are written to."),
+    ] = "./profiles"
+
+    profiling_token: Annotated[
+        str | None,
+        Field(
+            description=(
+                "Value the X-Profile header or profile query parameter must carry to "
+                "trigger profiling (any value when unset)."
+            ),
+        ),
+    ] = None
+
+    rate_limit_enabled: Annotated[
+        bool,
+        Field(
+            description=(
+                "Limit the request rate of each client with a token bucket, answering "
+                "429 with Retry-After when it runs out."
+            ),
+        ),
+    ] = False
+
+    rate_limit_per_second: Annotated[
+        float,
+        Field(gt=0, description="Tokens added to each client's bucket per second."),
+    ] = 20.0
+
+    rate_limit_burst: Annotated[
+        float,
+        Field(ge=1, description="Tokens a client's bucket holds at most."),
+    ] = 40.0
+
+    rate_limit_costs: Annotated[
+        dict[str, Annotated[float, Field(ge=0)]],
+        Field(
+            description=(
+                'Tokens taken by requests to a route, keyed "METHOD /path" (e.g. '
+                '{"GET /api/v1/entities/export": 30}); a " unpaginated" suffix prices GET '
+                "requests without a limit parameter. Merged over the built-in costs."
+            ),
+        ),
+    ] = {}
+
+    rate_limit_key_header: Annotated[
+        str | None,
+        Field(
+            description=(
+                "Header identifying clients instead of their address, e.g. an API key "
+                "checked by a gateway in front of the app (clients keyed by address when unset)."
+            ),
+        ),
+    ] = None
+
+    rate_limit_max_clients: Annotated[
+        int,
+        Field(ge=1, description="Clients tracked at once; least recently seen ones are dropped."),
+    ] = 10_000
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
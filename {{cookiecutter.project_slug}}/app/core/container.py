@@ -1,8 +1,18 @@
+from app.core.config import Settings
+from app.core.config import settings as default_settings
 from app.domain.protocols import Repository
+{%- if cookiecutter.include_entity_example == "yes" %}
+from app.repositories.caching_repository import CachingRepository
+from app.repositories.coalescing_repository import CoalescingRepository
+from app.repositories.columnar_store import ColumnarEntityStore
+from app.repositories.instrumented_repository import InstrumentedRepository
+{%- endif %}
 from app.repositories.memory_repository import MemoryRepository
-{% if cookiecutter.include_entity_example == "yes" %}
+{%- if cookiecutter.include_entity_example == "yes" %}
+from app.repositories.persistent_repository import PersistentRepository
+from app.repositories.sqlite_repository import SqliteRepository
 from app.services.entity_service import EntityService
-{% endif %}
+{%- endif %}
 
 
 class Container:
@@ -10,15 +20,43 @@ class Container:
     Container for application dependencies with lifecycle management.
 
     Uses lazy initialization and factory pattern for better testability
-    and resource management.
+    and resource management. `startup()` creates the dependencies eagerly and
+    runs their async `startup()` hooks; `shutdown()` runs their `close()` hooks.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, settings: Settings | None = None) -> None:
         """Initialize container (dependencies created lazily)."""
+        self._settings = settings or default_settings
         self._repository: Repository | None = None
-        {% if cookiecutter.include_entity_example == "yes" %}
+        self._started = False
+        self._error: Exception | None = None
+        {%- if cookiecutter.include_entity_example == "yes" %}
+        self._persistent: PersistentRepository | None = None
         self._entity_service: EntityService | None = None
-        {% endif %}
+        {%- endif %}
+
+    @property
+    def ready(self) -> bool:
+        """Whether startup() has finished, so dependencies are connected and warm."""
+        return self._started
+
+    @property
+    def error(self) -> Exception | None:
+        """Exception that made the last startup() fail, or later broke a dependency for good."""
+        {%- if cookiecutter.include_entity_example == "yes" %}
+        if self._error is None and self._persistent is not None:
+            return self._persistent.failure
+        {%- endif %}
+        return self._error
+
+    @property
+    def recovered(self) -> bool:
+        """Whether persisted data, if any, has been recovered."""
+        {%- if cookiecutter.include_entity_example == "yes" %}
+        if self._persistent is not None:
+            return self._persistent.recovered
+        {%- endif %}
+        return True
 
     @property
     def repository(self) -> Repository:
@@ -26,15 +64,16 @@ class Container:
         if self._repository is None:
             self._repository = self._create_repository()
         return self._repository
+    {%- if cookiecutter.include_entity_example == "yes" %}
 
-    {% if cookiecutter.include_entity_example == "yes" %}
     @property
     def entity_service(self) -> EntityService:
         """Get EntityService instance."""
         if self._entity_service is None:
             self._entity_service = EntityService(repository=self.repository)
         return self._entity_service
-    {% else %}
+    {%- else %}
+
     # Example: Add your service properties here
     # @property
     # def entity_service(self) -> EntityService:
@@ -42,17 +81,101 @@ class Container:
     #     if self._entity_service is None:
     #         self._entity_service = EntityService(repository=self.repository)
     #     return self._entity_service
-    {% endif %}
+    {%- endif %}
 
     def _create_repository(self) -> Repository:
-        """Factory method to create repository based on settings.
-
-        In future, can switch based on settings.repository_type
-        (e.g., "memory", "postgres", "mongodb").
+        """Factory method to create repository based on settings."""
+        repository = self._create_backend()
+        {%- if cookiecutter.include_entity_example == "yes" %}
+        if self._settings.metrics_enabled:
+            repository = InstrumentedRepository(repository)
+        if self._settings.coalescing_enabled:
+            repository = CoalescingRepository(repository)
+        if self._settings.cache_enabled:
+            return CachingRepository(
+                repository,
+                max_entries=self._settings.cache_max_entries,
+                ttl_seconds=self._settings.cache_ttl_seconds,
+                negative_ttl_seconds=self._settings.cache_negative_ttl_seconds,
+                warmup_entries=self._settings.cache_warmup_entries,
+            )
+        {%- endif %}
+        return repository
+
+    def _create_backend(self) -> Repository:
+        """Create the storage backend selected by settings.repository_type.
+
+        Raises:
+            ValueError: If the configured repository type is not supported
         """
+        repository_type = self._settings.repository_type
+        if repository_type == "memory":
+            {%- if cookiecutter.include_entity_example == "yes" %}
+            memory = MemoryRepository(
+                store=ColumnarEntityStore() if self._settings.storage_engine == "columnar" else None
+            )
+            if self._settings.persistence_enabled:
+                self._persistent = PersistentRepository(
+                    memory,
+                    self._settings.persistence_dir,
+                    fsync=self._settings.persistence_fsync,
+                    group_commit_seconds=self._settings.persistence_group_commit_ms / 1000,
+                    snapshot_interval_seconds=self._settings.persistence_snapshot_interval_seconds,
+                    snapshot_min_records=self._settings.persistence_snapshot_min_records,
+                )
+                return self._persistent
+            return memory
+            {%- else %}
+            return MemoryRepository()
+            {%- endif %}
+        {%- if cookiecutter.include_entity_example == "yes" %}
+        if repository_type == "shared":
+            # Imported here because it needs fcntl, which only exists on POSIX
+            from app.repositories.shared_memory_repository import SharedMemoryRepository  # noqa: PLC0415
+
+            return SharedMemoryRepository(
+                self._settings.shared_store_path, capacity=self._settings.shared_store_capacity
+            )
+        if repository_type == "sqlite":
+            return SqliteRepository.from_url(
+                self._settings.database_url, pool_size=self._settings.database_pool_size
+            )
+        {%- endif %}
+        raise ValueError(f"Unsupported repository type '{repository_type}'")
+
+    async def recover(self) -> None:
+        """Restore persisted data into the repository (no-op without persistence)."""
+        if self._repository is None:
+            self._repository = self._create_repository()
+        {%- if cookiecutter.include_entity_example == "yes" %}
+        if self._persistent is not None:
+            await self._persistent.recover()
+        {%- endif %}
 
-        return MemoryRepository()
+    async def startup(self) -> None:
+        """Create dependencies and warm them up before traffic arrives.
 
+        Recovers persisted data, then runs the repository's `startup()` hook, which
+        decorators forward inward: pools connect and caches are primed. `ready` is
+        True once this returns; if it raises, the exception is kept in `error`.
+        """
+        self._error = None
+        try:
+            await self.recover()
+            start = getattr(self.repository, "startup", None)
+            if start is not None:
+                await start()
+        except Exception as e:
+            self._error = e
+            raise
+        self._started = True
+
+    async def shutdown(self) -> None:
+        """Release resources held by dependencies (e.g. database connections)."""
+        self._started = False
+        close = getattr(self._repository, "close", None)
+        if close is not None:
+            await close()
 
     def reset(self) -> None:
         """Reset container state.
@@ -60,9 +183,12 @@ class Container:
         Clears all dependencies, forcing re-initialization on next access.
         """
         self._repository = None
-        {% if cookiecutter.include_entity_example == "yes" %}
+        self._started = False
+        self._error = None
+        {%- if cookiecutter.include_entity_example == "yes" %}
+        self._persistent = None
         self._entity_service = None
-        {% endif %}
+        {%- endif %}
 
 
 _container: Container | None = None
@@ -0,0 +1,344 @@
+"""
+In-process load and soak test.
+
+Drives the application through httpx's ASGI transport, so every request runs
+the middleware, routing, services and repository with no socket or server
+process in between. Clients pick operations from a weighted mix, either as
+fast as responses come back or at a fixed overall rate. The report gives
+throughput, latency percentiles per operation, and how much resident and
+traced memory grew while the load ran, which makes it suitable both for
+comparing changes and for soak runs looking for leaks.
+
+Run with `python main.py loadtest --help`. The application uses the same
+settings as the server, so environment variables such as REPOSITORY_TYPE
+select what is tested.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import suppress
+from dataclasses import dataclass
+from dataclasses import field
+
+import httpx
+from fastapi import FastAPI
+
+API_PREFIX = "{{ cookiecutter.api_prefix }}"
+
+DEFAULT_MIX = {"get": 60, "list": 15, "create": 10, "update": 10, "delete": 5}
+
+SEED_BATCH = 1_000
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+@dataclass(frozen=True)
+class LoadTestOptions:
+    """What load to apply and for how long."""
+
+    duration: float = 10.0
+    concurrency: int = 32
+    # Requests per second across all clients; None sends as fast as responses come back
+    rate: float | None = None
+    mix: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    entities: int = 1_000
+    page_size: int = 20
+    # Load applied before measuring, so caches and allocator pools fill up first
+    warmup: float = 0.0
+    sample_interval: float = 1.0
+    trace_memory: bool = False
+
+
+@dataclass
+class LoadTestReport:
+    """Latencies, errors and memory use recorded during a load test."""
+
+    options: LoadTestOptions
+    elapsed: float = 0.0
+    latencies: dict[str, list[float]] = field(default_factory=dict[str, list[float]])
+    errors: Counter[str] = field(default_factory=Counter[str])
+    # (seconds since the start, resident bytes, traced bytes) per sample
+    memory: list[tuple[float, int | None, int | None]] = field(
+        default_factory=list[tuple[float, int | None, int | None]]
+    )
+    allocation_growth: list[str] = field(default_factory=list[str])
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests measured."""
+        return sum(len(values) for values in self.latencies.values())
+
+    @property
+    def server_errors(self) -> int:
+        """Return the number of 5xx responses."""
+        return sum(count for key, count in self.errors.items() if key.split()[1].startswith("5"))
+
+    def percentiles(self, operation: str | None = None) -> dict[str, float]:
+        """Return p50, p95, p99 and max latency in seconds for one operation or all."""
+        if operation is None:
+            values = sorted(v for values in self.latencies.values() for v in values)
+        else:
+            values = sorted(self.latencies.get(operation, []))
+        if not values:
+            return {}
+        result = {f"p{round(q * 100)}": values[int(q * (len(values) - 1))] for q in PERCENTILES}
+        result["max"] = values[-1]
+        return result
+
+    def format(self) -> str:
+        """Return the report as readable text."""
+        rate = f"{self.options.rate:g} req/s" if self.options.rate else "unlimited"
+        throughput = self.requests / self.elapsed if self.elapsed else 0.0
+        lines = [
+            f"{self.requests:,} requests in {self.elapsed:.1f} s ({throughput:,.1f} req/s), "
+            f"concurrency {self.options.concurrency}, rate {rate}",
+            "",
+            f"{'operation':<10}{'requests':>10}{'errors':>8}"
+            + "".join(f"{name:>10}" for name in ("p50 ms", "p95 ms", "p99 ms", "max ms")),
+        ]
+        for operation in [*sorted(self.latencies), None]:
+            count = len(self.latencies[operation]) if operation else self.requests
+            errors = sum(n for key, n in self.errors.items() if operation in (None, key.split()[0]))
+            cells = "".join(f"{v * 1000:>10.2f}" for v in self.percentiles(operation).values())
+            lines.append(f"{operation or 'all':<10}{count:>10,}{errors:>8,}{cells}")
+        if self.errors:
+            summary = ", ".join(f"{key} x{count}" for key, count in sorted(self.errors.items()))
+            lines += ["", "errors: " + summary]
+        lines += ["", *self._format_memory()]
+        return "\n".join(lines)
+
+    def _format_memory(self) -> list[str]:
+        lines: list[str] = []
+        for label, column in (("resident", 1), ("traced", 2)):
+            values = [sample[column] for sample in self.memory]
+            if not values or any(value is None for value in values):
+                continue
+            sizes = [value / 2**20 for value in values if value is not None]
+            lines.append(
+                f"{label} memory: {sizes[0]:.1f} MiB -> {sizes[-1]:.1f} MiB "
+                f"({sizes[-1] - sizes[0]:+.1f} MiB); samples: "
+                + ", ".join(f"{size:.1f}" for size in sizes)
+            )
+        if self.allocation_growth:
+            lines += ["largest allocation growth:", *(f"  {s}" for s in self.allocation_growth)]
+        return lines or ["memory: not available on this platform"]
+
+
+def _rss() -> int | None:
+    """Return the resident set size in bytes, or None where it can't be read."""
+    with suppress(OSError, ValueError, AttributeError), open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    return None
+
+
+class _LoadRun:
+    """Clients sharing one schedule, entity pool and report."""
+
+    def __init__(self, client: httpx.AsyncClient, options: LoadTestOptions) -> None:
+        self._client = client
+        self._options = options
+        self._operations = list(options.mix)
+        self._weights = list(options.mix.values())
+        self._ids: list[str] = []
+        self._report = LoadTestReport(options)
+        self._record = False
+        self._started = 0.0
+        self._deadline = 0.0
+        self._issued = 0
+
+    async def run(self) -> LoadTestReport:
+        await self._seed()
+        await self._phase(self._options.warmup, record=False)
+        if self._options.trace_memory:
+            tracemalloc.start()
+        baseline = tracemalloc.take_snapshot() if self._options.trace_memory else None
+        sampler = asyncio.create_task(self._sample_memory())
+        try:
+            await self._phase(self._options.duration, record=True)
+        finally:
+            sampler.cancel()
+            await asyncio.wait([sampler])
+        self._report.elapsed = time.perf_counter() - self._started
+        self._sample()
+        if baseline is not None:
+            growth = tracemalloc.take_snapshot().compare_to(baseline, "lineno")
+            self._report.allocation_growth = [str(stat) for stat in growth[:10]]
+            tracemalloc.stop()
+        return self._report
+
+    async def _seed(self) -> None:
+        for start in range(0, self._options.entities, SEED_BATCH):
+            count = min(SEED_BATCH, self._options.entities - start)
+            items = [{"name": f"Load {start + i}", "price": 1.0} for i in range(count)]
+            response = await self._client.post(
+                API_PREFIX + "/entities:batch", json={"items": items}
+            )
+            response.raise_for_status()
+            self._ids += [result["id"] for result in response.json()["results"]]
+
+    async def _phase(self, duration: float, record: bool) -> None:
+        if duration <= 0:
+            return
+        self._record = record
+        self._started = time.perf_counter()
+        self._deadline = self._started + duration
+        self._issued = 0
+        await asyncio.gather(*(self._client_loop() for _ in range(self._options.concurrency)))
+
+    def _next_start(self) -> float | None:
+        """Return when the next request is due, or None once the phase is over.
+
+        With a target rate, latency is measured from the scheduled start, so
+        time spent waiting behind a slow response counts against the server
+        instead of silently lowering the rate.
+        """
+        if self._options.rate is None:
+            now = time.perf_counter()
+            return now if now < self._deadline else None
+        due = self._started + self._issued / self._options.rate
+        self._issued += 1
+        return due if due < self._deadline else None
+
+    async def _client_loop(self) -> None:
+        while (due := self._next_start()) is not None:
+            # Yield even when on time: requests served in-process may never suspend,
+            # and would otherwise starve the other clients and the memory sampler
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            operation = random.choices(self._operations, self._weights)[0]
+            if operation in ("get", "update", "delete") and not self._ids:
+                operation = "create"
+            status = await self._send(operation)
+            if self._record:
+                self._report.latencies.setdefault(operation, []).append(time.perf_counter() - due)
+                if status >= 400:
+                    self._report.errors[f"{operation} {status}"] += 1
+
+    async def _send(self, operation: str) -> int:
+        entities = API_PREFIX + "/entities"
+        if operation == "list":
+            offset = random.randrange(max(1, len(self._ids)))
+            params = {"offset": offset, "limit": self._options.page_size}
+            return (await self._client.get(entities, params=params)).status_code
+        if operation == "create":
+            body = {"name": "Load", "price": random.uniform(1, 100)}
+            response = await self._client.post(entities, json=body)
+            if response.status_code == 201:
+                self._ids.append(response.json()["id"])
+            return response.status_code
+        index = random.randrange(len(self._ids))
+        entity_id = self._ids[index]
+        if operation == "get":
+            return (await self._client.get(f"{entities}/{entity_id}")).status_code
+        if operation == "update":
+            body = {"price": random.uniform(1, 100)}
+            return (await self._client.put(f"{entities}/{entity_id}", json=body)).status_code
+        # Take the ID out of the pool first so other clients stop picking it
+        self._ids[index] = self._ids[-1]
+        self._ids.pop()
+        return (await self._client.delete(f"{entities}/{entity_id}")).status_code
+
+    def _sample(self) -> None:
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        elapsed = time.perf_counter() - self._started
+        self._report.memory.append((elapsed, _rss(), traced))
+
+    async def _sample_memory(self) -> None:
+        while True:
+            self._sample()
+            await asyncio.sleep(self._options.sample_interval)
+
+
+async def run_load_test(app: FastAPI, options: LoadTestOptions) -> LoadTestReport:
+    """Apply load to `app` in this process and return what was measured.
+
+    Runs the application's lifespan around the test and waits for it to
+    report ready, so dependencies are started and warm before the load starts.
+    httpx's own per-request logging is turned off meanwhile, since it would be
+    timed as part of every request.
+    """
+    client_logger = logging.getLogger("httpx")
+    level = client_logger.level
+    client_logger.setLevel(logging.WARNING)
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                while (await client.get("/ready")).status_code != 200:
+                    await asyncio.sleep(0.1)
+                return await _LoadRun(client, options).run()
+    finally:
+        client_logger.setLevel(level)
+
+
+def _mix(value: str) -> dict[str, int]:
+    """Parse an operation mix such as `get=80,create=20`."""
+    mix: dict[str, int] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in DEFAULT_MIX or not weight.strip().isdigit():
+            raise argparse.ArgumentTypeError(
+                f"expected operation=weight pairs with operations from {', '.join(DEFAULT_MIX)}"
+            )
+        mix[name.strip()] = int(weight)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("at least one operation needs a positive weight")
+    return mix
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a load test from the command line and print the report.
+
+    Returns 1 if any request failed with a server error, so the command can
+    gate a deployment.
+    """
+    defaults = LoadTestOptions()
+    parser = argparse.ArgumentParser(
+        prog="main.py loadtest",
+        description="Apply load to the application in-process and report latency and memory.",
+    )
+    parser.add_argument("--duration", type=float, default=defaults.duration, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument("--rate", type=float, help="requests per second (default: unlimited)")
+    parser.add_argument(
+        "--mix",
+        type=_mix,
+        default=defaults.mix,
+        help="operation weights (default: "
+        + ",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items())
+        + ")",
+    )
+    parser.add_argument("--entities", type=int, default=defaults.entities, help="seeded first")
+    parser.add_argument("--page-size", type=int, default=defaults.page_size)
+    parser.add_argument("--warmup", type=float, default=defaults.warmup, help="seconds")
+    parser.add_argument(
+        "--sample-interval", type=float, default=defaults.sample_interval, help="seconds"
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="trace Python allocations too (slows requests down)",
+    )
+    args = parser.parse_args(argv)
+    options = LoadTestOptions(
+        duration=args.duration,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        mix=args.mix,
+        entities=args.entities,
+        page_size=args.page_size,
+        warmup=args.warmup,
+        sample_interval=args.sample_interval,
+        trace_memory=args.trace_memory,
+    )
+    # Imported here so that serving never loads the application before forking workers
+    from app.api.router import app  # noqa: PLC0415
+
+    report = asyncio.run(run_load_test(app, options))
+    print(report.format())
+    return 1 if report.server_errors else 0
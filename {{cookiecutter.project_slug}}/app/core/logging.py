@@ -1,23 +1,305 @@
+"""
+Application logging.
+
+A log call on the event loop only filters the record and puts it on a queue;
+a QueueListener thread formats it and writes it out, so request latency does
+not depend on how fast stderr drains. uvicorn's own loggers are routed
+through the same queue.
+
+Records are rendered as text, or as one JSON object per line carrying the ID
+of the request that logged them. Noisy loggers can be sampled, and repeats of
+one message rate limited.
+"""
+
+import copy
+import json
 import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import datetime
 from logging import Logger
-
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from typing import Any
+from typing import Literal
+from typing import TextIO
 
 LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
 
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# uvicorn attaches handlers of its own to these loggers
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.access")
+
+# ID of the request being handled, set by RequestIdMiddleware
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+_handler: logging.Handler | None = None
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record as JSON, including its request ID and traceback if any."""
+        created = datetime.fromtimestamp(record.created, UTC)
+        entry: dict[str, Any] = {
+            "timestamp": created.isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request = record.__dict__.get("request_id")
+        if request is not None:
+            entry["request_id"] = request
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the ID of the current request to records as `request_id`.
+
+    Runs in the thread or task that logged, before the record is queued, so it
+    can read the request-ID context variable. That is why it sits on the queue
+    handler: the listener thread that writes records never sees that context.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Tag the record; never drops it."""
+        record.__dict__["request_id"] = request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of the records below WARNING from selected loggers.
+
+    A logger uses the rate of its nearest configured ancestor, so `{"app": 0.1}`
+    samples every logger under `app`. Sampling is deterministic: with a rate of
+    0.25 every fourth record is kept.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        """Initialize the filter.
+
+        Args:
+            rates: Fraction of records to keep (0 to 1), by logger name
+        """
+        super().__init__()
+        self._rates = dict(rates)
+        self._resolved: dict[str, str | None] = {}
+        # Start just short of a whole record so the first one is kept
+        self._credit = {name: 1.0 - rate if rate else 0.0 for name, rate in self._rates.items()}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether to keep the record."""
+        if record.levelno >= logging.WARNING:
+            return True
+        name = self._resolve(record.name)
+        if name is None:
+            return True
+        credit = self._credit[name] + self._rates[name]
+        keep = credit >= 1.0
+        self._credit[name] = credit - 1.0 if keep else credit
+        return keep
+
+    def _resolve(self, logger_name: str) -> str | None:
+        """Return the configured logger name that applies to `logger_name`."""
+        if logger_name not in self._resolved:
+            name: str | None = logger_name
+            while name is not None and name not in self._rates:
+                name = name.rpartition(".")[0] if "." in name else None
+            self._resolved[logger_name] = name
+        return self._resolved[logger_name]
+
+
+@dataclass(slots=True)
+class _Bucket:
+    tokens: float
+    updated: float
+    suppressed: int = 0
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most `per_second` records for each logger and message.
+
+    Records are grouped by their unformatted message, so one log statement is
+    limited as a whole whatever its arguments. Repeats beyond the limit are
+    dropped, and the next record let through says how many were.
+    """
 
-def setup_logging(level: int = logging.INFO) -> None:
-    """Configure application wide logging."""
-    logging.basicConfig(
-        level=level,
-        format=LOG_FORMAT,
-        datefmt=DATE_FORMAT,
-        handlers=[logging.StreamHandler()],
-    )
+    def __init__(self, per_second: float, max_messages: int = 1024) -> None:
+        """Initialize the filter.
+
+        Args:
+            per_second: Records let through per second for each message
+            max_messages: Messages tracked at once; the least recently logged
+                are forgotten first
+        """
+        super().__init__()
+        self._rate = per_second
+        self._burst = max(1.0, per_second)
+        self._max_messages = max_messages
+        self._buckets: OrderedDict[tuple[str, str], _Bucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether to keep the record."""
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket(self._burst, now)
+                if len(self._buckets) > self._max_messages:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                refill = (now - bucket.updated) * self._rate
+                bucket.tokens = min(self._burst, bucket.tokens + refill)
+                bucket.updated = now
+            if bucket.tokens < 1.0:
+                bucket.suppressed += 1
+                return False
+            bucket.tokens -= 1.0
+            suppressed, bucket.suppressed = bucket.suppressed, 0
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+            record.args = None
+        return True
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records when its bounded queue is full."""
+
+    def __init__(self, records: "queue.Queue[logging.LogRecord | None]") -> None:
+        super().__init__(records)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record without blocking the caller."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the arguments into the message and render the traceback.
+
+        The writer thread formats the record later, when the arguments may have
+        changed; the traceback is rendered now so its frames can be released.
+        """
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _Listener(QueueListener):
+    """QueueListener that waits for room to queue its stop signal."""
+
+    def __init__(
+        self, records: "queue.Queue[logging.LogRecord | None]", handler: logging.Handler
+    ) -> None:
+        super().__init__(records, handler)
+        self._records = records
+
+    def enqueue_sentinel(self) -> None:
+        """Queue the stop signal (None) behind the pending records, even when full."""
+        self._records.put(None)
+
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+def setup_logging(
+    level: int = logging.INFO,
+    log_format: Literal["text", "json"] = "text",
+    queue_size: int = 10_000,
+    sample_rates: Mapping[str, float] | None = None,
+    rate_limit_per_second: float = 0.0,
+    stream: TextIO | None = None,
+) -> None:
+    """Configure application wide logging through a background writer thread.
+
+    Calling it again replaces the previous configuration.
+
+    Args:
+        level: Root log level
+        log_format: 'text' for readable lines, 'json' for one JSON object per line
+        queue_size: Records buffered for the writer thread; records logged while
+            the queue is full are dropped rather than blocking the caller
+        sample_rates: Fraction of records below WARNING to keep, by logger name
+        rate_limit_per_second: Records let through per second for each logger
+            and message (0 disables)
+        stream: Stream to write to (defaults to stderr)
+    """
+    global _handler, _listener
+    shutdown_logging()
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+
+    output = logging.StreamHandler(stream)
+    if log_format == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+    records: queue.Queue[logging.LogRecord | None] = queue.Queue(queue_size)
+    handler = _DroppingQueueHandler(records)
+    # Cheap drops first; the request ID is only looked up for kept records
+    if sample_rates:
+        handler.addFilter(SamplingFilter(sample_rates))
+    if rate_limit_per_second:
+        handler.addFilter(RateLimitFilter(rate_limit_per_second))
+    handler.addFilter(RequestIdFilter())
+    listener = _Listener(records, output)
+    listener.start()
+
+    root.addHandler(handler)
+    root.setLevel(level)
+    for name in UVICORN_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.handlers.clear()
+        logger.propagate = True
+    _handler, _listener = handler, listener
+
+
+def shutdown_logging() -> None:
+    """Write out every queued record and stop the writer thread.
+
+    Records logged afterwards are written synchronously, so messages from the
+    rest of the shutdown are not lost.
+    """
+    global _handler, _listener
+    if _listener is None or _handler is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    root.removeHandler(_handler)
+    dropped = _handler.dropped if isinstance(_handler, _DroppingQueueHandler) else 0
+    _handler = _listener.handlers[0]
+    _listener = None
+    root.addHandler(_handler)
+    if dropped:
+        get_logger(__name__).warning("Dropped %d log records while the queue was full", dropped)
 
 
 def get_logger(name: str) -> Logger:
     """Return a logger for the given module."""
     return logging.getLogger(name)
-
@@ -0,0 +1,457 @@
+"""
+Counters and fixed-bucket histograms with Prometheus text exposition.
+
+Metrics keep their values in a store. By default the store is a list in the
+process. The multi-worker server calls `registry.use_directory()` before
+forking; each worker then writes its values to a memory-mapped file of its
+own in that directory, and whichever worker serves /metrics adds up the files
+of every worker. When the supervisor reaps a worker it folds that worker's
+file into an archive of exited workers' values (`Registry.retire_process`), so
+counters never go backwards when a worker is recycled and the number of files
+summed on every scrape stays at the number of running workers.
+
+Recording is a dict lookup plus a few float additions and is not locked:
+record from the event loop thread.
+"""
+
+import json
+import math
+import mmap
+import os
+import secrets
+import struct
+import threading
+from abc import ABC
+from abc import abstractmethod
+from bisect import bisect_left
+from collections.abc import Sequence
+from pathlib import Path
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from fast in-memory operations to slow requests
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_FILE_PATTERN = "metrics-*.db"
+# Values of exited workers, with the names of the files last folded into it
+_ARCHIVE = "archive.json"
+_INITIAL_FILE_SIZE = 64 * 1024
+# bytes in use, including this header
+_HEADER = struct.Struct("<Q")
+# key length (followed by the key, padded so the value is 8-byte aligned, and the value)
+_KEY_LENGTH = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+
+
+class _MemoryStore:
+    """Metric values of this process, in a list."""
+
+    def __init__(self) -> None:
+        self._slots: dict[str, int] = {}
+        self.values: list[float] = []
+
+    def slot(self, key: str) -> int:
+        """Return the index of the value for `key`, allocating it at zero."""
+        index = self._slots.get(key)
+        if index is None:
+            index = self._slots[key] = len(self.values)
+            self.values.append(0.0)
+        return index
+
+    def add(self, index: int, amount: float) -> None:
+        """Add `amount` to a value."""
+        self.values[index] += amount
+
+    def totals(self) -> dict[str, float]:
+        """Return every value by key."""
+        return {key: self.values[index] for key, index in self._slots.items()}
+
+    def retire(self, pid: int) -> None:
+        """Fold the values of an exited process into the archive (nothing to do here)."""
+
+
+class _FileStore(_MemoryStore):
+    """Metric values of this process, mirrored to a memory-mapped file.
+
+    Only this process writes its file. A new entry is written past the end of
+    the used region before the header is advanced, so readers never see a
+    partial entry.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        super().__init__()
+        self._directory = directory
+        self._offsets: list[int] = []
+        self._path: Path | None = None
+        self._map: mmap.mmap | None = None
+        self._used = _HEADER.size
+
+    def slot(self, key: str) -> int:
+        """Return the index of the value for `key`, appending it to the file if new."""
+        index = self._slots.get(key)
+        if index is not None:
+            return index
+        index = super().slot(key)
+        encoded = key.encode()
+        value_offset = _aligned(self._used + _KEY_LENGTH.size + len(encoded))
+        end = value_offset + _VALUE.size
+        data = self._mapping(end)
+        _KEY_LENGTH.pack_into(data, self._used, len(encoded))
+        start = self._used + _KEY_LENGTH.size
+        data[start : start + len(encoded)] = encoded
+        _VALUE.pack_into(data, value_offset, 0.0)
+        _HEADER.pack_into(data, 0, end)
+        self._used = end
+        self._offsets.append(value_offset)
+        return index
+
+    def add(self, index: int, amount: float) -> None:
+        """Add `amount` to a value and write it through to the file."""
+        values = self.values
+        values[index] += amount
+        if self._map is not None:
+            _VALUE.pack_into(self._map, self._offsets[index], values[index])
+
+    def totals(self) -> dict[str, float]:
+        """Return every value by key, summed over the archive and the files of all workers."""
+        while True:
+            # Listed before the archive is read: a file missing from the listing was
+            # archived already, and one archived after it is either skipped or gone
+            paths = sorted(self._directory.glob(_FILE_PATTERN))
+            totals, archived = _read_archive(self._directory / _ARCHIVE)
+            try:
+                for path in paths:
+                    if path.name in archived:
+                        continue
+                    for key, value in _read_file(path):
+                        totals[key] = totals.get(key, 0.0) + value
+            except FileNotFoundError:
+                # Archived and removed since the listing, with an archive read before that
+                continue
+            return totals
+
+    def retire(self, pid: int) -> None:
+        """Fold the files of exited process `pid` into the archive and remove them.
+
+        The new archive replaces the old one atomically and names the files it
+        took in, so a concurrent `totals()` never counts a file twice; the files
+        are only removed after that.
+        """
+        paths = sorted(self._directory.glob(f"metrics-{pid}-*.db"))
+        if not paths:
+            return
+        archive = self._directory / _ARCHIVE
+        totals, _ = _read_archive(archive)
+        for path in paths:
+            for key, value in _read_file(path):
+                totals[key] = totals.get(key, 0.0) + value
+        staging = archive.with_suffix(".tmp")
+        staging.write_text(json.dumps({"files": [path.name for path in paths], "values": totals}))
+        staging.replace(archive)
+        for path in paths:
+            path.unlink()
+
+    def _mapping(self, size: int) -> mmap.mmap:
+        """Return the mapping of this process's file, growing it to hold `size` bytes."""
+        if self._map is not None and size <= len(self._map):
+            return self._map
+        length = max(_INITIAL_FILE_SIZE, len(self._map) * 2 if self._map else 0)
+        while length < size:
+            length *= 2
+        if self._map is not None:
+            self._map.close()
+        if self._path is None:
+            # Named on first use, which happens in the worker rather than before forking;
+            # the random part keeps a reused pid from picking up an archived name
+            self._path = self._directory / f"metrics-{os.getpid()}-{secrets.token_hex(4)}.db"
+        with self._path.open("a+b") as file:
+            file.truncate(length)
+            self._map = mmap.mmap(file.fileno(), length)
+        return self._map
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _read_archive(path: Path) -> tuple[dict[str, float], set[str]]:
+    """Read the archived values and the names of the files last folded into them."""
+    try:
+        archive = json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}, set()
+    return dict(archive["values"]), set(archive["files"])
+
+
+def _read_file(path: Path) -> list[tuple[str, float]]:
+    """Read the entries of one worker's metrics file."""
+    data = path.read_bytes()
+    if len(data) < _HEADER.size:
+        return []
+    (used,) = _HEADER.unpack_from(data)
+    entries: list[tuple[str, float]] = []
+    offset = _HEADER.size
+    while offset < min(used, len(data)):
+        (length,) = _KEY_LENGTH.unpack_from(data, offset)
+        start = offset + _KEY_LENGTH.size
+        key = data[start : start + length].decode()
+        value_offset = _aligned(start + length)
+        (value,) = _VALUE.unpack_from(data, value_offset)
+        entries.append((key, value))
+        offset = value_offset + _VALUE.size
+    return entries
+
+
+class CounterSeries:
+    """One labelled time series of a counter."""
+
+    __slots__ = ("_index", "_store")
+
+    def __init__(self, store: _MemoryStore, index: int) -> None:
+        self._store = store
+        self._index = index
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter."""
+        self._store.add(self._index, amount)
+
+
+class HistogramSeries:
+    """One labelled time series of a histogram."""
+
+    __slots__ = ("_bounds", "_buckets", "_store", "_sum")
+
+    def __init__(
+        self, store: _MemoryStore, bounds: Sequence[float], buckets: list[int], total: int
+    ) -> None:
+        self._store = store
+        self._bounds = bounds
+        self._buckets = buckets
+        self._sum = total
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        store = self._store
+        store.add(self._buckets[bisect_left(self._bounds, value)], 1.0)
+        store.add(self._sum, value)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(
+        self, registry: "Registry", name: str, documentation: str, labelnames: Sequence[str]
+    ) -> None:
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, values: Sequence[str], sample: str) -> str:
+        return json.dumps([self.name, list(values), sample])
+
+    def _check(self, values: Sequence[str]) -> None:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(values)}")
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Forget cached series, after the registry switched stores."""
+
+    @abstractmethod
+    def render(self, values: tuple[str, ...], samples: dict[str, float]) -> list[str]:
+        """Return the exposition lines of one series."""
+
+
+class Counter(_Metric):
+    """Monotonic counter; by convention its name ends in `_total`."""
+
+    kind = "counter"
+
+    def __init__(
+        self, registry: "Registry", name: str, documentation: str, labelnames: Sequence[str]
+    ) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        self._series: dict[tuple[str, ...], CounterSeries] = {}
+
+    def labels(self, *values: str) -> CounterSeries:
+        """Return the series for the given label values."""
+        series = self._series.get(values)
+        if series is None:
+            self._check(values)
+            store = self._registry.store
+            series = self._series[values] = CounterSeries(store, store.slot(self._key(values, "")))
+        return series
+
+    def reset(self) -> None:
+        """Forget cached series, after the registry switched stores."""
+        self._series.clear()
+
+    def render(self, values: tuple[str, ...], samples: dict[str, float]) -> list[str]:
+        """Return the exposition line of one series."""
+        return [f"{self.name}{_labels(self.labelnames, values)} {_number(samples.get('', 0.0))}"]
+
+
+class Histogram(_Metric):
+    """Histogram with fixed bucket upper bounds (in ascending order)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: "Registry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        if list(buckets) != sorted(set(buckets)) or not buckets:
+            raise ValueError("Histogram buckets must be distinct and in ascending order")
+        self.bounds = (*(b for b in buckets if b != math.inf), math.inf)
+        self._series: dict[tuple[str, ...], HistogramSeries] = {}
+
+    def labels(self, *values: str) -> HistogramSeries:
+        """Return the series for the given label values."""
+        series = self._series.get(values)
+        if series is None:
+            self._check(values)
+            store = self._registry.store
+            buckets = [store.slot(self._key(values, str(i))) for i in range(len(self.bounds))]
+            total = store.slot(self._key(values, "sum"))
+            series = self._series[values] = HistogramSeries(store, self.bounds, buckets, total)
+        return series
+
+    def reset(self) -> None:
+        """Forget cached series, after the registry switched stores."""
+        self._series.clear()
+
+    def render(self, values: tuple[str, ...], samples: dict[str, float]) -> list[str]:
+        """Return the cumulative bucket, sum and count lines of one series."""
+        lines: list[str] = []
+        cumulative = 0.0
+        for i, bound in enumerate(self.bounds):
+            cumulative += samples.get(str(i), 0.0)
+            le = "+Inf" if bound == math.inf else repr(bound)
+            labels = _labels((*self.labelnames, "le"), (*values, le))
+            lines.append(f"{self.name}_bucket{labels} {_number(cumulative)}")
+        labels = _labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_number(samples.get('sum', 0.0))}")
+        lines.append(f"{self.name}_count{labels} {_number(cumulative)}")
+        return lines
+
+
+class Registry:
+    """Set of metrics exposed together."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry keeping values in process."""
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.store: _MemoryStore = _MemoryStore()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter.
+
+        Raises:
+            ValueError: If a metric with this name is already registered
+        """
+        metric = Counter(self, name, documentation, labelnames)
+        self._register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram.
+
+        Raises:
+            ValueError: If a metric with this name is already registered
+        """
+        metric = Histogram(self, name, documentation, labelnames, buckets)
+        self._register(metric)
+        return metric
+
+    def use_directory(self, directory: str) -> None:
+        """Keep values in per-process files in `directory`, shared between workers.
+
+        Call it before forking and before anything is recorded.
+        """
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.store = _FileStore(Path(directory))
+            for metric in self._metrics.values():
+                metric.reset()
+
+    def retire_process(self, pid: int) -> None:
+        """Fold the values of exited worker `pid` into those kept for exited workers.
+
+        The supervisor calls it for each worker it reaps, so metrics files do not
+        pile up as workers are recycled. No-op unless `use_directory()` was called.
+        """
+        self.store.retire(pid)
+
+    def expose(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        grouped: dict[str, dict[tuple[str, ...], dict[str, float]]] = {}
+        for key, value in self.store.totals().items():
+            name, values, sample = json.loads(key)
+            series = grouped.setdefault(name, {}).setdefault(tuple(values), {})
+            series[sample] = value
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for values, samples in sorted(grouped.get(metric.name, {}).items()):
+                lines.extend(metric.render(values, samples))
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered")
+            self._metrics[metric.name] = metric
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+# Metrics served at /metrics
+registry = Registry()
@@ -0,0 +1,269 @@
+"""
+Production server launcher.
+
+Runs the application under uvicorn with the worker, socket and protocol
+options from Settings. With several workers the supervisor binds the
+listening socket, imports the application and freezes the garbage collector
+before forking, so every worker shares the imported modules' memory pages
+copy-on-write instead of holding its own copy. Workers that exit, for example
+after serving their max_requests, are replaced until the supervisor is asked
+to stop.
+"""
+
+import asyncio
+import gc
+import logging
+import os
+import random
+import shutil
+import signal
+import socket
+import tempfile
+import time
+from contextlib import suppress
+from importlib.util import find_spec
+from types import FrameType
+from typing import Any
+
+import uvicorn
+from uvicorn.config import STARTUP_FAILURE
+from uvicorn.importer import import_from_string
+
+from app.core.config import Settings
+from app.core.metrics import registry
+
+APP_PATH = "app.api.router:app"
+
+POLL_INTERVAL_SECONDS = 0.1
+
+# Time a stopping process keeps reading connections it has already accepted,
+# after it stops accepting new ones, before it closes those without a request
+DRAIN_SECONDS = 0.5
+
+# Extra time a stopping worker gets after its graceful timeout to run the
+# lifespan shutdown, before the supervisor kills it
+SHUTDOWN_MARGIN_SECONDS = 5.0
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def worker_count(settings: Settings) -> int:
+    """Return the number of worker processes to run.
+
+    Debug mode, platforms without fork, and a persisted memory backend (whose
+    log has a single writer) always run a single process.
+    """
+    if settings.debug or not hasattr(os, "fork"):
+        return 1
+    if settings.repository_type == "memory" and settings.persistence_enabled:
+        return 1
+    return settings.server_workers or os.cpu_count() or 1
+
+
+def event_loop(settings: Settings) -> str:
+    """Return the event loop implementation the configured setting resolves to."""
+    if settings.server_event_loop != "auto":
+        return settings.server_event_loop
+    return "uvloop" if find_spec("uvloop") is not None else "asyncio"
+
+
+def http_parser(settings: Settings) -> str:
+    """Return the HTTP parser implementation the configured setting resolves to."""
+    if settings.server_http_parser != "auto":
+        return settings.server_http_parser
+    return "httptools" if find_spec("httptools") is not None else "h11"
+
+
+def server_options(settings: Settings) -> dict[str, Any]:
+    """Return the uvicorn options shared by every server process."""
+    return {
+        "host": settings.server_host,
+        "port": settings.server_port,
+        "loop": event_loop(settings),
+        "http": http_parser(settings),
+        "backlog": settings.server_backlog,
+        "timeout_keep_alive": settings.server_keep_alive_seconds,
+        "timeout_graceful_shutdown": settings.server_graceful_timeout_seconds,
+        "log_level": logging.DEBUG if settings.debug else logging.INFO,
+    }
+
+
+def build_config(settings: Settings, app: Any, max_requests: int | None = None) -> uvicorn.Config:
+    """Build the uvicorn configuration for one server process.
+
+    Args:
+        settings: Application settings
+        app: ASGI application
+        max_requests: Requests after which the process exits (None never exits)
+    """
+    return uvicorn.Config(app, limit_max_requests=max_requests, **server_options(settings))
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that stops accepting connections before closing idle ones.
+
+    uvicorn's shutdown closes every connection not in a request at once,
+    including ones accepted a moment earlier whose request has not been read
+    yet, so a worker recycled after max_requests would drop them. Here the
+    listener is closed first, leaving new connections to the other workers,
+    and accepted connections get `DRAIN_SECONDS` to start their request, which
+    is then served as during any graceful shutdown.
+    """
+
+    async def shutdown(self, sockets: list[socket.socket] | None = None) -> None:
+        """Stop accepting, let accepted connections start their requests, then shut down."""
+        for server in self.servers:
+            server.close()
+        await asyncio.sleep(DRAIN_SECONDS)
+        await super().shutdown(sockets=sockets)
+
+
+def describe(settings: Settings) -> str:
+    """Summarize the effective server configuration in one line."""
+    workers = worker_count(settings)
+    recycling = "off"
+    if settings.server_max_requests:
+        recycling = f"{settings.server_max_requests}+{settings.server_max_requests_jitter}"
+    return (
+        f"Serving on {settings.server_host}:{settings.server_port} with {workers} "
+        f"worker{'s' if workers != 1 else ''} (pid {os.getpid()}): "
+        f"loop={event_loop(settings)} http={http_parser(settings)} "
+        f"backlog={settings.server_backlog} keep-alive={settings.server_keep_alive_seconds}s "
+        f"graceful-timeout={settings.server_graceful_timeout_seconds}s "
+        f"max-requests={recycling}"
+    )
+
+
+def serve(settings: Settings, app_path: str = APP_PATH) -> int:
+    """Run the server until it is stopped and return the process exit code.
+
+    Args:
+        settings: Application settings
+        app_path: Import string of the ASGI application
+    """
+    if settings.debug:
+        # The reloader re-imports the application, so it takes the import string
+        uvicorn.run(app_path, reload=True, **server_options(settings))
+        return 0
+    # Imported before any fork so that workers share the loaded modules
+    app = import_from_string(app_path)
+    workers = worker_count(settings)
+    if workers == 1:
+        server = DrainingServer(build_config(settings, app, _max_requests(settings)))
+        logger.info(describe(settings))
+        server.run()
+        return 0 if server.started else STARTUP_FAILURE
+    return Supervisor(settings, app, workers).run()
+
+
+def _max_requests(settings: Settings) -> int | None:
+    """Pick this worker's request limit, spreading recycling with the jitter."""
+    if not settings.server_max_requests:
+        return None
+    return settings.server_max_requests + random.randint(0, settings.server_max_requests_jitter)
+
+
+class Supervisor:
+    """Pre-forking process supervisor.
+
+    Keeps `workers` processes serving a shared socket, replaces workers that
+    exit, and on SIGINT/SIGTERM stops them gracefully, killing any still
+    running once the graceful timeout has passed.
+    """
+
+    def __init__(self, settings: Settings, app: Any, workers: int) -> None:
+        """Initialize the supervisor.
+
+        Args:
+            settings: Application settings
+            app: ASGI application, imported before forking
+            workers: Number of worker processes to keep running
+        """
+        self._settings = settings
+        self._app = app
+        self._workers = workers
+        self._pids: set[int] = set()
+        self._stop_deadline: float | None = None
+        self._exit_code = 0
+
+    def run(self) -> int:
+        """Fork the workers and supervise them until they have all stopped."""
+        sock = build_config(self._settings, self._app).bind_socket()
+        logger.info(describe(self._settings))
+        # Each worker keeps its metrics in a file here, so /metrics covers all of them
+        metrics_dir = tempfile.mkdtemp(prefix="metrics-")
+        registry.use_directory(metrics_dir)
+        # Everything imported so far is shared with the workers. Moving it to
+        # the permanent generation keeps their collectors from touching (and so
+        # un-sharing) those pages.
+        gc.collect()
+        gc.freeze()
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGTERM, self._request_stop)
+        try:
+            while True:
+                if self._stop_deadline is None:
+                    while len(self._pids) < self._workers:
+                        self._spawn(sock)
+                elif not self._pids:
+                    return self._exit_code
+                elif time.monotonic() > self._stop_deadline:
+                    self._signal_workers(signal.SIGKILL)
+                self._reap()
+                time.sleep(POLL_INTERVAL_SECONDS)
+        finally:
+            sock.close()
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+    def _spawn(self, sock: socket.socket) -> None:
+        """Fork a worker serving `sock`."""
+        pid = os.fork()
+        if pid:
+            self._pids.add(pid)
+            return
+        code = 1
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            config = build_config(self._settings, self._app, _max_requests(self._settings))
+            server = DrainingServer(config)
+            server.run(sockets=[sock])
+            code = 0 if server.started else STARTUP_FAILURE
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        finally:
+            os._exit(code)
+
+    def _reap(self) -> None:
+        """Collect exited workers, stopping everything if one failed to start."""
+        while self._pids:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if not pid:
+                return
+            self._pids.discard(pid)
+            try:
+                registry.retire_process(pid)
+            except OSError:
+                logger.exception("Could not archive the metrics of worker %d", pid)
+            code = os.waitstatus_to_exitcode(status)
+            if code == STARTUP_FAILURE and self._stop_deadline is None:
+                logger.error("Worker %d failed to start, stopping", pid)
+                self._exit_code = STARTUP_FAILURE
+                self._request_stop(signal.SIGTERM, None)
+            elif self._stop_deadline is None:
+                logger.info("Worker %d exited with code %d, replacing it", pid, code)
+
+    def _request_stop(self, signum: int, frame: FrameType | None) -> None:
+        """Begin a graceful stop of every worker."""
+        if self._stop_deadline is not None:
+            return
+        logger.info("Stopping %d workers", len(self._pids))
+        timeout = self._settings.server_graceful_timeout_seconds + SHUTDOWN_MARGIN_SECONDS
+        self._stop_deadline = time.monotonic() + timeout
+        self._signal_workers(signal.SIGTERM)
+
+    def _signal_workers(self, signum: int) -> None:
+        """Send a signal to every running worker."""
+        for pid in self._pids:
+            with suppress(ProcessLookupError):
+                os.kill(pid, signum)
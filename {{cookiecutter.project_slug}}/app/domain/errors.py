@@ -20,6 +20,30 @@ class EntityValidationError(Exception):
 
     def __init__(self, message: str) -> None:
         super().__init__(message)
+
+
+class EntityVersionConflictError(Exception):
+    """Raised when a write expected a different version than the stored one.
+
+    `from_if_match` is set when the expected version came from an If-Match
+    header rather than from the request body.
+    """
+
+    def __init__(
+        self,
+        entity_id: str,
+        actual_version: int,
+        expected_version: int | None = None,
+        from_if_match: bool = False,
+    ) -> None:
+        self.entity_id = entity_id
+        self.actual_version = actual_version
+        self.expected_version = expected_version
+        self.from_if_match = from_if_match
+        message = f"Entity '{entity_id}' is at version {actual_version}"
+        if expected_version is not None:
+            message += f", expected version {expected_version}"
+        super().__init__(message)
 {% else %}
 # Example: Define your domain exceptions here
 # 
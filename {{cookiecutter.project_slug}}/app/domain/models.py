@@ -7,16 +7,26 @@ To create a new domain model:
 """
 
 from dataclasses import dataclass
+{%- if cookiecutter.include_entity_example == "yes" %}
+from dataclasses import field
+from math import isnan
+{%- endif %}
 
 {% if cookiecutter.include_entity_example == "yes" %}
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Entity:
-    """Entity domain model (immutable domain entity)."""
+    """Entity domain model (immutable domain entity).
+
+    Slotted, so an entity carries no per-instance __dict__.
+    """
 
     id: str
     name: str
     price: float
     in_stock: bool = True
+    # Assigned by the repository on every write (0 until stored); increases with
+    # each change, so it identifies a revision of the entity. Not part of equality.
+    version: int = field(default=0, compare=False)
 
     def __post_init__(self) -> None:
         """Validate domain invariants."""
@@ -24,8 +34,116 @@ class Entity:
             raise ValueError("Entity id cannot be empty")
         if not self.name or not self.name.strip():
             raise ValueError("Entity name cannot be empty")
+        if isnan(self.price):
+            raise ValueError("Entity price must be a number")
         if self.price < 0:
             raise ValueError("Entity price cannot be negative")
+        if self.version < 0:
+            raise ValueError("Entity version cannot be negative")
+
+
+@dataclass(frozen=True)
+class EntityQuery:
+    """Filter criteria for entity queries (unset fields match everything)."""
+
+    in_stock: bool | None = None
+    min_price: float | None = None
+    max_price: float | None = None
+    name_prefix: str | None = None
+
+    def __post_init__(self) -> None:
+        """Validate filter invariants."""
+        if (
+            self.min_price is not None
+            and self.max_price is not None
+            and self.min_price > self.max_price
+        ):
+            raise ValueError("min_price cannot be greater than max_price")
+        if self.name_prefix == "":
+            raise ValueError("name_prefix cannot be empty")
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the query has no criteria and matches every entity."""
+        return (
+            self.in_stock is None
+            and self.min_price is None
+            and self.max_price is None
+            and self.name_prefix is None
+        )
+
+    def matches(self, entity: Entity) -> bool:
+        """Check whether an entity satisfies every criterion."""
+        if self.in_stock is not None and entity.in_stock != self.in_stock:
+            return False
+        if self.min_price is not None and entity.price < self.min_price:
+            return False
+        if self.max_price is not None and entity.price > self.max_price:
+            return False
+        return self.name_prefix is None or entity.name.startswith(self.name_prefix)
+
+
+@dataclass(frozen=True)
+class EntityPatch:
+    """Changes to some fields of an entity (unset fields are left as stored)."""
+
+    name: str | None = None
+    price: float | None = None
+    in_stock: bool | None = None
+
+    def __post_init__(self) -> None:
+        """Validate the changed fields against the entity invariants."""
+        if self.name is not None and not self.name.strip():
+            raise ValueError("Entity name cannot be empty")
+        if self.price is not None and isnan(self.price):
+            raise ValueError("Entity price must be a number")
+        if self.price is not None and self.price < 0:
+            raise ValueError("Entity price cannot be negative")
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the patch changes nothing."""
+        return self.name is None and self.price is None and self.in_stock is None
+
+    def apply(self, entity: Entity) -> Entity:
+        """Return `entity` with the changed fields replaced."""
+        return Entity(
+            id=entity.id,
+            name=entity.name if self.name is None else self.name,
+            price=entity.price if self.price is None else self.price,
+            in_stock=entity.in_stock if self.in_stock is None else self.in_stock,
+            version=entity.version,
+        )
+
+
+@dataclass(frozen=True)
+class EntityPage:
+    """A page of entities from keyset (cursor) pagination.
+
+    `next_cursor` is an opaque token for the following page, or None when
+    this is the last page.
+    """
+
+    entities: list[Entity]
+    next_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class BatchItemResult:
+    """Outcome of one item in a batch operation.
+
+    Exactly one of `error` (failure) or a successful outcome is present; `entity`
+    is None on success for operations that return nothing, such as deletes.
+    """
+
+    entity_id: str
+    entity: Entity | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item was applied."""
+        return self.error is None
 {% else %}
 # Example: Define your domain models here
 # 
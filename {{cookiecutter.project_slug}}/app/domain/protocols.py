@@ -6,11 +6,18 @@ To create a new protocol:
 2. Define your protocol interface
 3. Import it in app/core/container.py and app/api/dependencies.py
 """
-
+{% if cookiecutter.include_entity_example == "yes" %}
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+{%- endif %}
 from typing import Protocol
 
 {% if cookiecutter.include_entity_example == "yes" %}
+from app.domain.models import BatchItemResult
 from app.domain.models import Entity
+from app.domain.models import EntityPage
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
 {% endif %}
 
 
@@ -18,26 +25,104 @@ class Repository(Protocol):
     """Protocol for entity persistence."""
 
     {% if cookiecutter.include_entity_example == "yes" %}
-    async def save(self, entity: Entity) -> None:
-        """Save an entity."""
+    async def save(self, entity: Entity) -> Entity:
+        """Save an entity and return it as stored, carrying its new version."""
         ...
 
     async def get_entity_by_id(self, entity_id: str) -> Entity | None:
         """Get an entity by ID."""
         ...
 
+    async def get_many(self, entity_ids: Sequence[str]) -> dict[str, Entity]:
+        """Get several entities by ID in one pass.
+
+        Returns:
+            The entities found, keyed by ID; IDs that are not stored are left out
+        """
+        ...
+
     async def list_all(self, offset: int = 0, limit: int | None = None) -> list[Entity]:
         """Retrieve all entities with optional pagination."""
         ...
 
-    async def update(self, entity: Entity) -> None:
-        """Update an existing entity.
+    async def find(
+        self, query: EntityQuery, offset: int = 0, limit: int | None = None
+    ) -> list[Entity]:
+        """Retrieve entities matching a query with optional pagination."""
+        ...
+
+    async def list_page(
+        self, limit: int, cursor: str | None = None, query: EntityQuery | None = None
+    ) -> EntityPage:
+        """Retrieve a page of entities using keyset pagination.
+
+        Args:
+            limit: Maximum number of entities to return
+            cursor: Opaque cursor from a previous page (None for the first page)
+            query: Optional filter criteria
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        ...
+
+    def validate_cursor(self, cursor: str) -> None:
+        """Check that `list_page` accepts a cursor, without reading any entities.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        ...
+
+    async def count(self, query: EntityQuery | None = None) -> int:
+        """Return the number of stored entities, optionally matching a query."""
+        ...
+
+    async def get_revision(self) -> int:
+        """Return the store-wide change counter.
+
+        It increases on every successful write, so an unchanged revision means no
+        entity has been created, updated or deleted in between.
+        """
+        ...
+
+    def iter_all(self, chunk_size: int = 1000) -> AsyncIterator[list[Entity]]:
+        """Iterate over all entities in chunks of at most `chunk_size`.
+
+        Implementations must not load the whole collection at once, and must keep
+        working when entities are written between chunks.
+        """
+        ...
+
+    async def update(self, entity: Entity, expected_version: int | None = None) -> Entity:
+        """Update an existing entity and return it as stored, carrying its new version.
 
         Args:
             entity: Entity with updated data
+            expected_version: Only apply the update if the stored entity is at this version
+
+        Raises:
+            ValueError: If entity with given ID doesn't exist
+            EntityVersionConflictError: If the stored version differs from expected_version
+        """
+        ...
+
+    async def patch(
+        self, entity_id: str, changes: EntityPatch, expected_version: int | None = None
+    ) -> Entity:
+        """Change some fields of a stored entity in one atomic read-modify-write.
+
+        Args:
+            entity_id: ID of the entity to change
+            changes: Fields to change; unset fields keep their stored values
+            expected_version: Only apply the changes if the stored entity is at this version
+
+        Returns:
+            The entity as stored, carrying its new version
 
         Raises:
             ValueError: If entity with given ID doesn't exist
+            EntityVersionConflictError: If the stored version differs from expected_version
         """
         ...
 
@@ -51,6 +136,29 @@ class Repository(Protocol):
             ValueError: If entity with given ID doesn't exist
         """
         ...
+
+    async def save_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Save several entities in one pass.
+
+        Items that cannot be saved are reported with a ValueError in their result;
+        they do not prevent the other items from being saved. Successful results
+        carry the stored entity with its new version.
+        """
+        ...
+
+    async def update_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Update several existing entities in one pass.
+
+        Missing entities are reported with a ValueError in their result.
+        """
+        ...
+
+    async def delete_many(self, entity_ids: Sequence[str]) -> list[BatchItemResult]:
+        """Delete several entities by ID in one pass.
+
+        Missing entities are reported with a ValueError in their result.
+        """
+        ...
     {% else %}
     # Example: Define your repository protocol methods here
     # 
@@ -66,6 +174,10 @@ class Repository(Protocol):
     #     """Retrieve all entities with optional pagination."""
     #     ...
     # 
+    # async def count(self) -> int:
+    #     """Return the total number of stored entities."""
+    #     ...
+    #
     # async def update(self, entity: Entity) -> None:
     #     """Update an existing entity.
     # 
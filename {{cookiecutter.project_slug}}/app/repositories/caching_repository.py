@@ -0,0 +1,291 @@
+"""
+Read-through caching decorator for repositories.
+
+Wraps any Repository and caches lookups by ID (`get_entity_by_id` and
+`get_many`), including misses, in a bounded LRU with a time-to-live. Every other
+read goes straight to the wrapped repository; writes go through and then
+invalidate the affected keys.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from app.domain.models import BatchItemResult
+from app.domain.models import Entity
+from app.domain.models import EntityPage
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
+from app.domain.protocols import Repository
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of cache counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CachingRepository:
+    """Repository decorator caching entity lookups by ID.
+
+    Safe under concurrent asyncio requests: a lookup only populates the cache if
+    no write started or finished while it was waiting on the wrapped repository,
+    so a slow read can never re-insert a value a write has just invalidated.
+    """
+
+    def __init__(
+        self,
+        repository: Repository,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 60.0,
+        negative_ttl_seconds: float = 5.0,
+        warmup_entries: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Wrap a repository.
+
+        Args:
+            repository: Repository to cache lookups for
+            max_entries: Maximum number of cached IDs (least recently used are evicted)
+            ttl_seconds: How long a found entity stays cached
+            negative_ttl_seconds: How long a miss stays cached (0 disables negative caching)
+            warmup_entries: How many stored entities startup() loads into the cache
+            clock: Monotonic time source, in seconds
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._repository = repository
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._negative_ttl = negative_ttl_seconds
+        self._warmup_entries = min(warmup_entries, max_entries)
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Entity | None]] = OrderedDict()
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            size=len(self._entries),
+        )
+
+    async def get_entity_by_id(self, entity_id: str) -> Entity | None:
+        """Get an entity by ID, serving it from the cache when possible."""
+        entries = self._entries
+        cached = entries.get(entity_id)
+        if cached is not None:
+            expires_at, entity = cached
+            if expires_at > self._clock():
+                entries.move_to_end(entity_id)
+                self._hits += 1
+                return entity
+            del entries[entity_id]
+            self._expirations += 1
+
+        self._misses += 1
+        writes = self._writes
+        entity = await self._repository.get_entity_by_id(entity_id)
+        if writes == self._writes:
+            self._store(entity_id, entity)
+        return entity
+
+    async def get_many(self, entity_ids: Sequence[str]) -> dict[str, Entity]:
+        """Get several entities by ID, fetching only the uncached ones in a single call."""
+        entries = self._entries
+        now = self._clock()
+        found: dict[str, Entity] = {}
+        uncached: list[str] = []
+        for entity_id in dict.fromkeys(entity_ids):
+            cached = entries.get(entity_id)
+            if cached is not None:
+                expires_at, entity = cached
+                if expires_at > now:
+                    entries.move_to_end(entity_id)
+                    self._hits += 1
+                    if entity is not None:
+                        found[entity_id] = entity
+                    continue
+                del entries[entity_id]
+                self._expirations += 1
+            self._misses += 1
+            uncached.append(entity_id)
+        if uncached:
+            writes = self._writes
+            fetched = await self._repository.get_many(uncached)
+            if writes == self._writes:
+                for entity_id in uncached:
+                    self._store(entity_id, fetched.get(entity_id))
+            found.update(fetched)
+        return found
+
+    async def save(self, entity: Entity) -> Entity:
+        """Save an entity and invalidate its cached lookup."""
+        self._begin_write()
+        try:
+            return await self._repository.save(entity)
+        finally:
+            self._invalidate((entity.id,))
+
+    async def list_all(self, offset: int = 0, limit: int | None = None) -> list[Entity]:
+        """Retrieve all entities with optional pagination."""
+        return await self._repository.list_all(offset=offset, limit=limit)
+
+    async def find(
+        self, query: EntityQuery, offset: int = 0, limit: int | None = None
+    ) -> list[Entity]:
+        """Retrieve entities matching a query with optional pagination."""
+        return await self._repository.find(query, offset=offset, limit=limit)
+
+    async def list_page(
+        self, limit: int, cursor: str | None = None, query: EntityQuery | None = None
+    ) -> EntityPage:
+        """Retrieve a page of entities using keyset pagination."""
+        return await self._repository.list_page(limit, cursor=cursor, query=query)
+
+    def validate_cursor(self, cursor: str) -> None:
+        """Check that `list_page` accepts a cursor, without reading any entities."""
+        self._repository.validate_cursor(cursor)
+
+    async def count(self, query: EntityQuery | None = None) -> int:
+        """Return the number of stored entities, optionally matching a query."""
+        return await self._repository.count(query)
+
+    async def get_revision(self) -> int:
+        """Return the store-wide change counter."""
+        return await self._repository.get_revision()
+
+    def iter_all(self, chunk_size: int = 1000) -> AsyncIterator[list[Entity]]:
+        """Iterate over all entities in chunks of at most `chunk_size`."""
+        return self._repository.iter_all(chunk_size)
+
+    async def update(self, entity: Entity, expected_version: int | None = None) -> Entity:
+        """Update an existing entity and invalidate its cached lookup."""
+        self._begin_write()
+        try:
+            return await self._repository.update(entity, expected_version)
+        finally:
+            self._invalidate((entity.id,))
+
+    async def patch(
+        self, entity_id: str, changes: EntityPatch, expected_version: int | None = None
+    ) -> Entity:
+        """Change some fields of an entity and invalidate its cached lookup."""
+        self._begin_write()
+        try:
+            return await self._repository.patch(entity_id, changes, expected_version)
+        finally:
+            self._invalidate((entity_id,))
+
+    async def delete(self, entity_id: str) -> None:
+        """Delete an entity by ID and invalidate its cached lookup."""
+        self._begin_write()
+        try:
+            await self._repository.delete(entity_id)
+        finally:
+            self._invalidate((entity_id,))
+
+    async def save_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Save several entities and invalidate their cached lookups."""
+        self._begin_write()
+        try:
+            return await self._repository.save_many(entities)
+        finally:
+            self._invalidate(entity.id for entity in entities)
+
+    async def update_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Update several entities and invalidate their cached lookups."""
+        self._begin_write()
+        try:
+            return await self._repository.update_many(entities)
+        finally:
+            self._invalidate(entity.id for entity in entities)
+
+    async def delete_many(self, entity_ids: Sequence[str]) -> list[BatchItemResult]:
+        """Delete several entities and invalidate their cached lookups."""
+        self._begin_write()
+        try:
+            return await self._repository.delete_many(entity_ids)
+        finally:
+            self._invalidate(entity_ids)
+
+    def clear_cache(self) -> None:
+        """Drop every cached lookup (counters are kept)."""
+        self._writes += 1
+        self._entries.clear()
+
+    async def startup(self) -> None:
+        """Start the wrapped repository, then prime the cache.
+
+        Loads the first `warmup_entries` stored entities, so lookups for them are
+        hits from the first request on. A chunk read while a write was in flight
+        is skipped, for the same reason a concurrent lookup is not cached.
+        """
+        start = getattr(self._repository, "startup", None)
+        if start is not None:
+            await start()
+        remaining = self._warmup_entries
+        if remaining == 0:
+            return
+        chunks = self._repository.iter_all(min(remaining, 1000))
+        writes = self._writes
+        async for chunk in chunks:
+            if writes == self._writes:
+                for entity in chunk[:remaining]:
+                    self._store(entity.id, entity)
+            remaining -= len(chunk)
+            if remaining <= 0:
+                break
+            writes = self._writes
+
+    async def close(self) -> None:
+        """Close the wrapped repository if it holds resources."""
+        close = getattr(self._repository, "close", None)
+        if close is not None:
+            await close()
+
+    def _store(self, entity_id: str, entity: Entity | None) -> None:
+        """Cache a lookup result, evicting the least recently used entry if full."""
+        ttl = self._ttl if entity is not None else self._negative_ttl
+        if ttl <= 0:
+            return
+        entries = self._entries
+        entries[entity_id] = (self._clock() + ttl, entity)
+        entries.move_to_end(entity_id)
+        if len(entries) > self._max_entries:
+            entries.popitem(last=False)
+            self._evictions += 1
+
+    def _begin_write(self) -> None:
+        """Mark a write as started so in-flight lookups don't cache stale data."""
+        self._writes += 1
+
+    def _invalidate(self, entity_ids: Iterable[str]) -> None:
+        """Drop cached lookups for IDs touched by a write that has finished."""
+        self._writes += 1
+        entries = self._entries
+        for entity_id in entity_ids:
+            entries.pop(entity_id, None)
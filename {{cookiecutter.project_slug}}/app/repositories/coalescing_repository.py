@@ -0,0 +1,251 @@
+"""
+Single-flight decorator for repositories.
+
+Wraps any Repository so that identical reads issued while one is already in
+flight (lookups of the same ID, or list and count calls with the same
+arguments) wait for that call instead of reaching the wrapped repository again.
+Writes go straight through; once one starts or finishes, later reads start a
+fresh call, so nobody is handed a result read before their own write.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Hashable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+from typing import TypeVar
+
+from app.core.metrics import registry
+from app.domain.models import BatchItemResult
+from app.domain.models import Entity
+from app.domain.models import EntityPage
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
+from app.domain.protocols import Repository
+
+T = TypeVar("T")
+
+COALESCED_CALLS = registry.counter(
+    "repository_coalesced_calls_total",
+    "Repository reads served by joining an identical read already in flight, by operation.",
+    ("operation",),
+)
+
+
+@dataclass(frozen=True)
+class CoalescingStats:
+    """Snapshot of single-flight counters."""
+
+    # Reads passed on to the wrapped repository
+    calls: int
+    # Reads that joined one already in flight instead
+    coalesced: int
+
+
+class _Flight:
+    """Callers waiting for the outcome of a read another caller started."""
+
+    __slots__ = ("waiters",)
+
+    def __init__(self) -> None:
+        self.waiters: list[asyncio.Future[Any]] = []
+
+    def resolve(self, result: Any = None, error: BaseException | None = None) -> None:
+        """Hand the outcome to every waiter that has not been cancelled."""
+        for waiter in self.waiters:
+            if waiter.done():
+                continue
+            if error is None:
+                waiter.set_result(result)
+            else:
+                waiter.set_exception(error)
+
+    def settle(self, task: "asyncio.Task[Any]") -> None:
+        """Hand the outcome of a handed-over call to the waiters."""
+        if task.cancelled():
+            for waiter in self.waiters:
+                waiter.cancel()
+            return
+        error = task.exception()
+        self.resolve(None if error is not None else task.result(), error)
+
+
+class CoalescingRepository:
+    """Repository decorator sharing one call between concurrent identical reads.
+
+    The first caller runs the call itself, so a read nobody else asks for costs
+    no more than a dictionary lookup; later identical callers wait for its
+    outcome, its result or the same exception. A waiting caller that is
+    cancelled just stops waiting. If the first caller is cancelled while others
+    are waiting, the call is restarted in a background task for them. Entities
+    are immutable, and list results are copied per caller.
+    """
+
+    def __init__(self, repository: Repository) -> None:
+        """Wrap a repository.
+
+        Args:
+            repository: Repository to coalesce reads for
+        """
+        self._repository = repository
+        self._flights: dict[Hashable, _Flight] = {}
+        self._handovers: set[asyncio.Task[Any]] = set()
+        self._calls = 0
+        self._coalesced = 0
+
+    @property
+    def stats(self) -> CoalescingStats:
+        """Return a snapshot of the single-flight counters."""
+        return CoalescingStats(calls=self._calls, coalesced=self._coalesced)
+
+    async def get_entity_by_id(self, entity_id: str) -> Entity | None:
+        """Get an entity by ID, sharing a lookup already in flight for it."""
+        return await self._shared(
+            "get_entity_by_id",
+            ("get_entity_by_id", entity_id),
+            lambda: self._repository.get_entity_by_id(entity_id),
+        )
+
+    async def get_many(self, entity_ids: Sequence[str]) -> dict[str, Entity]:
+        """Get several entities by ID, sharing a call in flight for the same IDs."""
+        key = tuple(entity_ids)
+        entities = await self._shared(
+            "get_many", ("get_many", key), lambda: self._repository.get_many(key)
+        )
+        return dict(entities)
+
+    async def list_all(self, offset: int = 0, limit: int | None = None) -> list[Entity]:
+        """Retrieve all entities with optional pagination."""
+        entities = await self._shared(
+            "list_all",
+            ("list_all", offset, limit),
+            lambda: self._repository.list_all(offset=offset, limit=limit),
+        )
+        return list(entities)
+
+    async def find(
+        self, query: EntityQuery, offset: int = 0, limit: int | None = None
+    ) -> list[Entity]:
+        """Retrieve entities matching a query with optional pagination."""
+        entities = await self._shared(
+            "find",
+            ("find", query, offset, limit),
+            lambda: self._repository.find(query, offset=offset, limit=limit),
+        )
+        return list(entities)
+
+    async def list_page(
+        self, limit: int, cursor: str | None = None, query: EntityQuery | None = None
+    ) -> EntityPage:
+        """Retrieve a page of entities using keyset pagination."""
+        page = await self._shared(
+            "list_page",
+            ("list_page", limit, cursor, query),
+            lambda: self._repository.list_page(limit, cursor=cursor, query=query),
+        )
+        return EntityPage(list(page.entities), page.next_cursor)
+
+    def validate_cursor(self, cursor: str) -> None:
+        """Check that `list_page` accepts a cursor, without reading any entities."""
+        self._repository.validate_cursor(cursor)
+
+    async def count(self, query: EntityQuery | None = None) -> int:
+        """Return the number of stored entities, optionally matching a query."""
+        return await self._shared("count", ("count", query), lambda: self._repository.count(query))
+
+    async def get_revision(self) -> int:
+        """Return the store-wide change counter."""
+        return await self._repository.get_revision()
+
+    def iter_all(self, chunk_size: int = 1000) -> AsyncIterator[list[Entity]]:
+        """Iterate over all entities in chunks of at most `chunk_size` (not coalesced)."""
+        return self._repository.iter_all(chunk_size)
+
+    async def save(self, entity: Entity) -> Entity:
+        """Save an entity."""
+        return await self._write(self._repository.save(entity))
+
+    async def update(self, entity: Entity, expected_version: int | None = None) -> Entity:
+        """Update an existing entity."""
+        return await self._write(self._repository.update(entity, expected_version))
+
+    async def patch(
+        self, entity_id: str, changes: EntityPatch, expected_version: int | None = None
+    ) -> Entity:
+        """Change some fields of an entity."""
+        return await self._write(self._repository.patch(entity_id, changes, expected_version))
+
+    async def delete(self, entity_id: str) -> None:
+        """Delete an entity by ID."""
+        await self._write(self._repository.delete(entity_id))
+
+    async def save_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Save several entities."""
+        return await self._write(self._repository.save_many(entities))
+
+    async def update_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Update several entities."""
+        return await self._write(self._repository.update_many(entities))
+
+    async def delete_many(self, entity_ids: Sequence[str]) -> list[BatchItemResult]:
+        """Delete several entities."""
+        return await self._write(self._repository.delete_many(entity_ids))
+
+    async def startup(self) -> None:
+        """Start the wrapped repository if it has startup work."""
+        start = getattr(self._repository, "startup", None)
+        if start is not None:
+            await start()
+
+    async def close(self) -> None:
+        """Close the wrapped repository if it holds resources."""
+        close = getattr(self._repository, "close", None)
+        if close is not None:
+            await close()
+
+    async def _shared(self, operation: str, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Wait for the read in flight under `key`, or run `call` as that read."""
+        flight = self._flights.get(key)
+        if flight is not None:
+            self._coalesced += 1
+            COALESCED_CALLS.labels(operation).inc()
+            waiter: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+            flight.waiters.append(waiter)
+            return await waiter
+
+        flight = self._flights[key] = _Flight()
+        self._calls += 1
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            self._land(key, flight)
+            if not all(waiter.done() for waiter in flight.waiters):
+                # The others did not ask to be cancelled, so finish the call for them
+                handover = asyncio.ensure_future(call())
+                self._handovers.add(handover)
+                handover.add_done_callback(self._handovers.discard)
+                handover.add_done_callback(flight.settle)
+            raise
+        except Exception as e:
+            self._land(key, flight)
+            flight.resolve(error=e)
+            raise
+        self._land(key, flight)
+        flight.resolve(result)
+        return result
+
+    def _land(self, key: Hashable, flight: _Flight) -> None:
+        """Forget a finished read, unless a write already dropped it."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def _write(self, call: Awaitable[T]) -> T:
+        """Await a write, keeping reads that start around it out of earlier flights."""
+        self._flights.clear()
+        try:
+            return await call
+        finally:
+            self._flights.clear()
@@ -0,0 +1,137 @@
+"""
+Columnar storage engine for MemoryRepository.
+
+Instead of keeping one Entity object per record, each field lives in its own
+compact column: prices and versions in typed arrays, stock flags in a bitset
+and names in a list of interned strings. An id -> row dict locates records.
+Entity objects are only materialized when a record is read.
+"""
+
+import sys
+from array import array
+from collections.abc import Callable
+from collections.abc import Iterator
+from types import MemberDescriptorType
+
+from app.domain.models import Entity
+
+
+def _field_setter(name: str) -> Callable[[Entity, object], None]:
+    """Return the slot setter for an Entity field.
+
+    Calling the slot descriptor directly bypasses the frozen dataclass
+    __setattr__, which is the cheapest way to fill in a new instance.
+    """
+    descriptor: MemberDescriptorType = vars(Entity)[name]
+    return descriptor.__set__
+
+
+_new_entity = object.__new__
+_set_id = _field_setter("id")
+_set_name = _field_setter("name")
+_set_price = _field_setter("price")
+_set_in_stock = _field_setter("in_stock")
+_set_version = _field_setter("version")
+
+
+class ColumnarEntityStore:
+    """Mapping of entity ID to Entity backed by per-field columns.
+
+    Implements the subset of the dict interface MemoryRepository uses, and
+    behaves like the dict it replaces: iteration follows insertion order, and
+    replacing an existing ID keeps its position. Rows freed by deletes are
+    reused by later inserts.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._row_by_id: dict[str, int] = {}
+        self._names: list[str] = []
+        self._prices = array("d")
+        self._versions = array("q")
+        self._in_stock = bytearray()
+        self._free_rows: list[int] = []
+
+    def __len__(self) -> int:
+        """Return the number of stored entities."""
+        return len(self._row_by_id)
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether an ID is stored."""
+        return key in self._row_by_id
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over IDs in insertion order."""
+        return iter(self._row_by_id)
+
+    def __getitem__(self, entity_id: str) -> Entity:
+        """Materialize the entity stored under an ID."""
+        return self._materialize(entity_id, self._row_by_id[entity_id])
+
+    def get(self, entity_id: str) -> Entity | None:
+        """Materialize the entity stored under an ID, or return None."""
+        row = self._row_by_id.get(entity_id)
+        if row is None:
+            return None
+        return self._materialize(entity_id, row)
+
+    def __setitem__(self, entity_id: str, entity: Entity) -> None:
+        """Store an entity's fields, reusing its row if the ID is already stored."""
+        row = self._row_by_id.get(entity_id)
+        if row is None:
+            row = self._allocate_row()
+            self._row_by_id[entity_id] = row
+        self._names[row] = sys.intern(entity.name)
+        self._prices[row] = entity.price
+        self._versions[row] = entity.version
+        mask = 1 << (row & 7)
+        if entity.in_stock:
+            self._in_stock[row >> 3] |= mask
+        else:
+            self._in_stock[row >> 3] &= ~mask & 0xFF
+
+    def __delitem__(self, entity_id: str) -> None:
+        """Remove an entity, freeing its row for reuse."""
+        row = self._row_by_id.pop(entity_id)
+        self._names[row] = ""
+        self._free_rows.append(row)
+
+    def values(self) -> Iterator[Entity]:
+        """Materialize entities lazily, in insertion order."""
+        materialize = self._materialize
+        return (materialize(entity_id, row) for entity_id, row in self._row_by_id.items())
+
+    def clear(self) -> None:
+        """Remove every entity and release the columns."""
+        self._row_by_id.clear()
+        self._names.clear()
+        self._prices = array("d")
+        self._versions = array("q")
+        self._in_stock = bytearray()
+        self._free_rows.clear()
+
+    def _allocate_row(self) -> int:
+        """Return a free row, growing every column if none is left."""
+        if self._free_rows:
+            return self._free_rows.pop()
+        row = len(self._names)
+        self._names.append("")
+        self._prices.append(0.0)
+        self._versions.append(0)
+        if row >> 3 == len(self._in_stock):
+            self._in_stock.append(0)
+        return row
+
+    def _materialize(self, entity_id: str, row: int) -> Entity:
+        """Build an Entity from a row.
+
+        Stored values were validated when the entity was constructed, so the
+        fields are assigned directly instead of running __post_init__ again.
+        """
+        entity = _new_entity(Entity)
+        _set_id(entity, entity_id)
+        _set_name(entity, self._names[row])
+        _set_price(entity, self._prices[row])
+        _set_in_stock(entity, bool(self._in_stock[row >> 3] >> (row & 7) & 1))
+        _set_version(entity, self._versions[row])
+        return entity
@@ -0,0 +1,34 @@
+"""
+Opaque pagination cursors.
+
+Repositories hand out cursors that encode the position of the last returned
+record. Clients must treat them as opaque strings.
+"""
+
+from base64 import urlsafe_b64decode
+from base64 import urlsafe_b64encode
+from binascii import Error as Base64Error
+
+_PREFIX = "seq:"
+
+
+def encode_cursor(position: int) -> str:
+    """Encode a repository position into an opaque cursor."""
+    raw = f"{_PREFIX}{position}".encode("ascii")
+    return urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode an opaque cursor back into a repository position.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = urlsafe_b64decode(padded.encode("ascii")).decode("ascii")
+    except (Base64Error, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
+    if not raw.startswith(_PREFIX) or not raw[len(_PREFIX) :].isdigit():
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return int(raw[len(_PREFIX) :])
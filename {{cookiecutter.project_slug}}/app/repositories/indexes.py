@@ -0,0 +1,279 @@
+"""
+In-memory index structures used by repositories.
+
+These are plain data structures with no knowledge of domain models, so they can
+back any repository that keys its records by a string ID.
+"""
+
+from bisect import bisect_left
+from bisect import bisect_right
+from bisect import insort
+from collections.abc import Iterable
+from collections.abc import Iterator
+from operator import itemgetter
+
+_value = itemgetter(0)
+_MAX_CODEPOINT = 0x10FFFF
+
+# Compact once tombstones make up this share of the index (and at least this many exist)
+_COMPACT_RATIO = 0.5
+_COMPACT_MIN_TOMBSTONES = 64
+
+
+class OrderedIndex:
+    """Insertion-ordered index of keys supporting keyset scans.
+
+    Each key gets a monotonically increasing sequence number when first added.
+    Seeking to a sequence number is a binary search, so scanning a page after any
+    position costs O(log n + page size). Removed keys leave a tombstone that is
+    compacted away once tombstones dominate the index.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._seqs: list[int] = []
+        self._keys: list[str | None] = []
+        self._seq_by_key: dict[str, int] = {}
+        self._next_seq = 1
+        self._tombstones = 0
+
+    def __len__(self) -> int:
+        """Return the number of live keys."""
+        return len(self._seq_by_key)
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether a key is indexed."""
+        return key in self._seq_by_key
+
+    def add(self, key: str) -> int:
+        """Add a key and return its sequence number.
+
+        Adding a key that is already indexed keeps its original position.
+        """
+        seq = self._seq_by_key.get(key)
+        if seq is not None:
+            return seq
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seqs.append(seq)
+        self._keys.append(key)
+        self._seq_by_key[key] = seq
+        return seq
+
+    def remove(self, key: str) -> None:
+        """Remove a key from the index (no-op if absent)."""
+        seq = self._seq_by_key.pop(key, None)
+        if seq is None:
+            return
+        self._keys[bisect_left(self._seqs, seq)] = None
+        self._tombstones += 1
+        if (
+            self._tombstones >= _COMPACT_MIN_TOMBSTONES
+            and self._tombstones > len(self._keys) * _COMPACT_RATIO
+        ):
+            self._compact()
+
+    def seq_of(self, key: str) -> int | None:
+        """Return the sequence number of a key, or None if not indexed."""
+        return self._seq_by_key.get(key)
+
+    def in_order(self, keys: Iterable[str]) -> list[tuple[int, str]]:
+        """Return (sequence, key) pairs for indexed keys, sorted by insertion order."""
+        seq_by_key = self._seq_by_key
+        return sorted((seq_by_key[key], key) for key in keys)
+
+    def iter_after(self, seq: int = 0) -> Iterator[tuple[int, str]]:
+        """Yield (sequence, key) pairs in insertion order, starting after `seq`."""
+        seqs = self._seqs
+        keys = self._keys
+        for position in range(bisect_right(seqs, seq), len(seqs)):
+            key = keys[position]
+            if key is not None:
+                yield seqs[position], key
+
+    def clear(self) -> None:
+        """Remove all keys (sequence numbers are never reused)."""
+        self._seqs.clear()
+        self._keys.clear()
+        self._seq_by_key.clear()
+        self._tombstones = 0
+
+    def _compact(self) -> None:
+        """Drop tombstones, keeping live keys in order."""
+        live = [
+            (seq, key) for seq, key in zip(self._seqs, self._keys, strict=True) if key is not None
+        ]
+        self._seqs = [seq for seq, _ in live]
+        self._keys = [key for _, key in live]
+        self._tombstones = 0
+
+
+class RangeIndex:
+    """Sorted index of numeric values supporting range queries.
+
+    Entries are kept as a sorted list of (value, key) pairs, so a range lookup is
+    two binary searches and yields only the matching keys.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._entries: list[tuple[float, str]] = []
+        self._values: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed keys."""
+        return len(self._values)
+
+    def put(self, key: str, value: float) -> None:
+        """Index a key under a value, replacing any previous value."""
+        previous = self._values.get(key)
+        if previous == value:
+            return
+        if previous is not None:
+            self._remove_entry(previous, key)
+        insort(self._entries, (value, key))
+        self._values[key] = value
+
+    def put_many(self, items: Iterable[tuple[str, float]]) -> None:
+        """Index many (key, value) pairs with a single sort instead of one insertion each."""
+        self._values.update(items)
+        self._entries = sorted((value, key) for key, value in self._values.items())
+
+    def remove(self, key: str) -> None:
+        """Remove a key from the index (no-op if absent)."""
+        previous = self._values.pop(key, None)
+        if previous is not None:
+            self._remove_entry(previous, key)
+
+    def between(self, low: float | None = None, high: float | None = None) -> Iterator[str]:
+        """Yield keys whose value lies within [low, high] (unbounded when None)."""
+        entries = self._entries
+        start, stop = self._bounds(low, high)
+        for position in range(start, stop):
+            yield entries[position][1]
+
+    def count(self, low: float | None = None, high: float | None = None) -> int:
+        """Count keys whose value lies within [low, high] in O(log n)."""
+        start, stop = self._bounds(low, high)
+        return max(stop - start, 0)
+
+    def clear(self) -> None:
+        """Remove all keys."""
+        self._entries.clear()
+        self._values.clear()
+
+    def _bounds(self, low: float | None, high: float | None) -> tuple[int, int]:
+        entries = self._entries
+        start = 0 if low is None else bisect_left(entries, low, key=_value)
+        stop = len(entries) if high is None else bisect_right(entries, high, key=_value)
+        return start, stop
+
+    def _remove_entry(self, value: float, key: str) -> None:
+        position = bisect_left(self._entries, (value, key))
+        del self._entries[position]
+
+
+class PrefixIndex:
+    """Sorted index of strings supporting prefix queries.
+
+    Strings sharing a prefix are contiguous in sorted order, so a prefix lookup
+    is a binary search to the first match followed by a scan of the matches.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._entries: list[tuple[str, str]] = []
+        self._values: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed keys."""
+        return len(self._values)
+
+    def put(self, key: str, value: str) -> None:
+        """Index a key under a string, replacing any previous string."""
+        previous = self._values.get(key)
+        if previous == value:
+            return
+        if previous is not None:
+            self._remove_entry(previous, key)
+        insort(self._entries, (value, key))
+        self._values[key] = value
+
+    def put_many(self, items: Iterable[tuple[str, str]]) -> None:
+        """Index many (key, value) pairs with a single sort instead of one insertion each."""
+        self._values.update(items)
+        self._entries = sorted((value, key) for key, value in self._values.items())
+
+    def remove(self, key: str) -> None:
+        """Remove a key from the index (no-op if absent)."""
+        previous = self._values.pop(key, None)
+        if previous is not None:
+            self._remove_entry(previous, key)
+
+    def prefix(self, prefix: str) -> Iterator[str]:
+        """Yield keys whose string starts with `prefix`."""
+        entries = self._entries
+        start, stop = self._bounds(prefix)
+        for position in range(start, stop):
+            yield entries[position][1]
+
+    def count(self, prefix: str) -> int:
+        """Count keys whose string starts with `prefix` in O(log n)."""
+        start, stop = self._bounds(prefix)
+        return stop - start
+
+    def clear(self) -> None:
+        """Remove all keys."""
+        self._entries.clear()
+        self._values.clear()
+
+    def _bounds(self, prefix: str) -> tuple[int, int]:
+        entries = self._entries
+        start = bisect_left(entries, prefix, key=_value)
+        upper = prefix_upper_bound(prefix)
+        if upper is None:
+            return start, len(entries)
+        return start, bisect_left(entries, upper, key=_value)
+
+    def _remove_entry(self, value: str, key: str) -> None:
+        position = bisect_left(self._entries, (value, key))
+        del self._entries[position]
+
+
+class BooleanIndex:
+    """Index partitioning keys into two sets by a boolean flag."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._sets: dict[bool, set[str]] = {True: set(), False: set()}
+
+    def put(self, key: str, value: bool) -> None:
+        """Index a key under a flag, moving it out of the other set."""
+        self._sets[not value].discard(key)
+        self._sets[value].add(key)
+
+    def remove(self, key: str) -> None:
+        """Remove a key from the index (no-op if absent)."""
+        self._sets[True].discard(key)
+        self._sets[False].discard(key)
+
+    def keys(self, value: bool) -> set[str]:
+        """Return the (live) set of keys indexed under a flag."""
+        return self._sets[value]
+
+    def count(self, value: bool) -> int:
+        """Count keys indexed under a flag in O(1)."""
+        return len(self._sets[value])
+
+    def clear(self) -> None:
+        """Remove all keys."""
+        self._sets[True].clear()
+        self._sets[False].clear()
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """Return the smallest string greater than every string starting with `prefix`."""
+    stripped = prefix.rstrip(chr(_MAX_CODEPOINT))
+    if not stripped:
+        return None
+    return stripped[:-1] + chr(ord(stripped[-1]) + 1)
@@ -0,0 +1,138 @@
+"""
+Timing decorator for repositories.
+
+Wraps any Repository and records how long each operation takes, and how
+often it raises, in the metrics served at /metrics.
+"""
+
+import time
+from collections.abc import AsyncIterator
+from collections.abc import Awaitable
+from collections.abc import Sequence
+
+from app.core.metrics import registry
+from app.domain.models import BatchItemResult
+from app.domain.models import Entity
+from app.domain.models import EntityPage
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
+from app.domain.protocols import Repository
+
+OPERATION_DURATION = registry.histogram(
+    "repository_operation_duration_seconds",
+    "Repository operation latency by operation.",
+    ("operation",),
+)
+OPERATION_ERRORS = registry.counter(
+    "repository_operation_errors_total",
+    "Repository operations that raised, by operation.",
+    ("operation",),
+)
+
+
+class InstrumentedRepository:
+    """Repository decorator timing every operation."""
+
+    def __init__(self, repository: Repository) -> None:
+        """Wrap a repository.
+
+        Args:
+            repository: Repository to time
+        """
+        self._repository = repository
+
+    async def save(self, entity: Entity) -> Entity:
+        """Save an entity."""
+        return await _timed("save", self._repository.save(entity))
+
+    async def get_entity_by_id(self, entity_id: str) -> Entity | None:
+        """Get an entity by ID."""
+        return await _timed("get_entity_by_id", self._repository.get_entity_by_id(entity_id))
+
+    async def get_many(self, entity_ids: Sequence[str]) -> dict[str, Entity]:
+        """Get several entities by ID."""
+        return await _timed("get_many", self._repository.get_many(entity_ids))
+
+    async def list_all(self, offset: int = 0, limit: int | None = None) -> list[Entity]:
+        """Retrieve all entities with optional pagination."""
+        return await _timed("list_all", self._repository.list_all(offset=offset, limit=limit))
+
+    async def find(
+        self, query: EntityQuery, offset: int = 0, limit: int | None = None
+    ) -> list[Entity]:
+        """Retrieve entities matching a query with optional pagination."""
+        return await _timed("find", self._repository.find(query, offset=offset, limit=limit))
+
+    async def list_page(
+        self, limit: int, cursor: str | None = None, query: EntityQuery | None = None
+    ) -> EntityPage:
+        """Retrieve a page of entities using keyset pagination."""
+        return await _timed(
+            "list_page", self._repository.list_page(limit, cursor=cursor, query=query)
+        )
+
+    def validate_cursor(self, cursor: str) -> None:
+        """Check that `list_page` accepts a cursor, without reading any entities."""
+        self._repository.validate_cursor(cursor)
+
+    async def count(self, query: EntityQuery | None = None) -> int:
+        """Return the number of stored entities, optionally matching a query."""
+        return await _timed("count", self._repository.count(query))
+
+    async def get_revision(self) -> int:
+        """Return the store-wide change counter."""
+        return await self._repository.get_revision()
+
+    def iter_all(self, chunk_size: int = 1000) -> AsyncIterator[list[Entity]]:
+        """Iterate over all entities in chunks of at most `chunk_size` (not timed)."""
+        return self._repository.iter_all(chunk_size)
+
+    async def update(self, entity: Entity, expected_version: int | None = None) -> Entity:
+        """Update an existing entity."""
+        return await _timed("update", self._repository.update(entity, expected_version))
+
+    async def patch(
+        self, entity_id: str, changes: EntityPatch, expected_version: int | None = None
+    ) -> Entity:
+        """Change some fields of an entity."""
+        return await _timed("patch", self._repository.patch(entity_id, changes, expected_version))
+
+    async def delete(self, entity_id: str) -> None:
+        """Delete an entity by ID."""
+        await _timed("delete", self._repository.delete(entity_id))
+
+    async def save_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Save several entities."""
+        return await _timed("save_many", self._repository.save_many(entities))
+
+    async def update_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Update several entities."""
+        return await _timed("update_many", self._repository.update_many(entities))
+
+    async def delete_many(self, entity_ids: Sequence[str]) -> list[BatchItemResult]:
+        """Delete several entities."""
+        return await _timed("delete_many", self._repository.delete_many(entity_ids))
+
+    async def startup(self) -> None:
+        """Start the wrapped repository if it has startup work."""
+        start = getattr(self._repository, "startup", None)
+        if start is not None:
+            await start()
+
+    async def close(self) -> None:
+        """Close the wrapped repository if it holds resources."""
+        close = getattr(self._repository, "close", None)
+        if close is not None:
+            await close()
+
+
+async def _timed[T](operation: str, call: Awaitable[T]) -> T:
+    """Await `call`, recording its duration and whether it raised."""
+    started = time.perf_counter()
+    try:
+        return await call
+    except Exception:
+        OPERATION_ERRORS.labels(operation).inc()
+        raise
+    finally:
+        OPERATION_DURATION.labels(operation).observe(time.perf_counter() - started)
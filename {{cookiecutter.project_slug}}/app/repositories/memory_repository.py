@@ -1,53 +1,360 @@
 {% if cookiecutter.include_entity_example == "yes" %}
+from collections.abc import AsyncIterator
+from collections.abc import Iterable
+from collections.abc import Sequence
+from dataclasses import replace
+from itertools import islice
+from typing import Protocol
+
+from app.domain.errors import EntityVersionConflictError
+from app.domain.models import BatchItemResult
 from app.domain.models import Entity
+from app.domain.models import EntityPage
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
+from app.repositories.cursor import decode_cursor
+from app.repositories.cursor import encode_cursor
+from app.repositories.indexes import BooleanIndex
+from app.repositories.indexes import OrderedIndex
+from app.repositories.indexes import PrefixIndex
+from app.repositories.indexes import RangeIndex
+
+
+class EntityStore(Protocol):
+    """The dict operations MemoryRepository needs from its storage engine.
+
+    A plain `dict[str, Entity]` satisfies it; ColumnarEntityStore trades some
+    read speed for a much smaller footprint per entity.
+    """
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, key: object, /) -> bool: ...
+
+    def __getitem__(self, key: str, /) -> Entity: ...
+
+    def __setitem__(self, key: str, value: Entity, /) -> None: ...
+
+    def __delitem__(self, key: str, /) -> None: ...
+
+    def get(self, key: str, /) -> Entity | None: ...
+
+    def values(self) -> Iterable[Entity]: ...
+
+    def clear(self) -> None: ...
 {% endif %}
 
 
 class MemoryRepository:
-    """In-memory repository for storing entities."""
+    """In-memory repository for storing entities.
+
+    Besides the primary dict, the repository maintains an insertion-ordered index
+    for cursor pagination and secondary indexes on price, stock status and name.
+    All indexes are updated incrementally on every write, so filtered queries
+    scale with the size of the result rather than the size of the store.
+
+    Every write bumps a store-wide revision counter, and stored entities carry
+    the revision of their last write as their version.
+    """
+
+    {% if cookiecutter.include_entity_example == "yes" %}
+    def __init__(self, store: EntityStore | None = None) -> None:
+        """Initialize empty storage.
 
+        Args:
+            store: Storage engine for the entities (a plain dict when omitted)
+        """
+        self._items: EntityStore = {} if store is None else store
+        self._order = OrderedIndex()
+        self._price_index = RangeIndex()
+        self._stock_index = BooleanIndex()
+        self._name_index = PrefixIndex()
+        self._revision = 0
+    {% else %}
     def __init__(self) -> None:
         """Initialize empty storage."""
-        {% if cookiecutter.include_entity_example == "yes" %}
-        self._items: dict[str, Entity] = {}
-        {% else %}
         # Example: Replace 'Entity' with your actual domain model
         # self._items: dict[str, Entity] = {}
-        {% endif %}
+    {% endif %}
 
     {% if cookiecutter.include_entity_example == "yes" %}
-    async def save(self, entity: Entity) -> None:
-        """Save an entity."""
-        if not entity.id:
-            raise ValueError("Entity must have an id to be saved")
-        self._items[entity.id] = entity
+    async def save(self, entity: Entity) -> Entity:
+        """Save an entity and return it with its new version."""
+        return self._save(entity)
 
     async def get_entity_by_id(self, entity_id: str) -> Entity | None:
         """Get an entity by ID."""
         return self._items.get(entity_id)
 
+    async def get_many(self, entity_ids: Sequence[str]) -> dict[str, Entity]:
+        """Get several entities by ID, leaving out the ones not stored."""
+        items = self._items
+        return {
+            entity_id: entity
+            for entity_id in entity_ids
+            if (entity := items.get(entity_id)) is not None
+        }
+
     async def list_all(self, offset: int = 0, limit: int | None = None) -> list[Entity]:
-        """Retrieve all saved entities with optional pagination."""
-        entities = list(self._items.values())
-        if offset > 0:
-            entities = entities[offset:]
-        if limit is not None:
-            entities = entities[:limit]
-        return entities
-
-    async def update(self, entity: Entity) -> None:
-        """Update an existing entity."""
+        """Retrieve all saved entities with optional pagination.
+
+        Only the requested window is copied out of the store.
+        """
+        stop = None if limit is None else offset + limit
+        return list(islice(self._items.values(), offset, stop))
+
+    async def find(
+        self, query: EntityQuery, offset: int = 0, limit: int | None = None
+    ) -> list[Entity]:
+        """Retrieve entities matching a query, in insertion order."""
+        if query.is_empty:
+            return await self.list_all(offset=offset, limit=limit)
+        matches = self._order.in_order(self._matching_ids(query))
+        stop = None if limit is None else offset + limit
+        return [self._items[entity_id] for _, entity_id in matches[offset:stop]]
+
+    async def list_page(
+        self, limit: int, cursor: str | None = None, query: EntityQuery | None = None
+    ) -> EntityPage:
+        """Retrieve a page of entities after the given cursor.
+
+        Unfiltered pages seek the ordered index instead of scanning from the start,
+        so any page costs O(limit + log n). Filtered pages cost O(k log k) in the
+        number of matches k. Entities inserted or deleted between pages do not
+        shift the following pages.
+        """
+        after = 0 if cursor is None else decode_cursor(cursor)
+        if query is None or query.is_empty:
+            ordered: Iterable[tuple[int, str]] = self._order.iter_after(after)
+        else:
+            ordered = (
+                pair
+                for pair in self._order.in_order(self._matching_ids(query))
+                if pair[0] > after
+            )
+        entities: list[Entity] = []
+        last_seq = after
+        for seq, entity_id in ordered:
+            if len(entities) == limit:
+                return EntityPage(entities=entities, next_cursor=encode_cursor(last_seq))
+            entities.append(self._items[entity_id])
+            last_seq = seq
+        return EntityPage(entities=entities)
+
+    def validate_cursor(self, cursor: str) -> None:
+        """Check that `list_page` accepts a cursor, without reading any entities."""
+        decode_cursor(cursor)
+
+    async def count(self, query: EntityQuery | None = None) -> int:
+        """Return the number of stored entities, optionally matching a query.
+
+        Unfiltered counts and single-index queries are answered from the indexes
+        without visiting any entity.
+        """
+        if query is None or query.is_empty:
+            return len(self._items)
+        size, candidates, exact = self._plan(query)
+        if exact:
+            return size
+        items = self._items
+        return sum(1 for entity_id in candidates if query.matches(items[entity_id]))
+
+    async def get_revision(self) -> int:
+        """Return the store-wide change counter."""
+        return self._revision
+
+    async def iter_all(self, chunk_size: int = 1000) -> AsyncIterator[list[Entity]]:
+        """Iterate over all entities in chunks, in insertion order.
+
+        Each chunk re-seeks the ordered index after the last yielded entity, so
+        writes made while the consumer is suspended never invalidate the iteration.
+        """
+        after = 0
+        while True:
+            chunk: list[Entity] = []
+            for seq, entity_id in self._order.iter_after(after):
+                chunk.append(self._items[entity_id])
+                after = seq
+                if len(chunk) == chunk_size:
+                    break
+            if chunk:
+                yield chunk
+            if len(chunk) < chunk_size:
+                return
+
+    async def update(self, entity: Entity, expected_version: int | None = None) -> Entity:
+        """Update an existing entity, optionally only if it is at `expected_version`."""
+        return self._update(entity, expected_version)
+
+    async def patch(
+        self, entity_id: str, changes: EntityPatch, expected_version: int | None = None
+    ) -> Entity:
+        """Change some fields of an entity, optionally only if it is at `expected_version`."""
+        current = self._items.get(entity_id)
+        if current is None:
+            raise ValueError(f"Entity with id '{entity_id}' not found")
+        if expected_version is not None and current.version != expected_version:
+            raise EntityVersionConflictError(entity_id, current.version, expected_version)
+        return self._put(changes.apply(current))
+
+    async def delete(self, entity_id: str) -> None:
+        """Delete an entity by ID."""
+        self._delete(entity_id)
+
+    async def save_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Save several entities in one pass.
+
+        The batch runs without yielding to the event loop, so no other request
+        observes it half-applied.
+        """
+        results: list[BatchItemResult] = []
+        for entity in entities:
+            try:
+                stored = self._save(entity)
+            except ValueError as e:
+                results.append(BatchItemResult(entity_id=entity.id, error=e))
+            else:
+                results.append(BatchItemResult(entity_id=entity.id, entity=stored))
+        return results
+
+    async def update_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Update several existing entities in one pass."""
+        results: list[BatchItemResult] = []
+        for entity in entities:
+            try:
+                stored = self._update(entity)
+            except ValueError as e:
+                results.append(BatchItemResult(entity_id=entity.id, error=e))
+            else:
+                results.append(BatchItemResult(entity_id=entity.id, entity=stored))
+        return results
+
+    async def delete_many(self, entity_ids: Sequence[str]) -> list[BatchItemResult]:
+        """Delete several entities by ID in one pass."""
+        results: list[BatchItemResult] = []
+        for entity_id in entity_ids:
+            try:
+                self._delete(entity_id)
+            except ValueError as e:
+                results.append(BatchItemResult(entity_id=entity_id, error=e))
+            else:
+                results.append(BatchItemResult(entity_id=entity_id))
+        return results
+
+    def snapshot(self) -> tuple[list[Entity], int]:
+        """Return every entity in insertion order together with the current revision."""
+        return list(self._items.values()), self._revision
+
+    def load(self, entities: Iterable[Entity], revision: int) -> None:
+        """Replace the contents with `entities`, keeping their versions.
+
+        Used to restore persisted state. The sorted indexes are built with one
+        sort rather than an insertion per entity, so loading is O(n log n).
+        """
+        self._items.clear()
+        self._order.clear()
+        self._stock_index.clear()
+        prices: list[tuple[str, float]] = []
+        names: list[tuple[str, str]] = []
+        for entity in entities:
+            entity_id = entity.id
+            self._items[entity_id] = entity
+            self._order.add(entity_id)
+            self._stock_index.put(entity_id, entity.in_stock)
+            prices.append((entity_id, entity.price))
+            names.append((entity_id, entity.name))
+        self._price_index.clear()
+        self._price_index.put_many(prices)
+        self._name_index.clear()
+        self._name_index.put_many(names)
+        self._revision = revision
+
+    def _save(self, entity: Entity) -> Entity:
+        """Store an entity, raising ValueError if it cannot be saved."""
+        if not entity.id:
+            raise ValueError("Entity must have an id to be saved")
+        return self._put(entity)
+
+    def _update(self, entity: Entity, expected_version: int | None = None) -> Entity:
+        """Replace a stored entity, raising ValueError if it doesn't exist."""
         if not entity.id:
             raise ValueError("Entity must have an id to be updated")
-        if entity.id not in self._items:
+        current = self._items.get(entity.id)
+        if current is None:
             raise ValueError(f"Entity with id '{entity.id}' not found")
-        self._items[entity.id] = entity
+        if expected_version is not None and current.version != expected_version:
+            raise EntityVersionConflictError(entity.id, current.version, expected_version)
+        return self._put(entity)
 
-    async def delete(self, entity_id: str) -> None:
-        """Delete an entity by ID."""
+    def _delete(self, entity_id: str) -> None:
+        """Delete a stored entity, raising ValueError if it doesn't exist."""
         if entity_id not in self._items:
             raise ValueError(f"Entity with id '{entity_id}' not found")
+        self._revision += 1
+        self._remove(entity_id)
+
+    def _put(self, entity: Entity) -> Entity:
+        """Store an entity under the next revision and update every index."""
+        self._revision += 1
+        entity = replace(entity, version=self._revision)
+        self._index(entity)
+        return entity
+
+    def _index(self, entity: Entity) -> None:
+        """Store an entity as-is and update every index."""
+        entity_id = entity.id
+        self._items[entity_id] = entity
+        self._order.add(entity_id)
+        self._price_index.put(entity_id, entity.price)
+        self._stock_index.put(entity_id, entity.in_stock)
+        self._name_index.put(entity_id, entity.name)
+
+    def _remove(self, entity_id: str) -> None:
+        """Drop an entity from storage and every index."""
         del self._items[entity_id]
+        self._order.remove(entity_id)
+        self._price_index.remove(entity_id)
+        self._stock_index.remove(entity_id)
+        self._name_index.remove(entity_id)
+
+    def _plan(self, query: EntityQuery) -> tuple[int, Iterable[str], bool]:
+        """Choose the most selective index for a non-empty query.
+
+        Returns the candidate count, the candidate IDs and whether every
+        candidate is guaranteed to match (only one index dimension filtered).
+        """
+        plans: list[tuple[int, Iterable[str]]] = []
+        if query.in_stock is not None:
+            plans.append(
+                (
+                    self._stock_index.count(query.in_stock),
+                    self._stock_index.keys(query.in_stock),
+                )
+            )
+        if query.min_price is not None or query.max_price is not None:
+            plans.append(
+                (
+                    self._price_index.count(query.min_price, query.max_price),
+                    self._price_index.between(query.min_price, query.max_price),
+                )
+            )
+        if query.name_prefix is not None:
+            plans.append(
+                (
+                    self._name_index.count(query.name_prefix),
+                    self._name_index.prefix(query.name_prefix),
+                )
+            )
+        size, candidates = min(plans, key=lambda plan: plan[0])
+        return size, candidates, len(plans) == 1
+
+    def _matching_ids(self, query: EntityQuery) -> Iterable[str]:
+        """Return IDs of entities matching a non-empty query (unordered)."""
+        _, candidates, exact = self._plan(query)
+        if exact:
+            return candidates
+        items = self._items
+        return [entity_id for entity_id in candidates if query.matches(items[entity_id])]
     {% else %}
     # Example: Implement your repository methods here
     # 
@@ -63,12 +370,12 @@ class MemoryRepository:
     # 
     # async def list_all(self, offset: int = 0, limit: int | None = None) -> list[Entity]:
     #     """Retrieve all saved entities with optional pagination."""
-    #     entities = list(self._items.values())
-    #     if offset > 0:
-    #         entities = entities[offset:]
-    #     if limit is not None:
-    #         entities = entities[:limit]
-    #     return entities
+    #     stop = None if limit is None else offset + limit
+    #     return list(islice(self._items.values(), offset, stop))
+    # 
+    # async def count(self) -> int:
+    #     """Return the number of stored entities in O(1)."""
+    #     return len(self._items)
     # 
     # async def update(self, entity: Entity) -> None:
     #     """Update an existing entity."""
@@ -88,19 +395,16 @@ class MemoryRepository:
     {% if cookiecutter.include_entity_example == "yes" %}
     async def clear(self) -> None:
         """Clear all stored items (useful for testing)."""
+        self._revision += 1
         self._items.clear()
-
-    def count(self) -> int:
-        """Get the number of stored items."""
-        return len(self._items)
+        self._order.clear()
+        self._price_index.clear()
+        self._stock_index.clear()
+        self._name_index.clear()
     {% else %}
     # Example: Add helper methods here
     # 
     # async def clear(self) -> None:
     #     """Clear all stored items (useful for testing)."""
     #     self._items.clear()
-    # 
-    # def count(self) -> int:
-    #     """Get the number of stored items."""
-    #     return len(self._items)
     {% endif %}
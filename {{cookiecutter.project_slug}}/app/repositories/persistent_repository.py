@@ -0,0 +1,554 @@
+"""
+Write-ahead log and snapshot persistence for MemoryRepository.
+
+PersistentRepository serves every read from the wrapped MemoryRepository and
+appends the outcome of every write to a log: the entity as stored (with its
+version) for saves and updates, and the revision for deletes and clears. The
+records describe resulting state rather than operations, so replaying a
+record that is already reflected in the state is harmless.
+
+Writes are made durable by group commit: records are buffered for a short
+window, then written and fsynced together in a worker thread, and every write
+in the window returns once that single fsync has completed. If a commit fails,
+the store already holds writes the log does not, so the repository fails for
+good: every later call raises until the process restarts and recovers the
+last committed state.
+
+The log is split into numbered segments. A snapshot switches to a new segment,
+writes every entity to a snapshot file, and then deletes the segments it
+covers. Recovery loads the snapshot and replays the segments after it.
+
+    <directory>/snapshot.bin
+    <directory>/wal-0000000007.log
+"""
+
+import asyncio
+import logging
+import os
+import struct
+import time
+import zlib
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+from pathlib import Path
+
+from app.domain.models import BatchItemResult
+from app.domain.models import Entity
+from app.domain.models import EntityPage
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
+from app.repositories.memory_repository import MemoryRepository
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "snapshot.bin"
+SEGMENT_PATTERN = "wal-*.log"
+
+_SNAPSHOT_MAGIC = b"ENTSNAP1"
+# magic, first segment not covered by the snapshot, revision, entity count
+_SNAPSHOT_HEADER = struct.Struct("<8sQQQ")
+# payload length, crc32 of the payload
+_FRAME = struct.Struct("<II")
+# op, version, price, in stock, id length, name length (followed by id and name)
+_PUT = struct.Struct("<BQd?II")
+# op, revision, id length (followed by id)
+_DELETE = struct.Struct("<BQI")
+# op, revision
+_CLEAR = struct.Struct("<BQ")
+
+_OP_PUT = 1
+_OP_DELETE = 2
+_OP_CLEAR = 3
+
+
+class PersistentRepository:
+    """MemoryRepository wrapper that persists writes to a write-ahead log.
+
+    Reads keep in-memory speed. Every method waits for recovery to finish
+    first, so nothing is served from a partially loaded store.
+    """
+
+    def __init__(
+        self,
+        repository: MemoryRepository,
+        directory: str,
+        fsync: bool = True,
+        group_commit_seconds: float = 0.002,
+        snapshot_interval_seconds: float = 60.0,
+        snapshot_min_records: int = 10_000,
+    ) -> None:
+        """Initialize the wrapper; nothing is read until recover() runs.
+
+        Args:
+            repository: Empty repository to restore into and serve from
+            directory: Directory holding the snapshot and log segments
+            fsync: Return from writes only once their records are fsynced. When
+                False, records are still written on every commit but a power
+                failure can lose the last ones.
+            group_commit_seconds: How long a commit waits to gather more writes
+            snapshot_interval_seconds: How often to check whether to snapshot
+            snapshot_min_records: Log records since the last snapshot that
+                trigger the next one
+        """
+        self._repository = repository
+        self._directory = Path(directory)
+        self._fsync = fsync
+        self._group_commit_seconds = group_commit_seconds
+        self._snapshot_interval_seconds = snapshot_interval_seconds
+        self._snapshot_min_records = snapshot_min_records
+        self._recovery: asyncio.Future[None] | None = None
+        self._recovered = False
+        self._failure: OSError | None = None
+        self._segment = 0
+        self._log_fd = -1
+        self._pending: list[bytes] = []
+        self._waiters: list[asyncio.Future[None]] = []
+        self._records_since_snapshot = 0
+        self._io_lock = asyncio.Lock()
+        self._snapshot_lock = asyncio.Lock()
+        self._committer: asyncio.Task[None] | None = None
+        self._flushing: asyncio.Task[None] | None = None
+        self._snapshotter: asyncio.Task[None] | None = None
+
+    @property
+    def recovered(self) -> bool:
+        """Whether persisted state has been loaded."""
+        return self._recovered
+
+    @property
+    def failure(self) -> OSError | None:
+        """Error of the failed commit that stopped the repository, if one did."""
+        return self._failure
+
+    async def recover(self) -> None:
+        """Load the latest snapshot and replay the log after it.
+
+        Safe to call more than once and concurrently; the work runs once, in a
+        thread, so the event loop stays responsive meanwhile.
+
+        Raises:
+            ValueError: If the snapshot or a log segment other than the last is corrupt
+        """
+        if self._recovery is None:
+            self._recovery = asyncio.ensure_future(self._recover())
+        await asyncio.shield(self._recovery)
+
+    async def startup(self) -> None:
+        """Recover persisted state, so no request waits for it."""
+        await self.recover()
+
+    async def snapshot(self) -> None:
+        """Write a snapshot of the current state and delete the log it covers."""
+        await self._ensure_recovered()
+        async with self._snapshot_lock:
+            async with self._io_lock:
+                await self._commit()
+                covered = self._segment
+                self._open_segment(covered + 1)
+                entities, revision = self._repository.snapshot()
+                self._records_since_snapshot = 0
+            started = time.perf_counter()
+            await asyncio.to_thread(self._write_snapshot, entities, revision, covered + 1)
+            logger.info(
+                "Snapshot of %d entities written in %.2fs",
+                len(entities),
+                time.perf_counter() - started,
+            )
+
+    async def save(self, entity: Entity) -> Entity:
+        """Save an entity and log it."""
+        await self._ensure_recovered()
+        stored = await self._repository.save(entity)
+        await self._log([_encode_put(stored)])
+        return stored
+
+    async def get_entity_by_id(self, entity_id: str) -> Entity | None:
+        """Get an entity by ID."""
+        await self._ensure_recovered()
+        return await self._repository.get_entity_by_id(entity_id)
+
+    async def get_many(self, entity_ids: Sequence[str]) -> dict[str, Entity]:
+        """Get several entities by ID."""
+        await self._ensure_recovered()
+        return await self._repository.get_many(entity_ids)
+
+    async def list_all(self, offset: int = 0, limit: int | None = None) -> list[Entity]:
+        """Retrieve all entities with optional pagination."""
+        await self._ensure_recovered()
+        return await self._repository.list_all(offset=offset, limit=limit)
+
+    async def find(
+        self, query: EntityQuery, offset: int = 0, limit: int | None = None
+    ) -> list[Entity]:
+        """Retrieve entities matching a query."""
+        await self._ensure_recovered()
+        return await self._repository.find(query, offset=offset, limit=limit)
+
+    async def list_page(
+        self, limit: int, cursor: str | None = None, query: EntityQuery | None = None
+    ) -> EntityPage:
+        """Retrieve a page of entities using keyset pagination."""
+        await self._ensure_recovered()
+        return await self._repository.list_page(limit, cursor=cursor, query=query)
+
+    def validate_cursor(self, cursor: str) -> None:
+        """Check that `list_page` accepts a cursor, without reading any entities."""
+        self._repository.validate_cursor(cursor)
+
+    async def count(self, query: EntityQuery | None = None) -> int:
+        """Return the number of stored entities, optionally matching a query."""
+        await self._ensure_recovered()
+        return await self._repository.count(query)
+
+    async def get_revision(self) -> int:
+        """Return the store-wide change counter."""
+        await self._ensure_recovered()
+        return await self._repository.get_revision()
+
+    async def iter_all(self, chunk_size: int = 1000) -> AsyncIterator[list[Entity]]:
+        """Iterate over all entities in chunks."""
+        await self._ensure_recovered()
+        async for chunk in self._repository.iter_all(chunk_size=chunk_size):
+            yield chunk
+
+    async def update(self, entity: Entity, expected_version: int | None = None) -> Entity:
+        """Update an existing entity and log it."""
+        await self._ensure_recovered()
+        stored = await self._repository.update(entity, expected_version)
+        await self._log([_encode_put(stored)])
+        return stored
+
+    async def patch(
+        self, entity_id: str, changes: EntityPatch, expected_version: int | None = None
+    ) -> Entity:
+        """Change some fields of an entity and log the result."""
+        await self._ensure_recovered()
+        stored = await self._repository.patch(entity_id, changes, expected_version)
+        await self._log([_encode_put(stored)])
+        return stored
+
+    async def delete(self, entity_id: str) -> None:
+        """Delete an entity by ID and log it."""
+        await self._ensure_recovered()
+        await self._repository.delete(entity_id)
+        revision = await self._repository.get_revision()
+        await self._log([_encode_delete(entity_id, revision)])
+
+    async def save_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Save several entities and log them in one commit."""
+        await self._ensure_recovered()
+        results = await self._repository.save_many(entities)
+        await self._log([_encode_put(r.entity) for r in results if r.entity is not None])
+        return results
+
+    async def update_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Update several entities and log them in one commit."""
+        await self._ensure_recovered()
+        results = await self._repository.update_many(entities)
+        await self._log([_encode_put(r.entity) for r in results if r.entity is not None])
+        return results
+
+    async def delete_many(self, entity_ids: Sequence[str]) -> list[BatchItemResult]:
+        """Delete several entities and log them in one commit."""
+        await self._ensure_recovered()
+        results = await self._repository.delete_many(entity_ids)
+        revision = await self._repository.get_revision()
+        await self._log([_encode_delete(r.entity_id, revision) for r in results if r.ok])
+        return results
+
+    async def clear(self) -> None:
+        """Clear all stored items and log it (useful for testing)."""
+        await self._ensure_recovered()
+        await self._repository.clear()
+        revision = await self._repository.get_revision()
+        await self._log([_CLEAR.pack(_OP_CLEAR, revision)])
+
+    async def close(self) -> None:
+        """Stop background snapshots, commit buffered records and close the log."""
+        if self._snapshotter is not None:
+            self._snapshotter.cancel()
+            await asyncio.wait([self._snapshotter])
+        if self._log_fd < 0:
+            return
+        async with self._io_lock:
+            await self._commit()
+            os.close(self._log_fd)
+            self._log_fd = -1
+        if self._committer is not None:
+            self._committer.cancel()
+            await asyncio.wait([self._committer])
+
+    async def _ensure_recovered(self) -> None:
+        """Wait for recovery, starting it if nobody has yet.
+
+        Raises:
+            OSError: If a commit has failed, so the store no longer matches the log
+        """
+        if self._failure is not None:
+            raise OSError("The write-ahead log failed; restart to recover") from self._failure
+        if not self._recovered:
+            await self.recover()
+
+    async def _recover(self) -> None:
+        started = time.perf_counter()
+        replayed, segment = await asyncio.to_thread(self._load)
+        self._records_since_snapshot = replayed
+        self._open_segment(segment)
+        self._recovered = True
+        self._snapshotter = asyncio.create_task(self._snapshot_periodically())
+        logger.info(
+            "Recovered %d entities (%d log records replayed) in %.2fs",
+            await self._repository.count(),
+            replayed,
+            time.perf_counter() - started,
+        )
+
+    async def _log(self, records: list[bytes]) -> None:
+        """Buffer records for the next commit and wait for it when fsync is on.
+
+        Records are buffered before the first await, so the log keeps the
+        order in which writes were applied to the repository.
+        """
+        if not records:
+            return
+        self._pending.extend(_frame(record) for record in records)
+        self._records_since_snapshot += len(records)
+        waiter: asyncio.Future[None] | None = None
+        if self._fsync:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+        if self._committer is None or self._committer.done():
+            self._committer = asyncio.create_task(self._commit_pending())
+        if waiter is not None:
+            await waiter
+
+    async def _commit_pending(self) -> None:
+        """Commit buffered records in groups until none are left."""
+        while self._pending:
+            await asyncio.sleep(self._group_commit_seconds)
+            async with self._io_lock:
+                await self._commit()
+
+    async def _commit(self) -> None:
+        """Write and fsync buffered records, then release their writers.
+
+        The write runs in its own task, so a commit cancelled midway (e.g. the
+        snapshotter stopped by close) still finishes it and releases its
+        writers; the next commit waits for it, keeping the log in order.
+        Callers hold the I/O lock.
+        """
+        if self._flushing is not None:
+            await asyncio.shield(self._flushing)
+        if not self._pending:
+            return
+        data = b"".join(self._pending)
+        waiters = self._waiters
+        self._pending = []
+        self._waiters = []
+        self._flushing = asyncio.create_task(self._flush(data, waiters))
+        await asyncio.shield(self._flushing)
+
+    async def _flush(self, data: bytes, waiters: list[asyncio.Future[None]]) -> None:
+        """Write one commit's records and release its writers, whatever the outcome.
+
+        A failure fails the repository: the writes are already in the store, and
+        committing later records would leave a gap in the log.
+        """
+        try:
+            if self._failure is not None:
+                raise self._failure
+            await asyncio.to_thread(self._write, self._log_fd, data)
+        except OSError as e:
+            if self._failure is None:
+                self._failure = e
+                logger.error("Log commit failed; failing every request until restart", exc_info=e)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _write(self, fd: int, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        if self._fsync:
+            os.fsync(fd)
+
+    async def _snapshot_periodically(self) -> None:
+        while self._failure is None:
+            await asyncio.sleep(self._snapshot_interval_seconds)
+            if self._records_since_snapshot >= self._snapshot_min_records:
+                try:
+                    await self.snapshot()
+                except OSError:
+                    logger.exception("Snapshot failed; the log is kept and will be retried")
+
+    def _open_segment(self, segment: int) -> None:
+        """Switch appends to a new log segment."""
+        if self._log_fd >= 0:
+            os.close(self._log_fd)
+        path = self._directory / _segment_name(segment)
+        self._log_fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._segment = segment
+        _fsync_directory(self._directory)
+
+    def _load(self) -> tuple[int, int]:
+        """Restore the snapshot and replay the log.
+
+        The records are folded into a dict (which keeps insertion order the way
+        the repository does) and loaded in one pass, so the sorted indexes are
+        built once instead of per record.
+
+        Returns the number of replayed records and the segment to append to next.
+        """
+        self._directory.mkdir(parents=True, exist_ok=True)
+        state, revision, first_segment = self._load_snapshot()
+        segments = _segments(self._directory)
+        for segment, path in segments:
+            if segment < first_segment:
+                path.unlink()
+        live = [(segment, path) for segment, path in segments if segment >= first_segment]
+        replayed = 0
+        for position, (_, path) in enumerate(live):
+            data = path.read_bytes()
+            payloads, end = _frames(data)
+            for payload in payloads:
+                revision = max(revision, _replay(state, payload))
+            replayed += len(payloads)
+            if end < len(data):
+                if position < len(live) - 1:
+                    raise ValueError(f"Corrupt log segment '{path}' at byte {end}")
+                # A torn record at the end of the last segment was never acknowledged
+                logger.warning("Discarding %d bytes of torn log tail", len(data) - end)
+                os.truncate(path, end)
+        self._repository.load(state.values(), revision)
+        last = live[-1][0] if live else first_segment - 1
+        return replayed, max(last + 1, first_segment)
+
+    def _load_snapshot(self) -> tuple[dict[str, Entity], int, int]:
+        """Read the snapshot, if any.
+
+        Returns the entities by ID, the snapshot revision and the first segment
+        the snapshot does not cover.
+        """
+        path = self._directory / SNAPSHOT_FILE
+        if not path.exists():
+            return {}, 0, 1
+        data = path.read_bytes()
+        try:
+            magic, first_segment, revision, count = _SNAPSHOT_HEADER.unpack_from(data)
+        except struct.error as e:
+            raise ValueError(f"Corrupt snapshot '{path}'") from e
+        payloads, _ = _frames(data, _SNAPSHOT_HEADER.size)
+        entities = [_decode_put(payload) for payload in payloads]
+        if magic != _SNAPSHOT_MAGIC or len(entities) != count:
+            raise ValueError(f"Corrupt snapshot '{path}'")
+        return {entity.id: entity for entity in entities}, revision, first_segment
+
+    def _write_snapshot(self, entities: list[Entity], revision: int, first_segment: int) -> None:
+        """Atomically replace the snapshot, then delete the segments it covers."""
+        path = self._directory / SNAPSHOT_FILE
+        temporary = path.with_suffix(".tmp")
+        with temporary.open("wb") as file:
+            header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, first_segment, revision, len(entities))
+            file.write(header)
+            file.writelines(_frame(_encode_put(entity)) for entity in entities)
+            file.flush()
+            os.fsync(file.fileno())
+        temporary.replace(path)
+        _fsync_directory(self._directory)
+        for segment, segment_path in _segments(self._directory):
+            if segment < first_segment:
+                segment_path.unlink()
+
+
+def _replay(state: dict[str, Entity], payload: memoryview) -> int:
+    """Apply one log record to `state` and return the revision it records."""
+    op = payload[0]
+    if op == _OP_PUT:
+        entity = _decode_put(payload)
+        state[entity.id] = entity
+        return entity.version
+    if op == _OP_DELETE:
+        _, revision, id_length = _DELETE.unpack_from(payload)
+        state.pop(bytes(payload[_DELETE.size : _DELETE.size + id_length]).decode(), None)
+        return revision
+    if op == _OP_CLEAR:
+        _, revision = _CLEAR.unpack_from(payload)
+        state.clear()
+        return revision
+    raise ValueError(f"Unknown log record type {op}")
+
+
+def _frame(payload: bytes) -> bytes:
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _frames(data: bytes, offset: int = 0) -> tuple[list[memoryview], int]:
+    """Split data into frame payloads, stopping at the first incomplete or corrupt frame.
+
+    Returns the payloads and the offset where the intact frames end.
+    """
+    view = memoryview(data)
+    size = len(data)
+    payloads: list[memoryview] = []
+    while offset + _FRAME.size <= size:
+        length, checksum = _FRAME.unpack_from(view, offset)
+        start = offset + _FRAME.size
+        payload = view[start : start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            break
+        payloads.append(payload)
+        offset = start + length
+    return payloads, offset
+
+
+def _encode_put(entity: Entity) -> bytes:
+    entity_id = entity.id.encode()
+    name = entity.name.encode()
+    header = _PUT.pack(
+        _OP_PUT, entity.version, entity.price, entity.in_stock, len(entity_id), len(name)
+    )
+    return header + entity_id + name
+
+
+def _decode_put(payload: memoryview) -> Entity:
+    _, version, price, in_stock, id_length, name_length = _PUT.unpack_from(payload)
+    name_start = _PUT.size + id_length
+    return Entity(
+        id=bytes(payload[_PUT.size : name_start]).decode(),
+        name=bytes(payload[name_start : name_start + name_length]).decode(),
+        price=price,
+        in_stock=in_stock,
+        version=version,
+    )
+
+
+def _encode_delete(entity_id: str, revision: int) -> bytes:
+    encoded = entity_id.encode()
+    return _DELETE.pack(_OP_DELETE, revision, len(encoded)) + encoded
+
+
+def _segment_name(segment: int) -> str:
+    return f"wal-{segment:010d}.log"
+
+
+def _segments(directory: Path) -> list[tuple[int, Path]]:
+    """Return (number, path) for every log segment, in order."""
+    return sorted(
+        (int(path.stem.removeprefix("wal-")), path) for path in directory.glob(SEGMENT_PATTERN)
+    )
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Make file creations and renames in `directory` durable (POSIX only)."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
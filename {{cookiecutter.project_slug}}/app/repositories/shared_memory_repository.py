@@ -0,0 +1,540 @@
+"""
+Entity repository shared by every worker process.
+
+Records live in a memory-mapped file that each worker maps shared, so a write
+made by one worker is visible to all the others immediately. The file holds a
+header, an open-addressing hash index from ID to row, and fixed-size records
+in insertion order:
+
+    header | index slots (uint32 row + 1) | records
+
+Writers serialize on an exclusive flock of the file and publish their changes
+through a seqlock: the sequence counter in the header is odd while a write is
+in progress. Readers never lock. They read the counter, read the records, and
+retry if the counter was odd or has changed since; a reader that keeps
+colliding with writers falls back to a shared flock.
+
+Deleted records stay in place, flagged, so that rows remain in insertion
+order and cursors can seek them by binary search. They are compacted away once
+the record area is full. POSIX only (fcntl).
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from collections.abc import Generator
+from collections.abc import Iterator
+from collections.abc import Sequence
+from contextlib import contextmanager
+from dataclasses import replace
+from functools import partial
+from itertools import islice
+from typing import TypeVar
+
+from app.domain.errors import EntityVersionConflictError
+from app.domain.models import BatchItemResult
+from app.domain.models import Entity
+from app.domain.models import EntityPage
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
+from app.repositories.cursor import decode_cursor
+from app.repositories.cursor import encode_cursor
+
+MAX_ID_BYTES = 64
+MAX_NAME_BYTES = 192
+
+_MAGIC = b"ENTSHM01"
+# magic, capacity, record size, then the mutable fields at the offsets below
+_HEADER = struct.Struct("<8sII")
+_HEADER_SIZE = 64
+_SEQUENCE_OFFSET = 16
+_REVISION_OFFSET = 24
+_COUNT_OFFSET = 32
+_ROWS_OFFSET = 40
+_NEXT_SEQ_OFFSET = 48
+_U64 = struct.Struct("<Q")
+
+# seq, version, price, flags, id length, name length, id, name
+_RECORD = struct.Struct(f"<QQdBBH{MAX_ID_BYTES}s{MAX_NAME_BYTES}s")
+_FLAGS_OFFSET = 24
+_ID_LENGTH_OFFSET = 25
+_ID_OFFSET = 28
+_IN_STOCK = 1
+_DELETED = 2
+
+_SLOT = struct.Struct("<I")
+_EMPTY = 0
+_TOMBSTONE = 0xFFFFFFFF
+
+# Optimistic read attempts before a reader waits on the shared lock
+_READ_ATTEMPTS = 32
+
+_Record = tuple[int, int, float, int, int, int, bytes, bytes]
+T = TypeVar("T")
+
+
+class SharedMemoryRepository:
+    """Repository whose entities are shared by all processes mapping the same file.
+
+    Point lookups go through the shared hash index; filtered queries and counts
+    scan the records. Every write bumps a store-wide revision counter, and stored
+    entities carry the revision of their last write as their version. IDs and
+    names are limited to MAX_ID_BYTES and MAX_NAME_BYTES of UTF-8.
+    """
+
+    def __init__(self, path: str, capacity: int = 100_000) -> None:
+        """Map the store at `path`, creating it if it does not exist.
+
+        Args:
+            path: File backing the store (put it on tmpfs, e.g. /dev/shm, to keep
+                it purely in memory)
+            capacity: Maximum number of entities when creating the store; an
+                existing store keeps the capacity it was created with
+
+        Raises:
+            ValueError: If the file exists but is not a compatible entity store
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._locked(fcntl.LOCK_EX):
+                if os.fstat(self._fd).st_size == 0:
+                    os.ftruncate(self._fd, _file_size(capacity))
+                    self._map = mmap.mmap(self._fd, 0)
+                    _HEADER.pack_into(self._map, 0, _MAGIC, capacity, _RECORD.size)
+                    self._write_u64(_NEXT_SEQ_OFFSET, 1)
+                else:
+                    self._map = mmap.mmap(self._fd, 0)
+                    magic, capacity, record_size = _HEADER.unpack_from(self._map)
+                    if (
+                        magic != _MAGIC
+                        or record_size != _RECORD.size
+                        or len(self._map) != _file_size(capacity)
+                    ):
+                        self._map.close()
+                        raise ValueError(f"'{path}' is not a compatible shared entity store")
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._capacity: int = capacity
+        self._slot_mask = _slot_count(capacity) - 1
+        self._records = _HEADER_SIZE + _slot_count(capacity) * _SLOT.size
+
+    async def save(self, entity: Entity) -> Entity:
+        """Save an entity and return it with its new version."""
+        with self._writing():
+            return self._put(entity)
+
+    async def get_entity_by_id(self, entity_id: str) -> Entity | None:
+        """Get an entity by ID."""
+        key = entity_id.encode()
+        return self._read(lambda: self._get(key))
+
+    async def get_many(self, entity_ids: Sequence[str]) -> dict[str, Entity]:
+        """Get several entities by ID under one read lock, leaving out the ones not stored."""
+
+        def read() -> dict[str, Entity]:
+            return {
+                entity_id: entity
+                for entity_id in entity_ids
+                if (entity := self._get(entity_id.encode())) is not None
+            }
+
+        return self._read(read)
+
+    async def list_all(self, offset: int = 0, limit: int | None = None) -> list[Entity]:
+        """Retrieve all saved entities with optional pagination."""
+        stop = None if limit is None else offset + limit
+        return self._read(lambda: [e for _, e in islice(self._live(), offset, stop)])
+
+    async def find(
+        self, query: EntityQuery, offset: int = 0, limit: int | None = None
+    ) -> list[Entity]:
+        """Retrieve entities matching a query, in insertion order."""
+        if query.is_empty:
+            return await self.list_all(offset=offset, limit=limit)
+        stop = None if limit is None else offset + limit
+        return self._read(lambda: list(islice(self._matching(query), offset, stop)))
+
+    async def list_page(
+        self, limit: int, cursor: str | None = None, query: EntityQuery | None = None
+    ) -> EntityPage:
+        """Retrieve a page of entities after the given cursor.
+
+        The cursor seeks the records by binary search, so unfiltered pages cost
+        O(limit + log n) however deep they are.
+        """
+        after = 0 if cursor is None else decode_cursor(cursor)
+        page = self._read(lambda: self._page_after(after, limit + 1, query))
+        if len(page) <= limit:
+            return EntityPage(entities=[entity for _, entity in page])
+        return EntityPage(
+            entities=[entity for _, entity in page[:limit]],
+            next_cursor=encode_cursor(page[limit - 1][0]),
+        )
+
+    def validate_cursor(self, cursor: str) -> None:
+        """Check that `list_page` accepts a cursor, without reading any entities."""
+        decode_cursor(cursor)
+
+    async def count(self, query: EntityQuery | None = None) -> int:
+        """Return the number of stored entities, optionally matching a query.
+
+        Unfiltered counts are read from the header; filtered counts scan.
+        """
+        if query is None or query.is_empty:
+            return self._read(lambda: self._read_u64(_COUNT_OFFSET))
+        return self._read(lambda: sum(1 for _ in self._matching(query)))
+
+    async def get_revision(self) -> int:
+        """Return the store-wide change counter."""
+        return self._read(lambda: self._read_u64(_REVISION_OFFSET))
+
+    async def iter_all(self, chunk_size: int = 1000) -> AsyncIterator[list[Entity]]:
+        """Iterate over all entities in chunks, in insertion order.
+
+        Each chunk seeks past the last yielded entity, so writes made while the
+        consumer is suspended never invalidate the iteration.
+        """
+        after = 0
+        while True:
+            chunk = self._read(partial(self._page_after, after, chunk_size, None))
+            if chunk:
+                after = chunk[-1][0]
+                yield [entity for _, entity in chunk]
+            if len(chunk) < chunk_size:
+                return
+
+    async def update(self, entity: Entity, expected_version: int | None = None) -> Entity:
+        """Update an existing entity, optionally only if it is at `expected_version`."""
+        with self._writing():
+            return self._update(entity, expected_version)
+
+    async def patch(
+        self, entity_id: str, changes: EntityPatch, expected_version: int | None = None
+    ) -> Entity:
+        """Change some fields of an entity, optionally only if it is at `expected_version`."""
+        with self._writing():
+            _, row = self._probe(entity_id.encode())
+            if row < 0:
+                raise ValueError(f"Entity with id '{entity_id}' not found")
+            current = _to_entity(self._record(row))
+            if expected_version is not None and current.version != expected_version:
+                raise EntityVersionConflictError(entity_id, current.version, expected_version)
+            return self._put(changes.apply(current))
+
+    async def delete(self, entity_id: str) -> None:
+        """Delete an entity by ID."""
+        with self._writing():
+            self._delete(entity_id)
+
+    async def save_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Save several entities under one write lock.
+
+        Readers in every process see either none or all of the batch.
+        """
+        results: list[BatchItemResult] = []
+        with self._writing():
+            for entity in entities:
+                try:
+                    stored = self._put(entity)
+                except ValueError as e:
+                    results.append(BatchItemResult(entity_id=entity.id, error=e))
+                else:
+                    results.append(BatchItemResult(entity_id=entity.id, entity=stored))
+        return results
+
+    async def update_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Update several existing entities under one write lock."""
+        results: list[BatchItemResult] = []
+        with self._writing():
+            for entity in entities:
+                try:
+                    stored = self._update(entity)
+                except ValueError as e:
+                    results.append(BatchItemResult(entity_id=entity.id, error=e))
+                else:
+                    results.append(BatchItemResult(entity_id=entity.id, entity=stored))
+        return results
+
+    async def delete_many(self, entity_ids: Sequence[str]) -> list[BatchItemResult]:
+        """Delete several entities by ID under one write lock."""
+        results: list[BatchItemResult] = []
+        with self._writing():
+            for entity_id in entity_ids:
+                try:
+                    self._delete(entity_id)
+                except ValueError as e:
+                    results.append(BatchItemResult(entity_id=entity_id, error=e))
+                else:
+                    results.append(BatchItemResult(entity_id=entity_id))
+        return results
+
+    async def clear(self) -> None:
+        """Clear all stored items (useful for testing)."""
+        with self._writing():
+            self._map[_HEADER_SIZE : self._records] = bytes(self._records - _HEADER_SIZE)
+            self._write_u64(_COUNT_OFFSET, 0)
+            self._write_u64(_ROWS_OFFSET, 0)
+            self._bump_revision()
+
+    async def close(self) -> None:
+        """Unmap the store. The file and its data are left in place."""
+        self._map.close()
+        os.close(self._fd)
+
+    # Reading
+
+    def _read(self, reader: Callable[[], T]) -> T:
+        """Run `reader` against a consistent snapshot of the store.
+
+        Records torn by a concurrent write can fail to decode; that is only an
+        error if no write overlapped the read.
+        """
+        buffer = self._map
+        for _ in range(_READ_ATTEMPTS):
+            (start,) = _U64.unpack_from(buffer, _SEQUENCE_OFFSET)
+            if start & 1:
+                time.sleep(0)
+                continue
+            try:
+                result = reader()
+            except (ValueError, IndexError, struct.error):
+                if _U64.unpack_from(buffer, _SEQUENCE_OFFSET)[0] == start:
+                    raise
+                continue
+            if _U64.unpack_from(buffer, _SEQUENCE_OFFSET)[0] == start:
+                return result
+        with self._locked(fcntl.LOCK_SH):
+            return reader()
+
+    def _get(self, key: bytes) -> Entity | None:
+        """Look up an entity by encoded ID."""
+        _, row = self._probe(key)
+        if row < 0:
+            return None
+        record = self._record(row)
+        return None if record[3] & _DELETED else _to_entity(record)
+
+    def _live(self, start: int = 0) -> Iterator[tuple[int, Entity]]:
+        """Yield (seq, entity) for live records from row `start` on, in order."""
+        for row in range(start, self._read_u64(_ROWS_OFFSET)):
+            record = self._record(row)
+            if not record[3] & _DELETED:
+                yield record[0], _to_entity(record)
+
+    def _matching(self, query: EntityQuery) -> Iterator[Entity]:
+        """Yield live entities matching a query, in order."""
+        return (entity for _, entity in self._live() if query.matches(entity))
+
+    def _page_after(
+        self, after: int, limit: int, query: EntityQuery | None
+    ) -> list[tuple[int, Entity]]:
+        """Return up to `limit` (seq, entity) pairs after sequence number `after`."""
+        live = self._live(self._seek(after))
+        if query is not None and not query.is_empty:
+            live = (pair for pair in live if query.matches(pair[1]))
+        return list(islice(live, limit))
+
+    def _seek(self, after: int) -> int:
+        """Return the first row whose sequence number is greater than `after`."""
+        low, high = 0, self._read_u64(_ROWS_OFFSET)
+        while low < high:
+            middle = (low + high) // 2
+            if self._read_u64(self._offset(middle)) <= after:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    # Writing (callers hold the write lock)
+
+    def _put(self, entity: Entity) -> Entity:
+        """Store an entity under the next revision, raising ValueError if it cannot be."""
+        if not entity.id:
+            raise ValueError("Entity must have an id to be saved")
+        key = entity.id.encode()
+        name = entity.name.encode()
+        if len(key) > MAX_ID_BYTES:
+            raise ValueError(f"Entity id cannot exceed {MAX_ID_BYTES} bytes")
+        if len(name) > MAX_NAME_BYTES:
+            raise ValueError(f"Entity name cannot exceed {MAX_NAME_BYTES} bytes")
+        slot, row = self._probe(key)
+        if row >= 0:
+            seq = self._read_u64(self._offset(row))
+        else:
+            rows = self._read_u64(_ROWS_OFFSET)
+            if rows == self._capacity:
+                if self._read_u64(_COUNT_OFFSET) == self._capacity:
+                    raise ValueError(f"Shared entity store is full ({self._capacity} entities)")
+                self._compact()
+                slot, _ = self._probe(key)
+                rows = self._read_u64(_ROWS_OFFSET)
+            row = rows
+            seq = self._read_u64(_NEXT_SEQ_OFFSET)
+            self._write_u64(_NEXT_SEQ_OFFSET, seq + 1)
+            self._write_u64(_ROWS_OFFSET, rows + 1)
+            self._write_u64(_COUNT_OFFSET, self._read_u64(_COUNT_OFFSET) + 1)
+            _SLOT.pack_into(self._map, self._slot_offset(slot), row + 1)
+        version = self._bump_revision()
+        _RECORD.pack_into(
+            self._map,
+            self._offset(row),
+            seq,
+            version,
+            entity.price,
+            _IN_STOCK if entity.in_stock else 0,
+            len(key),
+            len(name),
+            key,
+            name,
+        )
+        return replace(entity, version=version)
+
+    def _update(self, entity: Entity, expected_version: int | None = None) -> Entity:
+        """Replace a stored entity, raising ValueError if it doesn't exist."""
+        if not entity.id:
+            raise ValueError("Entity must have an id to be updated")
+        _, row = self._probe(entity.id.encode())
+        if row < 0:
+            raise ValueError(f"Entity with id '{entity.id}' not found")
+        version = self._read_u64(self._offset(row) + 8)
+        if expected_version is not None and version != expected_version:
+            raise EntityVersionConflictError(entity.id, version, expected_version)
+        return self._put(entity)
+
+    def _delete(self, entity_id: str) -> None:
+        """Delete a stored entity, raising ValueError if it doesn't exist."""
+        slot, row = self._probe(entity_id.encode())
+        if row < 0:
+            raise ValueError(f"Entity with id '{entity_id}' not found")
+        self._map[self._offset(row) + _FLAGS_OFFSET] |= _DELETED
+        _SLOT.pack_into(self._map, self._slot_offset(slot), _TOMBSTONE)
+        self._write_u64(_COUNT_OFFSET, self._read_u64(_COUNT_OFFSET) - 1)
+        self._bump_revision()
+
+    def _compact(self) -> None:
+        """Move live records down over deleted ones and rebuild the index."""
+        self._map[_HEADER_SIZE : self._records] = bytes(self._records - _HEADER_SIZE)
+        size = _RECORD.size
+        live = 0
+        for row in range(self._read_u64(_ROWS_OFFSET)):
+            source = self._offset(row)
+            if self._map[source + _FLAGS_OFFSET] & _DELETED:
+                continue
+            target = self._offset(live)
+            if target != source:
+                self._map[target : target + size] = self._map[source : source + size]
+            id_length = self._map[target + _ID_LENGTH_OFFSET]
+            key = self._map[target + _ID_OFFSET : target + _ID_OFFSET + id_length]
+            slot, _ = self._probe(key)
+            _SLOT.pack_into(self._map, self._slot_offset(slot), live + 1)
+            live += 1
+        self._write_u64(_ROWS_OFFSET, live)
+
+    def _bump_revision(self) -> int:
+        """Increment and return the store-wide revision."""
+        revision = self._read_u64(_REVISION_OFFSET) + 1
+        self._write_u64(_REVISION_OFFSET, revision)
+        return revision
+
+    # Layout helpers
+
+    def _probe(self, key: bytes) -> tuple[int, int]:
+        """Find `key` in the hash index.
+
+        Returns (slot, row) with the key's row, or (free slot, -1) when the key is
+        absent, where the free slot is the first one an insert should use.
+        """
+        buffer = self._map
+        mask = self._slot_mask
+        records = self._records
+        key_length = len(key)
+        slot = zlib.crc32(key) & mask
+        free = -1
+        for _ in range(mask + 1):
+            (value,) = _SLOT.unpack_from(buffer, _HEADER_SIZE + slot * _SLOT.size)
+            if value == _EMPTY:
+                return (slot if free < 0 else free), -1
+            if value == _TOMBSTONE:
+                if free < 0:
+                    free = slot
+            else:
+                start = records + (value - 1) * _RECORD.size + _ID_OFFSET
+                if (
+                    buffer[start - _ID_OFFSET + _ID_LENGTH_OFFSET] == key_length
+                    and buffer[start : start + key_length] == key
+                ):
+                    return slot, value - 1
+            slot = (slot + 1) & mask
+        return free, -1
+
+    def _record(self, row: int) -> _Record:
+        """Decode the raw fields of a record."""
+        return _RECORD.unpack_from(self._map, self._offset(row))
+
+    def _offset(self, row: int) -> int:
+        """Return the byte offset of a record."""
+        return self._records + row * _RECORD.size
+
+    def _slot_offset(self, slot: int) -> int:
+        """Return the byte offset of an index slot."""
+        return _HEADER_SIZE + slot * _SLOT.size
+
+    def _read_u64(self, offset: int) -> int:
+        """Read an unsigned 64-bit integer from the map."""
+        return _U64.unpack_from(self._map, offset)[0]
+
+    def _write_u64(self, offset: int, value: int) -> None:
+        """Write an unsigned 64-bit integer to the map."""
+        _U64.pack_into(self._map, offset, value)
+
+    @contextmanager
+    def _locked(self, operation: int) -> Generator[None]:
+        """Hold a flock on the store file."""
+        fcntl.flock(self._fd, operation)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _writing(self) -> Generator[None]:
+        """Hold the write lock and keep the seqlock odd while the store changes."""
+        with self._locked(fcntl.LOCK_EX):
+            sequence = self._read_u64(_SEQUENCE_OFFSET)
+            # Already odd if a writer died mid-write; its lock was released with it
+            sequence |= 1
+            self._write_u64(_SEQUENCE_OFFSET, sequence)
+            try:
+                yield
+            finally:
+                self._write_u64(_SEQUENCE_OFFSET, sequence + 1)
+
+
+def _slot_count(capacity: int) -> int:
+    """Return the index size for a capacity: a power of two, at most half full."""
+    return 1 << (2 * capacity - 1).bit_length()
+
+
+def _file_size(capacity: int) -> int:
+    """Return the size of a store file with the given capacity."""
+    return _HEADER_SIZE + _slot_count(capacity) * _SLOT.size + capacity * _RECORD.size
+
+
+def _to_entity(record: _Record) -> Entity:
+    """Build an Entity from the raw fields of a live record."""
+    _, version, price, flags, id_length, name_length, key, name = record
+    return Entity(
+        id=key[:id_length].decode(),
+        name=name[:name_length].decode(),
+        price=price,
+        in_stock=bool(flags & _IN_STOCK),
+        version=version,
+    )
@@ -0,0 +1,529 @@
+"""
+SQLite-backed repository using only the standard library.
+
+Reads run on a small pool of worker threads, each holding its own connection,
+so queries never block the event loop. Writes are funnelled through a single
+writer connection and group-committed: every write that arrives while a commit
+is in flight joins the next transaction, so concurrent requests share one commit
+instead of paying for one each.
+"""
+
+import asyncio
+import contextlib
+import sqlite3
+import threading
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Any
+from typing import TypeVar
+
+from app.domain.errors import EntityVersionConflictError
+from app.domain.models import BatchItemResult
+from app.domain.models import Entity
+from app.domain.models import EntityPage
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
+from app.repositories.cursor import decode_cursor
+from app.repositories.cursor import encode_cursor
+from app.repositories.indexes import prefix_upper_bound
+
+T = TypeVar("T")
+
+_URL_PREFIX = "sqlite:///"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS entities (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        id TEXT NOT NULL UNIQUE,
+        name TEXT NOT NULL,
+        price REAL NOT NULL,
+        in_stock INTEGER NOT NULL,
+        version INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS revision (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        value INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO revision (id, value) VALUES (0, 0)",
+    "CREATE INDEX IF NOT EXISTS entities_price ON entities (price)",
+    "CREATE INDEX IF NOT EXISTS entities_in_stock_price ON entities (in_stock, price)",
+    "CREATE INDEX IF NOT EXISTS entities_name ON entities (name)",
+)
+
+# Statements are constant strings so each connection's statement cache keeps them
+# prepared across calls.
+_COLUMNS = "seq, id, name, price, in_stock, version"
+_SELECT_BY_ID = f"SELECT {_COLUMNS} FROM entities WHERE id = ?"
+_SELECT_BY_IDS = f"SELECT {_COLUMNS} FROM entities WHERE id IN "
+# Bound parameters per statement, below SQLite's historical limit of 999
+_MAX_PARAMETERS = 500
+_COUNT_ALL = "SELECT COUNT(*) FROM entities"
+_SELECT_VERSION = "SELECT version FROM entities WHERE id = ?"
+_SELECT_REVISION = "SELECT value FROM revision WHERE id = 0"
+_NEXT_REVISION = "UPDATE revision SET value = value + 1 WHERE id = 0 RETURNING value"
+_UPSERT = (
+    "INSERT INTO entities (id, name, price, in_stock, version) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET name = excluded.name, price = excluded.price, "
+    "in_stock = excluded.in_stock, version = excluded.version"
+)
+_UPDATE = "UPDATE entities SET name = ?, price = ?, in_stock = ?, version = ? WHERE id = ?"
+_DELETE = "DELETE FROM entities WHERE id = ?"
+
+# How long a reader opened by startup() waits for the rest of the pool
+_STARTUP_TIMEOUT_SECONDS = 10.0
+
+_Row = tuple[int, str, str, float, int, int]
+_WriteOp = Callable[[sqlite3.Connection], Any]
+
+
+class SqliteRepository:
+    """Repository persisting entities in a SQLite database file.
+
+    Uses WAL mode so readers never block the writer (or each other). Results are
+    returned in insertion order, matching MemoryRepository.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4) -> None:
+        """Open (and if needed create) the database at `path`.
+
+        Args:
+            path: Filesystem path of the database file
+            pool_size: Number of reader threads/connections
+        """
+        if path == ":memory:" or path.startswith("file::memory:"):
+            raise ValueError("In-memory SQLite databases are not supported, use a file path")
+        self._path = path
+        self._pool_size = pool_size
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._readers = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="sqlite-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-write")
+        self._pending: list[tuple[_WriteOp, asyncio.Future[Any]]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+
+        connection = self._connect()
+        try:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+        finally:
+            connection.close()
+
+    @classmethod
+    def from_url(cls, url: str, pool_size: int = 4) -> "SqliteRepository":
+        """Create a repository from a `sqlite:///path/to/file.db` URL."""
+        if not url.startswith(_URL_PREFIX):
+            raise ValueError(f"Unsupported database URL '{url}', expected '{_URL_PREFIX}<path>'")
+        return cls(path=url[len(_URL_PREFIX) :], pool_size=pool_size)
+
+    async def save(self, entity: Entity) -> Entity:
+        """Save an entity (inserting it or replacing a stored one) with a new version."""
+        if not entity.id:
+            raise ValueError("Entity must have an id to be saved")
+        return await self._write(lambda connection: _save(connection, entity))
+
+    async def get_entity_by_id(self, entity_id: str) -> Entity | None:
+        """Get an entity by ID."""
+        row = await self._read(lambda c: c.execute(_SELECT_BY_ID, (entity_id,)).fetchone())
+        return None if row is None else _to_entity(row)
+
+    async def get_many(self, entity_ids: Sequence[str]) -> dict[str, Entity]:
+        """Get several entities by ID with one query per chunk of IDs."""
+        unique = list(dict.fromkeys(entity_ids))
+
+        def read(connection: sqlite3.Connection) -> list[_Row]:
+            rows: list[_Row] = []
+            for start in range(0, len(unique), _MAX_PARAMETERS):
+                chunk = unique[start : start + _MAX_PARAMETERS]
+                sql = f"{_SELECT_BY_IDS}({', '.join('?' * len(chunk))})"
+                rows.extend(connection.execute(sql, chunk).fetchall())
+            return rows
+
+        entities = (_to_entity(row) for row in await self._read(read))
+        return {entity.id: entity for entity in entities}
+
+    async def list_all(self, offset: int = 0, limit: int | None = None) -> list[Entity]:
+        """Retrieve all saved entities with optional pagination."""
+        return await self.find(EntityQuery(), offset=offset, limit=limit)
+
+    async def find(
+        self, query: EntityQuery, offset: int = 0, limit: int | None = None
+    ) -> list[Entity]:
+        """Retrieve entities matching a query, in insertion order."""
+        where, params = _where(query)
+        sql = f"SELECT {_COLUMNS} FROM entities{where} ORDER BY seq LIMIT ? OFFSET ?"
+        params.extend((-1 if limit is None else limit, offset))
+        rows = await self._read(lambda c: c.execute(sql, params).fetchall())
+        return [_to_entity(row) for row in rows]
+
+    async def list_page(
+        self, limit: int, cursor: str | None = None, query: EntityQuery | None = None
+    ) -> EntityPage:
+        """Retrieve a page of entities after the given cursor.
+
+        Seeks the primary key, so any page costs O(limit + log n).
+        """
+        after = 0 if cursor is None else decode_cursor(cursor)
+        rows = await self._read_after(after, limit + 1, query)
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return EntityPage(
+                entities=[_to_entity(row) for row in rows],
+                next_cursor=encode_cursor(rows[-1][0]),
+            )
+        return EntityPage(entities=[_to_entity(row) for row in rows])
+
+    def validate_cursor(self, cursor: str) -> None:
+        """Check that `list_page` accepts a cursor, without reading any entities."""
+        decode_cursor(cursor)
+
+    async def count(self, query: EntityQuery | None = None) -> int:
+        """Return the number of stored entities, optionally matching a query."""
+        if query is None or query.is_empty:
+            row = await self._read(lambda c: c.execute(_COUNT_ALL).fetchone())
+        else:
+            where, params = _where(query)
+            sql = f"{_COUNT_ALL}{where}"
+            row = await self._read(lambda c: c.execute(sql, params).fetchone())
+        return int(row[0])
+
+    async def get_revision(self) -> int:
+        """Return the store-wide change counter."""
+        row = await self._read(lambda c: c.execute(_SELECT_REVISION).fetchone())
+        return int(row[0])
+
+    async def iter_all(self, chunk_size: int = 1000) -> AsyncIterator[list[Entity]]:
+        """Iterate over all entities in chunks, seeking by primary key per chunk."""
+        after = 0
+        while True:
+            rows = await self._read_after(after, chunk_size, None)
+            if rows:
+                after = rows[-1][0]
+                yield [_to_entity(row) for row in rows]
+            if len(rows) < chunk_size:
+                return
+
+    async def update(self, entity: Entity, expected_version: int | None = None) -> Entity:
+        """Update an existing entity, optionally only if it is at `expected_version`."""
+        if not entity.id:
+            raise ValueError("Entity must have an id to be updated")
+        return await self._write(lambda connection: _update(connection, entity, expected_version))
+
+    async def patch(
+        self, entity_id: str, changes: EntityPatch, expected_version: int | None = None
+    ) -> Entity:
+        """Change some fields of an entity within a single write transaction."""
+        return await self._write(
+            lambda connection: _patch(connection, entity_id, changes, expected_version)
+        )
+
+    async def delete(self, entity_id: str) -> None:
+        """Delete an entity by ID."""
+        await self._write(lambda connection: _delete(connection, entity_id))
+
+    async def save_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Save several entities in one transaction."""
+        items = list(entities)
+
+        def apply(connection: sqlite3.Connection) -> list[BatchItemResult]:
+            results: list[BatchItemResult] = []
+            for entity in items:
+                if not entity.id:
+                    error = ValueError("Entity must have an id to be saved")
+                    results.append(BatchItemResult(entity_id=entity.id, error=error))
+                    continue
+                stored = _save(connection, entity)
+                results.append(BatchItemResult(entity_id=entity.id, entity=stored))
+            return results
+
+        return await self._write(apply)
+
+    async def update_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Update several existing entities in one transaction."""
+        items = list(entities)
+
+        def apply(connection: sqlite3.Connection) -> list[BatchItemResult]:
+            results: list[BatchItemResult] = []
+            for entity in items:
+                try:
+                    stored = _update(connection, entity)
+                except ValueError as e:
+                    results.append(BatchItemResult(entity_id=entity.id, error=e))
+                else:
+                    results.append(BatchItemResult(entity_id=entity.id, entity=stored))
+            return results
+
+        return await self._write(apply)
+
+    async def delete_many(self, entity_ids: Sequence[str]) -> list[BatchItemResult]:
+        """Delete several entities by ID in one transaction."""
+        ids = list(entity_ids)
+
+        def apply(connection: sqlite3.Connection) -> list[BatchItemResult]:
+            results: list[BatchItemResult] = []
+            for entity_id in ids:
+                try:
+                    _delete(connection, entity_id)
+                except ValueError as e:
+                    results.append(BatchItemResult(entity_id=entity_id, error=e))
+                else:
+                    results.append(BatchItemResult(entity_id=entity_id))
+            return results
+
+        return await self._write(apply)
+
+    async def clear(self) -> None:
+        """Delete all stored entities (useful for testing)."""
+
+        def apply(connection: sqlite3.Connection) -> None:
+            connection.execute("DELETE FROM entities")
+            _next_revision(connection)
+
+        await self._write(apply)
+
+    async def startup(self) -> None:
+        """Open every reader connection and the writer's up front.
+
+        Otherwise each pool thread connects on its first query, so the first
+        requests after startup pay for opening connections and preparing the
+        lookup statement.
+        """
+        loop = asyncio.get_running_loop()
+        # Every reader waits for the others, so each one runs on a thread of its own
+        barrier = threading.Barrier(self._pool_size)
+
+        def connect() -> None:
+            try:
+                self._thread_connection().execute(_SELECT_BY_ID, ("",)).fetchone()
+            except BaseException:
+                barrier.abort()
+                raise
+            # Broken if another reader failed, startup was cancelled or it timed out; this
+            # reader is connected either way
+            with contextlib.suppress(threading.BrokenBarrierError):
+                barrier.wait(timeout=_STARTUP_TIMEOUT_SECONDS)
+
+        try:
+            await asyncio.gather(
+                *(loop.run_in_executor(self._readers, connect) for _ in range(self._pool_size))
+            )
+        finally:
+            # Releases readers still waiting for jobs that failed or were dropped on cancellation,
+            # which would otherwise block close()
+            barrier.abort()
+        await loop.run_in_executor(self._writer, self._thread_connection)
+
+    async def close(self) -> None:
+        """Wait for pending writes, then stop the worker threads and close connections."""
+        if self._flush_task is not None:
+            await asyncio.shield(self._flush_task)
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+    async def _read_after(self, after: int, limit: int, query: EntityQuery | None) -> list[_Row]:
+        """Fetch up to `limit` rows positioned after sequence number `after`."""
+        where, params = _where(query or EntityQuery(), after=after)
+        sql = f"SELECT {_COLUMNS} FROM entities{where} ORDER BY seq LIMIT ?"
+        params.append(limit)
+        return await self._read(lambda c: c.execute(sql, params).fetchall())
+
+    async def _read(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a read on the reader pool using that thread's connection."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._readers, lambda: operation(self._thread_connection())
+        )
+
+    async def _write(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """Queue a write for the next group commit and wait for its outcome."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[T] = loop.create_future()
+        self._pending.append((operation, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        """Commit queued writes in groups until the queue is empty."""
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch, self._pending = self._pending, []
+            operations = [operation for operation, _ in batch]
+            try:
+                outcomes = await loop.run_in_executor(self._writer, self._commit, operations)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), (value, error) in zip(batch, outcomes, strict=True):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(value)
+                else:
+                    future.set_exception(error)
+
+    def _commit(self, operations: list[_WriteOp]) -> list[tuple[Any, Exception | None]]:
+        """Apply operations in one transaction, isolating each in a savepoint."""
+        connection = self._thread_connection()
+        outcomes: list[tuple[Any, Exception | None]] = []
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for operation in operations:
+                connection.execute("SAVEPOINT operation")
+                try:
+                    value = operation(connection)
+                except (ValueError, EntityVersionConflictError, sqlite3.Error) as e:
+                    connection.execute("ROLLBACK TO operation")
+                    connection.execute("RELEASE operation")
+                    outcomes.append((None, e))
+                else:
+                    connection.execute("RELEASE operation")
+                    outcomes.append((value, None))
+            connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        return outcomes
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        """Return the calling worker thread's connection, opening it on first use."""
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode with WAL enabled."""
+        connection = sqlite3.connect(
+            self._path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=128,
+        )
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("PRAGMA busy_timeout = 5000")
+        return connection
+
+
+def _to_entity(row: _Row) -> Entity:
+    """Build an Entity from a selected row."""
+    _, entity_id, name, price, in_stock, version = row
+    return Entity(id=entity_id, name=name, price=price, in_stock=bool(in_stock), version=version)
+
+
+def _next_revision(connection: sqlite3.Connection) -> int:
+    """Bump the store-wide revision inside the current transaction and return it."""
+    return int(connection.execute(_NEXT_REVISION).fetchone()[0])
+
+
+def _save(connection: sqlite3.Connection, entity: Entity) -> Entity:
+    """Insert or replace an entity under the next revision."""
+    stored = replace(entity, version=_next_revision(connection))
+    connection.execute(
+        _UPSERT,
+        (stored.id, stored.name, stored.price, int(stored.in_stock), stored.version),
+    )
+    return stored
+
+
+def _update(
+    connection: sqlite3.Connection, entity: Entity, expected_version: int | None = None
+) -> Entity:
+    """Replace a stored entity under the next revision.
+
+    Raises:
+        ValueError: If the entity doesn't exist
+        EntityVersionConflictError: If it is not at expected_version
+    """
+    row = connection.execute(_SELECT_VERSION, (entity.id,)).fetchone()
+    if row is None:
+        raise ValueError(f"Entity with id '{entity.id}' not found")
+    if expected_version is not None and row[0] != expected_version:
+        raise EntityVersionConflictError(entity.id, row[0], expected_version)
+    stored = replace(entity, version=_next_revision(connection))
+    connection.execute(
+        _UPDATE, (stored.name, stored.price, int(stored.in_stock), stored.version, stored.id)
+    )
+    return stored
+
+
+def _patch(
+    connection: sqlite3.Connection,
+    entity_id: str,
+    changes: EntityPatch,
+    expected_version: int | None = None,
+) -> Entity:
+    """Apply changes to a stored entity under the next revision.
+
+    Raises:
+        ValueError: If the entity doesn't exist
+        EntityVersionConflictError: If it is not at expected_version
+    """
+    row = connection.execute(_SELECT_BY_ID, (entity_id,)).fetchone()
+    if row is None:
+        raise ValueError(f"Entity with id '{entity_id}' not found")
+    current = _to_entity(row)
+    if expected_version is not None and current.version != expected_version:
+        raise EntityVersionConflictError(entity_id, current.version, expected_version)
+    stored = replace(changes.apply(current), version=_next_revision(connection))
+    connection.execute(
+        _UPDATE, (stored.name, stored.price, int(stored.in_stock), stored.version, stored.id)
+    )
+    return stored
+
+
+def _delete(connection: sqlite3.Connection, entity_id: str) -> None:
+    """Delete a stored entity, raising ValueError if it doesn't exist."""
+    if connection.execute(_DELETE, (entity_id,)).rowcount == 0:
+        raise ValueError(f"Entity with id '{entity_id}' not found")
+    _next_revision(connection)
+
+
+def _where(query: EntityQuery, after: int | None = None) -> tuple[str, list[Any]]:
+    """Translate a query into a WHERE clause and its parameters."""
+    clauses: list[str] = []
+    params: list[Any] = []
+    if after is not None:
+        clauses.append("seq > ?")
+        params.append(after)
+    if query.in_stock is not None:
+        clauses.append("in_stock = ?")
+        params.append(int(query.in_stock))
+    if query.min_price is not None:
+        clauses.append("price >= ?")
+        params.append(query.min_price)
+    if query.max_price is not None:
+        clauses.append("price <= ?")
+        params.append(query.max_price)
+    if query.name_prefix is not None:
+        # A range on the name index; UTF-8 byte order matches code point order
+        clauses.append("name >= ?")
+        params.append(query.name_prefix)
+        upper = prefix_upper_bound(query.name_prefix)
+        if upper is None:
+            clauses.append("substr(name, 1, ?) = ?")
+            params.extend((len(query.name_prefix), query.name_prefix))
+        else:
+            clauses.append("name < ?")
+            params.append(upper)
+    if not clauses:
+        return "", params
+    return " WHERE " + " AND ".join(clauses), params
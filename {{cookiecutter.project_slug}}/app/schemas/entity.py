@@ -6,10 +6,20 @@ To create a new schema:
 2. Define your request/response schemas using Pydantic BaseModel
 """
 
+from dataclasses import dataclass
+
 from pydantic import BaseModel
+from pydantic import Field
+from pydantic import TypeAdapter
 
 from app.domain.models import Entity
 
+# Upper bound on items per batch request, to keep a single request's work bounded
+MAX_BATCH_SIZE = 10_000
+
+# Upper bound on per-line errors reported by an import (the rejected count is exact)
+MAX_IMPORT_ERRORS = 100
+
 
 class EntitySchema(BaseModel):
     """API schema for entity data."""
@@ -18,6 +28,7 @@ class EntitySchema(BaseModel):
     name: str
     price: float
     in_stock: bool = True
+    version: int = 0
 
     @classmethod
     def from_domain(cls, entity: Entity) -> "EntitySchema":
@@ -27,6 +38,7 @@ class EntitySchema(BaseModel):
             name=entity.name,
             price=entity.price,
             in_stock=entity.in_stock,
+            version=entity.version,
         )
 
 
@@ -46,9 +58,127 @@ class EntityUpdateRequest(BaseModel):
     in_stock: bool | None = None
 
 
+class EntityPatchRequest(BaseModel):
+    """Request schema for changing some fields of an entity."""
+
+    name: str | None = None
+    price: float | None = None
+    in_stock: bool | None = None
+    expected_version: int | None = Field(
+        None, ge=0, description="Only apply the changes if the entity is still at this version"
+    )
+
+
 class EntitiesListResponse(BaseModel):
     """Response schema for entity list."""
 
     entities: list[EntitySchema]
     count: int
+    next_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class _EntitiesListBody:
+    """Shape of EntitiesListResponse, holding domain entities instead of schemas."""
+
+    entities: list[Entity]
+    count: int
+    next_cursor: str | None = None
+
+
+# Serializers compiled once from the domain types. Entity has the same fields as
+# EntitySchema, so the JSON is identical, but already-validated entities are
+# encoded directly instead of being copied into models and validated again.
+_entity_serializer = TypeAdapter(Entity)
+_entities_list_serializer = TypeAdapter(_EntitiesListBody)
+
+
+def dump_entity_json(entity: Entity) -> bytes:
+    """Encode an entity as EntitySchema JSON."""
+    return _entity_serializer.dump_json(entity)
+
+
+def dump_entities_list_json(
+    entities: list[Entity], count: int, next_cursor: str | None = None
+) -> bytes:
+    """Encode a list of entities as EntitiesListResponse JSON."""
+    return _entities_list_serializer.dump_json(_EntitiesListBody(entities, count, next_cursor))
+
+
+class EntityBatchCreateRequest(BaseModel):
+    """Request schema for creating entities in bulk."""
+
+    items: list[EntityCreateRequest] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class EntityBatchUpdateItem(BaseModel):
+    """One item of a bulk update (replaces the stored entity)."""
+
+    id: str
+    name: str
+    price: float
+    in_stock: bool = True
+
+
+class EntityBatchUpdateRequest(BaseModel):
+    """Request schema for updating entities in bulk."""
+
+    items: list[EntityBatchUpdateItem] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class EntityBatchDeleteRequest(BaseModel):
+    """Request schema for deleting entities in bulk."""
+
+    ids: list[str] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class EntityBatchItemResult(BaseModel):
+    """Result of one item of a bulk operation.
+
+    `status` is the HTTP status the item would have had as a single request.
+    """
+
+    index: int
+    id: str | None = None
+    status: int
+    entity: EntitySchema | None = None
+    error: str | None = None
+
+
+class EntityBatchResponse(BaseModel):
+    """Response schema for bulk operations."""
+
+    results: list[EntityBatchItemResult]
+    succeeded: int
+    failed: int
+
+
+class EntityImportRecord(EntityCreateRequest):
+    """One NDJSON line of an import; the ID is generated when omitted."""
+
+    id: str | None = None
+
+
+class EntityImportError(BaseModel):
+    """A rejected import line."""
+
+    line: int
+    error: str
+
+
+class EntityImportResponse(BaseModel):
+    """Summary of an NDJSON import.
+
+    `errors` lists the first rejected lines (at most MAX_IMPORT_ERRORS);
+    `rejected` counts all of them.
+    """
+
+    accepted: int = 0
+    rejected: int = 0
+    errors: list[EntityImportError] = []
 
+    def reject(self, line: int, error: str) -> None:
+        """Record a rejected line."""
+        self.rejected += 1
+        if len(self.errors) < MAX_IMPORT_ERRORS:
+            self.errors.append(EntityImportError(line=line, error=error))
@@ -0,0 +1,118 @@
+"""
+Per-request batching of entity lookups.
+
+An EntityLoader collects the lookups made while the event loop runs one round
+of ready callbacks and fetches them with a single `Repository.get_many`, so code
+resolving many IDs concurrently (related entities, reference checks) costs one
+repository call instead of one per ID. Results are kept for the life of the
+loader, which is one request (see `get_entity_loader` in app/api/dependencies.py).
+"""
+
+import asyncio
+from collections.abc import Sequence
+
+from app.domain.models import Entity
+from app.domain.protocols import Repository
+
+_Lookup = tuple[str, "asyncio.Future[Entity | None]"]
+
+
+class EntityLoader:
+    """Batching, caching lookups of entities by ID for a single request.
+
+    Lookups awaited one after another still run one at a time; start them
+    together (e.g. with `load_many` or `asyncio.gather`) to have them batched.
+    Results are not invalidated by writes, so a loader must not outlive its
+    request; after writing an entity, `prime` or `clear` it.
+    """
+
+    def __init__(self, repository: Repository, max_batch_size: int = 1000) -> None:
+        """Create a loader.
+
+        Args:
+            repository: Repository to fetch entities from
+            max_batch_size: Maximum IDs passed to one get_many call
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self._repository = repository
+        self._max_batch_size = max_batch_size
+        self._results: dict[str, asyncio.Future[Entity | None]] = {}
+        self._queue: list[_Lookup] = []
+        self._fetches: set[asyncio.Task[None]] = set()
+        self._batches = 0
+
+    @property
+    def batches(self) -> int:
+        """Number of get_many calls made so far."""
+        return self._batches
+
+    async def load(self, entity_id: str) -> Entity | None:
+        """Get an entity by ID, fetched together with the other lookups of this tick."""
+        # Shielded so that a cancelled caller does not cancel a result others share
+        return await asyncio.shield(self._result(entity_id))
+
+    async def load_many(self, entity_ids: Sequence[str]) -> list[Entity | None]:
+        """Get several entities by ID, in order, with None for the ones not stored."""
+        results = [self._result(entity_id) for entity_id in entity_ids]
+        pending = {result for result in results if not result.done()}
+        if pending:
+            # Unlike gather, wait never cancels the shared results if this caller is cancelled
+            await asyncio.wait(pending)
+        return [result.result() for result in results]
+
+    def prime(self, entity: Entity) -> None:
+        """Cache an entity, e.g. one just written, replacing what was loaded for it."""
+        result: asyncio.Future[Entity | None] = asyncio.get_running_loop().create_future()
+        result.set_result(entity)
+        self._results[entity.id] = result
+
+    def clear(self, entity_id: str) -> None:
+        """Forget what was loaded for an ID, so the next lookup reads it again."""
+        self._results.pop(entity_id, None)
+
+    def _result(self, entity_id: str) -> "asyncio.Future[Entity | None]":
+        """Return the cached or pending result for an ID, queuing a lookup if there is none."""
+        result = self._results.get(entity_id)
+        if result is None:
+            loop = asyncio.get_running_loop()
+            result = self._results[entity_id] = loop.create_future()
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append((entity_id, result))
+        return result
+
+    def _dispatch(self) -> None:
+        """Fetch the lookups queued during the last tick."""
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self._max_batch_size):
+            fetch = asyncio.ensure_future(self._fetch(queue[start : start + self._max_batch_size]))
+            self._fetches.add(fetch)
+            fetch.add_done_callback(self._fetches.discard)
+
+    async def _fetch(self, batch: list[_Lookup]) -> None:
+        """Resolve a batch of lookups with one get_many call."""
+        self._batches += 1
+        try:
+            found = await self._repository.get_many([entity_id for entity_id, _ in batch])
+        except asyncio.CancelledError:
+            self._fail(batch, None)
+            raise
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        for entity_id, result in batch:
+            if not result.done():
+                result.set_result(found.get(entity_id))
+
+    def _fail(self, batch: list[_Lookup], error: Exception | None) -> None:
+        """Fail a batch (cancel it without an error), forgetting it so lookups can retry."""
+        for entity_id, result in batch:
+            if self._results.get(entity_id) is result:
+                del self._results[entity_id]
+            if result.done():
+                continue
+            if error is None:
+                result.cancel()
+            else:
+                result.set_exception(error)
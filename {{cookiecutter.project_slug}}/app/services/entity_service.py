@@ -8,10 +8,19 @@ To create a new service:
 4. Add dependency function in app/api/dependencies.py
 """
 
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+from dataclasses import replace
+
 from app.domain.errors import EntityNotFoundError
 from app.domain.errors import EntityValidationError
+from app.domain.models import BatchItemResult
 from app.domain.models import Entity
+from app.domain.models import EntityPage
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
 from app.domain.protocols import Repository
+from app.services.entity_loader import EntityLoader
 
 
 class EntityService:
@@ -24,8 +33,7 @@ class EntityService:
     async def create_entity(self, entity: Entity) -> Entity:
         """Create a new entity."""
         try:
-            await self.repository.save(entity)
-            return entity
+            return await self.repository.save(entity)
         except ValueError as e:
             raise EntityValidationError(str(e)) from e
 
@@ -36,29 +44,160 @@ class EntityService:
             raise EntityNotFoundError(entity_id)
         return entity
 
-    async def get_entities(self, offset: int = 0, limit: int | None = None) -> list[Entity]:
+    async def get_entities_by_ids(
+        self, entity_ids: Sequence[str], loader: EntityLoader | None = None
+    ) -> list[Entity]:
+        """Get the entities with the given IDs in one repository call.
+
+        Args:
+            entity_ids: IDs to look up
+            loader: The request's loader, so entities it already holds are not fetched again
+
+        Returns:
+            The entities found, in the order of their first ID (missing IDs are skipped)
+        """
+        loader = loader if loader is not None else EntityLoader(self.repository)
+        found = await loader.load_many(list(dict.fromkeys(entity_ids)))
+        return [entity for entity in found if entity is not None]
+
+    async def get_entities(
+        self, offset: int = 0, limit: int | None = None, query: EntityQuery | None = None
+    ) -> list[Entity]:
         """Get all entities with optional pagination.
 
         Args:
             offset: Number of entities to skip (for pagination)
             limit: Maximum number of entities to return (None for all)
+            query: Optional filter criteria, evaluated by the repository
 
         Returns:
             List of entities
         """
-        return await self.repository.list_all(offset=offset, limit=limit)
+        if query is None or query.is_empty:
+            return await self.repository.list_all(offset=offset, limit=limit)
+        return await self.repository.find(query, offset=offset, limit=limit)
+
+    async def get_entities_page(
+        self, limit: int, cursor: str | None = None, query: EntityQuery | None = None
+    ) -> EntityPage:
+        """Get a page of entities using cursor pagination.
+
+        Args:
+            limit: Maximum number of entities to return
+            cursor: Cursor returned with the previous page (None for the first page)
+            query: Optional filter criteria, evaluated by the repository
+
+        Returns:
+            Page of entities with the cursor for the next page
+
+        Raises:
+            EntityValidationError: If the cursor is invalid
+        """
+        try:
+            return await self.repository.list_page(limit=limit, cursor=cursor, query=query)
+        except ValueError as e:
+            raise EntityValidationError(str(e)) from e
+
+    def validate_cursor(self, cursor: str) -> None:
+        """Check the repository accepts a pagination cursor, without reading any entities.
+
+        Raises:
+            EntityValidationError: If the cursor is invalid
+        """
+        try:
+            self.repository.validate_cursor(cursor)
+        except ValueError as e:
+            raise EntityValidationError(str(e)) from e
+
+    async def count_entities(self, query: EntityQuery | None = None) -> int:
+        """Get the number of entities (matching a query) without loading them."""
+        return await self.repository.count(query)
+
+    async def get_revision(self) -> int:
+        """Get the store-wide change counter (changes whenever any entity does)."""
+        return await self.repository.get_revision()
 
-    async def update_entity(self, entity: Entity) -> Entity:
-        """Update an existing entity."""
+    def iter_entities(self, chunk_size: int = 1000) -> AsyncIterator[list[Entity]]:
+        """Iterate over all entities in chunks without loading them all at once."""
+        return self.repository.iter_all(chunk_size=chunk_size)
+
+    async def update_entity(self, entity: Entity, expected_version: int | None = None) -> Entity:
+        """Update an existing entity.
+
+        Args:
+            entity: Entity with updated data
+            expected_version: Only update if the stored entity is still at this version
+
+        Returns:
+            The stored entity, carrying its new version
+
+        Raises:
+            EntityNotFoundError: If the entity doesn't exist
+            EntityVersionConflictError: If the entity is no longer at expected_version
+        """
         try:
-            await self.repository.update(entity)
-            return entity
+            return await self.repository.update(entity, expected_version)
         except ValueError as e:
             raise EntityNotFoundError(str(e)) from e
 
+    async def patch_entity(
+        self, entity_id: str, changes: EntityPatch, expected_version: int | None = None
+    ) -> Entity:
+        """Change some fields of an entity in a single repository call.
+
+        Args:
+            entity_id: ID of the entity to change
+            changes: Fields to change
+            expected_version: Only change it if the stored entity is still at this version
+
+        Returns:
+            The stored entity, carrying its new version
+
+        Raises:
+            EntityNotFoundError: If the entity doesn't exist
+            EntityVersionConflictError: If the entity is no longer at expected_version
+        """
+        try:
+            return await self.repository.patch(entity_id, changes, expected_version)
+        except ValueError as e:
+            raise EntityNotFoundError(entity_id) from e
+
     async def delete_entity(self, entity_id: str) -> None:
         """Delete an entity by ID."""
         try:
             await self.repository.delete(entity_id)
         except ValueError as e:
             raise EntityNotFoundError(str(e)) from e
+
+    async def create_entities(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Create several entities in one repository call.
+
+        Failed items carry an EntityValidationError; the rest are still created.
+        """
+        results = await self.repository.save_many(entities)
+        return [
+            result if result.ok else replace(result, error=EntityValidationError(str(result.error)))
+            for result in results
+        ]
+
+    async def update_entities(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        """Update several entities in one repository call.
+
+        Missing items carry an EntityNotFoundError; the rest are still updated.
+        """
+        results = await self.repository.update_many(entities)
+        return [
+            result if result.ok else replace(result, error=EntityNotFoundError(result.entity_id))
+            for result in results
+        ]
+
+    async def delete_entities(self, entity_ids: Sequence[str]) -> list[BatchItemResult]:
+        """Delete several entities in one repository call.
+
+        Missing items carry an EntityNotFoundError; the rest are still deleted.
+        """
+        results = await self.repository.delete_many(entity_ids)
+        return [
+            result if result.ok else replace(result, error=EntityNotFoundError(result.entity_id))
+            for result in results
+        ]
@@ -1,20 +1,24 @@
-import logging
-import uvicorn
+import sys
 
-from app.api.router import app
 from app.core.config import settings
+{%- if cookiecutter.include_entity_example == "yes" %}
+from app.core.loadtest import main as load_test
+{%- endif %}
+from app.core.server import serve
 
 
 def main() -> None:
-    """Run the FastAPI application."""
-    log_level = logging.DEBUG if settings.debug else logging.INFO
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
-        log_level=logging.getLevelName(log_level).lower(),
-        reload=settings.debug,
-    )
+    """Run the FastAPI application with the server options from settings.
+{%- if cookiecutter.include_entity_example == "yes" %}
+
+    `python main.py loadtest` runs the in-process load test instead.
+    """
+{%- else %}"""{% endif %}
+{%- if cookiecutter.include_entity_example == "yes" %}
+    if sys.argv[1:2] == ["loadtest"]:
+        sys.exit(load_test(sys.argv[2:]))
+{%- endif %}
+    sys.exit(serve(settings))
 
 
 if __name__ == "__main__":
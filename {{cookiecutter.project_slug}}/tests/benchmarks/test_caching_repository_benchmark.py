@@ -0,0 +1,56 @@
+"""
+Benchmark for cache hits in CachingRepository.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import statistics
+import time
+
+import pytest
+
+from app.domain.models import Entity
+from app.domain.protocols import Repository
+from app.repositories.caching_repository import CachingRepository
+from app.repositories.memory_repository import MemoryRepository
+
+ENTITIES = 1_000
+LOOKUPS = 100_000
+ROUNDS = 5
+# A hit adds an LRU touch and a clock read on top of the dict lookup
+MAX_HIT_OVERHEAD_SECONDS = 2e-6
+
+
+async def _lookup_time(repository: Repository) -> float:
+    """Return the median time of one get_entity_by_id call, in seconds."""
+    ids = [str(i % ENTITIES) for i in range(LOOKUPS)]
+    timings: list[float] = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for entity_id in ids:
+            await repository.get_entity_by_id(entity_id)
+        timings.append((time.perf_counter() - started) / LOOKUPS)
+    return statistics.median(timings)
+
+
+@pytest.mark.benchmark
+def test_cache_hit_overhead_against_memory_repository() -> None:
+    """A cache hit must add only a small, constant cost over a direct in-memory lookup."""
+
+    async def run() -> tuple[float, float, float]:
+        memory = MemoryRepository()
+        for i in range(ENTITIES):
+            await memory.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+        cached = CachingRepository(memory, max_entries=ENTITIES)
+        direct = await _lookup_time(memory)
+        hit = await _lookup_time(cached)
+        assert cached.stats.misses == ENTITIES
+        return direct, hit, cached.stats.hit_ratio
+
+    direct, hit, hit_ratio = asyncio.run(run())
+    print(f"\nMemoryRepository lookup:      {direct * 1e9:>8.0f} ns")
+    print(f"CachingRepository hit:        {hit * 1e9:>8.0f} ns ({hit_ratio:.1%} hit ratio)")
+    print(f"hit overhead vs direct:       {(hit - direct) * 1e9:>8.0f} ns")
+
+    assert hit - direct < MAX_HIT_OVERHEAD_SECONDS
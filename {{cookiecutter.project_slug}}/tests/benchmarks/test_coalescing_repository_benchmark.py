@@ -0,0 +1,88 @@
+"""
+Benchmark for CoalescingRepository under a burst of reads for a few hot entities.
+
+Fires bursts of concurrent lookups that mostly hit a handful of IDs at a
+backend serving a millisecond per call over a small connection pool, with and
+without the single-flight layer, and compares the calls reaching the backend
+and the time to serve a burst.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import random
+import time
+
+import pytest
+
+from app.domain.models import Entity
+from app.domain.protocols import Repository
+from app.repositories.coalescing_repository import CoalescingRepository
+from app.repositories.memory_repository import MemoryRepository
+
+ENTITIES = 1_000
+HOT_ENTITIES = 10
+HOT_SHARE = 0.9
+BURST = 500
+BURSTS = 20
+BACKEND_LATENCY_SECONDS = 0.001
+BACKEND_CONNECTIONS = 4
+MIN_CALL_REDUCTION = 5
+
+
+class _SlowRepository(MemoryRepository):
+    """MemoryRepository whose lookups hold one of a few connections for a while."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+        self._connections = asyncio.Semaphore(BACKEND_CONNECTIONS)
+
+    async def get_entity_by_id(self, entity_id: str) -> Entity | None:
+        self.lookups += 1
+        async with self._connections:
+            await asyncio.sleep(BACKEND_LATENCY_SECONDS)
+        return await super().get_entity_by_id(entity_id)
+
+
+def _burst_ids(rng: random.Random) -> list[str]:
+    return [
+        str(rng.randrange(HOT_ENTITIES) if rng.random() < HOT_SHARE else rng.randrange(ENTITIES))
+        for _ in range(BURST)
+    ]
+
+
+async def _run(repository: Repository) -> float:
+    """Return the mean time to serve one burst, in seconds."""
+    rng = random.Random(42)
+    started = time.perf_counter()
+    for _ in range(BURSTS):
+        await asyncio.gather(*(repository.get_entity_by_id(i) for i in _burst_ids(rng)))
+    return (time.perf_counter() - started) / BURSTS
+
+
+@pytest.mark.benchmark
+def test_coalescing_cuts_backend_calls_for_hot_entities() -> None:
+    """Concurrent lookups of hot entities must mostly share a backend call."""
+
+    async def run() -> dict[str, tuple[int, float]]:
+        results: dict[str, tuple[int, float]] = {}
+        for name, coalesce in (("direct", False), ("coalescing", True)):
+            backend = _SlowRepository()
+            for i in range(ENTITIES):
+                await backend.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+            repository = CoalescingRepository(backend) if coalesce else backend
+            burst = await _run(repository)
+            results[name] = (backend.lookups, burst)
+        return results
+
+    results = asyncio.run(run())
+    print(
+        f"\n{BURSTS} bursts of {BURST} concurrent lookups, {HOT_SHARE:.0%} on {HOT_ENTITIES} IDs:"
+    )
+    for name, (lookups, burst) in results.items():
+        print(f"  {name:<11} {lookups:>7,} backend calls  {burst * 1e3:7.2f} ms per burst")
+
+    direct, coalescing = results["direct"], results["coalescing"]
+    assert direct[0] >= MIN_CALL_REDUCTION * coalescing[0]
+    assert direct[1] >= MIN_CALL_REDUCTION * coalescing[1]
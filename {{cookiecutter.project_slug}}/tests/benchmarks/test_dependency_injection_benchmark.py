@@ -0,0 +1,101 @@
+"""
+Benchmark for request dependency injection.
+
+Calls two minimal FastAPI applications directly over ASGI, each with one
+route depending on the repository. One resolves it the old way, with a plain
+`def` provider going through the container, which FastAPI runs in its
+threadpool; the other uses the async provider reading `app.state`. The
+difference is the per-request cost of the threadpool hop, measured both one
+request at a time and with many requests in flight.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import Depends
+from fastapi import FastAPI
+from starlette.types import Message
+
+from app.api.dependencies import get_repository
+from app.core.container import Container
+from app.domain.protocols import Repository
+
+REQUESTS = 20_000
+CONCURRENCY = 100
+MIN_SAVING_MICROSECONDS = 5.0
+
+_container = Container()
+
+
+def _legacy_get_repository() -> Repository:
+    return _container.repository
+
+
+def _app(provider: object) -> FastAPI:
+    app = FastAPI()
+    app.state.repository = _container.repository
+
+    @app.get("/item")
+    async def item(repository: Repository = Depends(provider)) -> dict[str, bool]:
+        return {"ok": True}
+
+    return app
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message: Message) -> None:
+    pass
+
+
+async def _microseconds_per_request(app: FastAPI, concurrency: int) -> float:
+    async def client(requests: int) -> None:
+        for _ in range(requests):
+            scope = {
+                "type": "http",
+                "method": "GET",
+                "path": "/item",
+                "headers": [],
+                "query_string": b"",
+            }
+            await app(scope, _receive, _send)
+
+    await client(100)
+    started = time.perf_counter()
+    await asyncio.gather(*(client(REQUESTS // concurrency) for _ in range(concurrency)))
+    return (time.perf_counter() - started) / REQUESTS * 1e6
+
+
+@pytest.mark.benchmark
+def test_async_provider_saves_threadpool_hop() -> None:
+    """Report and bound the per-request time saved by the async app-scoped provider."""
+
+    async def run() -> dict[str, tuple[float, float]]:
+        results: dict[str, tuple[float, float]] = {}
+        for name, provider in (
+            ("sync container", _legacy_get_repository),
+            ("async state", get_repository),
+        ):
+            app = _app(provider)
+            results[name] = (
+                await _microseconds_per_request(app, 1),
+                await _microseconds_per_request(app, CONCURRENCY),
+            )
+        return results
+
+    results = asyncio.run(run())
+    print(
+        f"\nper-request time over {REQUESTS:,} direct ASGI calls "
+        f"(sequential / {CONCURRENCY} in flight):"
+    )
+    for name, (sequential, concurrent) in results.items():
+        print(f"  {name:<15} {sequential:7.2f} us  {concurrent:7.2f} us")
+
+    legacy, current = results["sync container"], results["async state"]
+    assert legacy[0] - current[0] > MIN_SAVING_MICROSECONDS
+    assert legacy[1] - current[1] > MIN_SAVING_MICROSECONDS
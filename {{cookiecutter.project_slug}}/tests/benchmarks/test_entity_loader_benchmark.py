@@ -0,0 +1,66 @@
+"""
+Benchmark for EntityLoader against one lookup per ID.
+
+Resolves a set of IDs on the sqlite backend, where every call is a round trip
+to a reader thread: first with one get_entity_by_id per ID, as code resolving
+references in a loop would, then through an EntityLoader, which turns the
+lookups started together into a single get_many.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from app.domain.models import Entity
+from app.repositories.sqlite_repository import SqliteRepository
+from app.services.entity_loader import EntityLoader
+
+ENTITIES = 10_000
+IDS_PER_REQUEST = 200
+REQUESTS = 20
+MIN_SPEEDUP = 5.0
+
+
+@pytest.mark.benchmark
+def test_loader_batches_lookups_into_one_round_trip(tmp_path: Path) -> None:
+    """Resolving IDs through the loader must be much faster than one lookup per ID."""
+
+    async def run() -> tuple[float, float]:
+        repository = SqliteRepository(str(tmp_path / "bench.db"))
+        try:
+            await repository.startup()
+            await repository.save_many(
+                [Entity(id=str(i), name=f"Entity {i}", price=float(i)) for i in range(ENTITIES)]
+            )
+            rng = random.Random(42)
+            requests = [
+                [str(rng.randrange(ENTITIES)) for _ in range(IDS_PER_REQUEST)]
+                for _ in range(REQUESTS)
+            ]
+
+            started = time.perf_counter()
+            for ids in requests:
+                for entity_id in ids:
+                    await repository.get_entity_by_id(entity_id)
+            one_by_one = (time.perf_counter() - started) / REQUESTS
+
+            started = time.perf_counter()
+            for ids in requests:
+                await EntityLoader(repository).load_many(ids)
+            batched = (time.perf_counter() - started) / REQUESTS
+            return one_by_one, batched
+        finally:
+            await repository.close()
+
+    one_by_one, batched = asyncio.run(run())
+    print(f"\nresolving {IDS_PER_REQUEST} IDs on the sqlite backend:")
+    print(f"  one get_entity_by_id per ID  {one_by_one * 1e3:8.2f} ms")
+    print(f"  EntityLoader (get_many)      {batched * 1e3:8.2f} ms")
+    print(f"  speedup                      {one_by_one / batched:8.1f}x")
+
+    assert one_by_one / batched >= MIN_SPEEDUP
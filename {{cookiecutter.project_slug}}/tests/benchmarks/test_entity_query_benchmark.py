@@ -0,0 +1,59 @@
+"""
+Benchmark for filtered entity queries.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import statistics
+import time
+
+import pytest
+
+from app.domain.models import Entity
+from app.domain.models import EntityQuery
+from app.repositories.memory_repository import MemoryRepository
+
+STORE_SIZES = (1_000, 10_000, 100_000)
+MATCHES = 50
+ROUNDS = 200
+MAX_SLOWDOWN = 3.0
+
+QUERIES = {
+    "name_prefix": EntityQuery(name_prefix="Needle"),
+    "price_range": EntityQuery(min_price=1_000_000.0, max_price=2_000_000.0),
+    "prefix_and_stock": EntityQuery(name_prefix="Needle", in_stock=True),
+}
+
+
+async def _seeded_repository(size: int) -> MemoryRepository:
+    repository = MemoryRepository()
+    for i in range(size - MATCHES):
+        await repository.save(Entity(id=str(i), name=f"Entity {i}", price=float(i % 1000)))
+    for i in range(MATCHES):
+        await repository.save(Entity(id=f"needle-{i}", name=f"Needle {i}", price=1_000_000.0 + i))
+    return repository
+
+
+async def _median_query_latency(repository: MemoryRepository, query: EntityQuery) -> float:
+    timings: list[float] = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        entities = await repository.find(query)
+        timings.append(time.perf_counter() - started)
+        assert len(entities) == MATCHES
+    return statistics.median(timings)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(QUERIES))
+def test_filtered_query_scales_with_result_size(name: str) -> None:
+    """Filtered query latency must track the result size, not the store size."""
+    query = QUERIES[name]
+    latencies: dict[int, float] = {}
+    for size in STORE_SIZES:
+        repository = asyncio.run(_seeded_repository(size))
+        latencies[size] = asyncio.run(_median_query_latency(repository, query))
+        print(f"\n{name} {size:>8} entities: {latencies[size] * 1e6:.1f} us per query")
+
+    assert latencies[STORE_SIZES[-1]] < latencies[STORE_SIZES[0]] * MAX_SLOWDOWN
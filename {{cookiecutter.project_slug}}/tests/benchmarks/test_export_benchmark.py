@@ -0,0 +1,63 @@
+"""
+Benchmark for streaming entity export.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import time
+import tracemalloc
+
+import pytest
+
+from app.api.streaming import ndjson_stream
+from app.domain.models import Entity
+from app.repositories.memory_repository import MemoryRepository
+from app.services.entity_service import EntityService
+
+STORE_SIZES = (10_000, 100_000)
+CHUNK_SIZE = 1000
+MAX_PEAK_GROWTH = 2.0
+
+
+async def _seeded_service(size: int) -> EntityService:
+    repository = MemoryRepository()
+    await repository.save_many(
+        [Entity(id=str(i), name=f"Entity {i}", price=float(i)) for i in range(size)]
+    )
+    return EntityService(repository=repository)
+
+
+async def _drain_export(service: EntityService) -> int:
+    written = 0
+    async for part in ndjson_stream(service.iter_entities(chunk_size=CHUNK_SIZE)):
+        written += len(part)
+    return written
+
+
+def _measure(size: int) -> tuple[float, int, int]:
+    service = asyncio.run(_seeded_service(size))
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        written = asyncio.run(_drain_export(service))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, written, peak
+
+
+@pytest.mark.benchmark
+def test_export_memory_is_bounded_by_chunk_size() -> None:
+    """Peak export memory must not grow with the number of entities."""
+    peaks: dict[int, int] = {}
+    for size in STORE_SIZES:
+        elapsed, written, peak = _measure(size)
+        peaks[size] = peak
+        print(
+            f"\n{size:>8} entities: {written / 1e6:.1f} MB in {elapsed:.3f} s, "
+            f"peak {peak / 1024:.0f} KiB"
+        )
+
+    assert peaks[STORE_SIZES[-1]] < peaks[STORE_SIZES[0]] * MAX_PEAK_GROWTH
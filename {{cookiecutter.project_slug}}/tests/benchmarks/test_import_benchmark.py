@@ -0,0 +1,87 @@
+"""
+Benchmark for streaming NDJSON import.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import json
+import time
+import tracemalloc
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+
+import httpx
+import pytest
+
+from app.api.dependencies import get_entity_service
+from app.api.router import app
+from app.domain.models import BatchItemResult
+from app.domain.models import Entity
+from app.repositories.memory_repository import MemoryRepository
+from app.services.entity_service import EntityService
+
+ENTITY_COUNTS = (50_000, 200_000)
+BODY_CHUNK_BYTES = 64 * 1024
+MAX_PEAK_GROWTH = 2.0
+
+
+class _DiscardingRepository(MemoryRepository):
+    """Accepts every entity without storing it, so only the pipeline is measured."""
+
+    async def save_many(self, entities: Sequence[Entity]) -> list[BatchItemResult]:
+        return [BatchItemResult(entity_id=entity.id, entity=entity) for entity in entities]
+
+
+async def _ndjson_body(count: int) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    for i in range(count):
+        buffer += json.dumps({"name": f"Entity {i}", "price": float(i)}).encode() + b"\n"
+        if len(buffer) >= BODY_CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def _import(count: int) -> dict[str, int]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "{{ cookiecutter.api_prefix }}/entities/import",
+            content=_ndjson_body(count),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+    return response.json()
+
+
+def _measure(count: int, trace_memory: bool) -> tuple[float, int]:
+    service = EntityService(repository=_DiscardingRepository())
+    app.dependency_overrides[get_entity_service] = lambda: service
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        summary = asyncio.run(_import(count))
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    finally:
+        tracemalloc.stop()
+        app.dependency_overrides.clear()
+    assert summary["accepted"] == count
+    return elapsed, peak
+
+
+@pytest.mark.benchmark
+def test_import_throughput_and_bounded_memory() -> None:
+    """Import memory must not grow with the upload size; throughput is reported."""
+    peaks: dict[int, int] = {}
+    for count in ENTITY_COUNTS:
+        elapsed, _ = _measure(count, trace_memory=False)
+        _, peaks[count] = _measure(count, trace_memory=True)
+        print(
+            f"\n{count:>8} entities: {count / elapsed:,.0f} entities/s, "
+            f"peak {peaks[count] / 1024:.0f} KiB"
+        )
+
+    assert peaks[ENTITY_COUNTS[-1]] < peaks[ENTITY_COUNTS[0]] * MAX_PEAK_GROWTH
@@ -0,0 +1,61 @@
+"""
+Benchmark for paginated entity listing.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import statistics
+import time
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_entity_service
+from app.api.router import app
+from app.domain.models import Entity
+from app.repositories.memory_repository import MemoryRepository
+from app.services.entity_service import EntityService
+
+STORE_SIZES = (1_000, 10_000, 100_000)
+PAGE_SIZE = 20
+ROUNDS = 50
+MAX_SLOWDOWN = 3.0
+
+
+async def _seed(repository: MemoryRepository, size: int) -> None:
+    for i in range(size):
+        await repository.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+
+
+def _median_page_latency(size: int) -> float:
+    repository = MemoryRepository()
+    asyncio.run(_seed(repository, size))
+    service = EntityService(repository=repository)
+    app.dependency_overrides[get_entity_service] = lambda: service
+    try:
+        client = TestClient(app)
+        url = f"{{ cookiecutter.api_prefix }}/entities?limit={PAGE_SIZE}"
+        timings: list[float] = []
+        for _ in range(ROUNDS):
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append(time.perf_counter() - started)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["count"] == size
+        return statistics.median(timings)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.benchmark
+def test_list_page_latency_is_flat_as_store_grows() -> None:
+    """Page latency must not grow with the number of stored entities."""
+    latencies = {size: _median_page_latency(size) for size in STORE_SIZES}
+    for size, latency in latencies.items():
+        print(f"\n{size:>8} entities: {latency * 1000:.3f} ms per page of {PAGE_SIZE}")
+
+    smallest = latencies[STORE_SIZES[0]]
+    largest = latencies[STORE_SIZES[-1]]
+    assert largest < smallest * MAX_SLOWDOWN
@@ -0,0 +1,126 @@
+"""
+Benchmark for the logging pipeline.
+
+Measures request latency for an endpoint that logs a few lines per request,
+with logging off, with a synchronous StreamHandler (the previous setup), and
+with the queue-based pipeline. Each is run against a fast sink (a file) and a
+slow one that blocks on every write, like a terminal or a full pipe to a log
+collector.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import io
+import logging
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TextIO
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.middleware import RequestIdMiddleware
+from app.core.logging import LOG_FORMAT
+from app.core.logging import setup_logging
+from app.core.logging import shutdown_logging
+
+REQUESTS = 5_000
+CONCURRENCY = 20
+LINES_PER_REQUEST = 5
+SLOW_WRITE_SECONDS = 0.0002
+MAX_SLOW_SINK_P99_RATIO = 0.8
+
+logger = logging.getLogger("app.bench")
+
+
+class _SlowStream(io.StringIO):
+    """Stream whose writes block, releasing the GIL as a real blocking write does."""
+
+    def write(self, s: str) -> int:
+        time.sleep(SLOW_WRITE_SECONDS)
+        return super().write(s)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/work")
+    async def work() -> dict[str, int]:
+        for i in range(LINES_PER_REQUEST):
+            logger.info("step %d of request handling with payload %s", i, {"items": i})
+        return {"ok": 1}
+
+    return app
+
+
+async def _latencies(app: FastAPI) -> list[float]:
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                started = time.perf_counter()
+                await client.get("/work")
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker(REQUESTS // CONCURRENCY) for _ in range(CONCURRENCY)))
+    return latencies
+
+
+def _measure(configure: Callable[[], None]) -> tuple[float, float]:
+    """Return p50 and p99 latency in milliseconds with logging set up by `configure`."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    configure()
+    try:
+        latencies = asyncio.run(_latencies(_app()))
+    finally:
+        shutdown_logging()
+        root.handlers[:] = handlers
+        root.setLevel(level)
+    percentiles = statistics.quantiles(latencies, n=100)
+    return percentiles[49] * 1000, percentiles[98] * 1000
+
+
+def _configurations(stream: TextIO) -> dict[str, Callable[[], None]]:
+    def off() -> None:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    def synchronous() -> None:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logging.getLogger().addHandler(handler)
+        logging.getLogger().setLevel(logging.INFO)
+
+    return {
+        "off": off,
+        "synchronous (text)": synchronous,
+        "queued (text)": lambda: setup_logging(stream=stream),
+        "queued (json)": lambda: setup_logging(log_format="json", stream=stream),
+    }
+
+
+@pytest.mark.benchmark
+def test_request_latency_with_logging(tmp_path: Path) -> None:
+    """Report request p50/p99 with logging off, synchronous, and queued.
+
+    With a slow sink, queueing must keep p99 well below synchronous logging.
+    """
+    print(f"\n{REQUESTS:,} requests, {CONCURRENCY} concurrent, {LINES_PER_REQUEST} lines each:")
+    p99s: dict[tuple[str, str], float] = {}
+    with (tmp_path / "app.log").open("a") as log_file:
+        sinks: dict[str, TextIO] = {"file": log_file, "slow stream": _SlowStream()}
+        for sink, stream in sinks.items():
+            print(f"  {sink}:")
+            for name, configure in _configurations(stream).items():
+                p50, p99s[sink, name] = _measure(configure)
+                print(f"    {name:<20} p50 {p50:6.2f} ms  p99 {p99s[sink, name]:6.2f} ms")
+
+    slow_sync = p99s["slow stream", "synchronous (text)"]
+    assert p99s["slow stream", "queued (text)"] < slow_sync * MAX_SLOW_SINK_P99_RATIO
@@ -0,0 +1,76 @@
+"""
+Benchmark for the metrics middleware.
+
+Calls a minimal ASGI application directly, with and without
+MetricsMiddleware, to measure the cost the middleware adds to each request,
+both with in-process values and with the per-worker files used under the
+multi-worker server.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from app.api.middleware import MetricsMiddleware
+from app.core import metrics
+
+REQUESTS = 200_000
+MAX_OVERHEAD_MICROSECONDS = 5.0
+
+
+class _Route:
+    path = "/entities/{entity_id}"
+
+
+async def _endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message: Message) -> None:
+    pass
+
+
+async def _microseconds_per_request(app: ASGIApp) -> float:
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app({"type": "http", "method": "GET", "path": "/"}, _receive, _send)
+    return (time.perf_counter() - started) / REQUESTS * 1e6
+
+
+@pytest.mark.benchmark
+def test_metrics_middleware_overhead(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Report and bound the time the metrics middleware adds to a request."""
+    registry = metrics.Registry()
+    duration = registry.histogram("bench_seconds", "Benchmark.", ("method", "route", "status"))
+    monkeypatch.setattr("app.api.middleware.REQUEST_DURATION", duration)
+
+    async def run() -> dict[str, float]:
+        bare = await _microseconds_per_request(_endpoint)
+        in_process = await _microseconds_per_request(MetricsMiddleware(_endpoint))
+        registry.use_directory(str(tmp_path))
+        shared = await _microseconds_per_request(MetricsMiddleware(_endpoint))
+        return {"bare": bare, "in process": in_process, "worker files": shared}
+
+    results = asyncio.run(run())
+    print(f"\nper-request time over {REQUESTS:,} direct ASGI calls:")
+    for name, microseconds in results.items():
+        overhead = microseconds - results["bare"]
+        print(f"  {name:<14} {microseconds:6.2f} us  (+{overhead:.2f} us)")
+
+    assert results["in process"] - results["bare"] < MAX_OVERHEAD_MICROSECONDS
+    assert results["worker files"] - results["bare"] < MAX_OVERHEAD_MICROSECONDS
@@ -0,0 +1,84 @@
+"""
+Benchmark for PersistentRepository.
+
+Measures durable write throughput (batched and with concurrent single saves
+sharing group commits) and how long recovery takes from the log alone and
+from a snapshot.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from app.domain.models import Entity
+from app.repositories.memory_repository import MemoryRepository
+from app.repositories.persistent_repository import PersistentRepository
+
+ITEMS = 1_000_000
+BATCH_SIZE = 1_000
+CONCURRENT_SAVES = 10_000
+CONCURRENCY = 100
+MAX_RECOVERY_SECONDS = 60.0
+
+
+def _repository(directory: Path) -> PersistentRepository:
+    return PersistentRepository(MemoryRepository(), str(directory), snapshot_min_records=ITEMS * 2)
+
+
+async def _recover(directory: Path) -> tuple[PersistentRepository, float]:
+    repository = _repository(directory)
+    started = time.perf_counter()
+    await repository.recover()
+    return repository, time.perf_counter() - started
+
+
+@pytest.mark.benchmark
+def test_persistent_write_and_recovery(tmp_path: Path) -> None:
+    """Report fsynced write throughput and recovery time at 1M entities."""
+
+    async def run() -> dict[str, float]:
+        results: dict[str, float] = {}
+        repository = _repository(tmp_path)
+        await repository.recover()
+
+        started = time.perf_counter()
+        for start in range(0, ITEMS, BATCH_SIZE):
+            await repository.save_many(
+                [
+                    Entity(id=str(i), name=f"Entity {i}", price=float(i))
+                    for i in range(start, start + BATCH_SIZE)
+                ]
+            )
+        results["batched"] = ITEMS / (time.perf_counter() - started)
+
+        async def save(offset: int) -> None:
+            for i in range(offset, CONCURRENT_SAVES, CONCURRENCY):
+                await repository.update(Entity(id=str(i), name="Updated", price=1.0))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(save(offset) for offset in range(CONCURRENCY)))
+        results["concurrent"] = CONCURRENT_SAVES / (time.perf_counter() - started)
+        await repository.close()
+
+        repository, results["from_log"] = await _recover(tmp_path)
+        await repository.snapshot()
+        await repository.close()
+
+        repository, results["from_snapshot"] = await _recover(tmp_path)
+        results["count"] = await repository.count()
+        await repository.close()
+        return results
+
+    results = asyncio.run(run())
+    print(f"\nPersistentRepository at {ITEMS:,} entities (fsync on):")
+    print(f"  save_many x{BATCH_SIZE}:            {results['batched']:>10.0f} entities/s")
+    print(f"  update, {CONCURRENCY} concurrent:      {results['concurrent']:>10.0f} ops/s")
+    print(f"  recovery from log:           {results['from_log']:>10.2f} s")
+    print(f"  recovery from snapshot:      {results['from_snapshot']:>10.2f} s")
+
+    assert results["count"] == ITEMS
+    assert results["from_snapshot"] < MAX_RECOVERY_SECONDS
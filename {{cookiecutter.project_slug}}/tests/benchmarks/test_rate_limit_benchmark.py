@@ -0,0 +1,87 @@
+"""
+Benchmark for the rate limit middleware.
+
+Calls a minimal ASGI application directly, with and without
+RateLimitMiddleware, from a few clients and from a stream of distinct clients
+overflowing the tracked-client bound, to measure the cost the middleware adds
+to each request.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import time
+
+import pytest
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from app.api.middleware import RateLimitMiddleware
+
+REQUESTS = 200_000
+MAX_CLIENTS = 10_000
+MAX_OVERHEAD_MICROSECONDS = 5.0
+COSTS = {"GET /entities unpaginated": 10, "POST /entities:batch": 10, "GET /health": 0}
+
+
+async def _endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message: Message) -> None:
+    pass
+
+
+async def _microseconds_per_request(app: ASGIApp, clients: int) -> float:
+    scopes = [
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/entities",
+            "query_string": b"limit=20",
+            "headers": [],
+            "client": (f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", 50000),
+        }
+        for i in range(clients)
+    ]
+    started = time.perf_counter()
+    for i in range(REQUESTS):
+        await app(scopes[i % clients], _receive, _send)
+    return (time.perf_counter() - started) / REQUESTS * 1e6
+
+
+@pytest.mark.benchmark
+def test_rate_limit_middleware_overhead() -> None:
+    """Report and bound the time the rate limiter adds to a request."""
+
+    def limited() -> RateLimitMiddleware:
+        # Generous enough that no request is rejected, so every one reaches the endpoint
+        return RateLimitMiddleware(
+            _endpoint, per_second=1e9, burst=1e9, costs=COSTS, max_clients=MAX_CLIENTS
+        )
+
+    async def run() -> dict[str, float]:
+        return {
+            "bare": await _microseconds_per_request(_endpoint, 10),
+            "10 clients": await _microseconds_per_request(limited(), 10),
+            f"{MAX_CLIENTS * 5:,} clients": await _microseconds_per_request(
+                limited(), MAX_CLIENTS * 5
+            ),
+        }
+
+    results = asyncio.run(run())
+    print(f"\nper-request time over {REQUESTS:,} direct ASGI calls:")
+    for name, microseconds in results.items():
+        overhead = microseconds - results["bare"]
+        print(f"  {name:<15} {microseconds:6.2f} us  (+{overhead:.2f} us)")
+
+    for name, microseconds in results.items():
+        assert microseconds - results["bare"] < MAX_OVERHEAD_MICROSECONDS, name
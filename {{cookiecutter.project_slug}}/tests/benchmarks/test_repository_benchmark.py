@@ -0,0 +1,277 @@
+"""
+Repository operation benchmarks with a regression baseline.
+
+Times every Repository operation on each implementation at several store
+sizes and compares the results with a JSON baseline. The run fails when an
+operation has become slower than its baseline by more than the allowed
+percentage, which catches, for example, a `list_all` or `save` that turned
+linear or quadratic in the store size.
+
+Operations missing from the baseline are added to it, so the first run
+records one. Re-record it after an intended change, or on new hardware, with
+`make bench-baseline`.
+
+Environment variables:
+    BENCH_BASELINE: baseline file (default: tests/benchmarks/baseline.json)
+    BENCH_MAX_REGRESSION_PERCENT: allowed slowdown per operation (default: 25)
+    BENCH_SIZES: comma-separated store sizes (default: 1000,100000,1000000)
+    BENCH_UPDATE_BASELINE: set to 1 to overwrite the baseline with this run
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.domain.models import Entity
+from app.domain.models import EntityQuery
+from app.domain.protocols import Repository
+from app.repositories.columnar_store import ColumnarEntityStore
+from app.repositories.memory_repository import MemoryRepository
+from app.repositories.persistent_repository import PersistentRepository
+from app.repositories.shared_memory_repository import SharedMemoryRepository
+from app.repositories.sqlite_repository import SqliteRepository
+
+BASELINE = Path(os.environ.get("BENCH_BASELINE", Path(__file__).with_name("baseline.json")))
+MAX_REGRESSION_PERCENT = float(os.environ.get("BENCH_MAX_REGRESSION_PERCENT", "25"))
+SIZES = [int(size) for size in os.environ.get("BENCH_SIZES", "1000,100000,1000000").split(",")]
+UPDATE_BASELINE = os.environ.get("BENCH_UPDATE_BASELINE") == "1"
+
+FILL_BATCH = 10_000
+BATCH = 100
+PAGE = 100
+ROUNDS = 5
+# Full scans take seconds on large stores, and noise matters less at that scale
+SLOW_ROUNDS = 2
+ROUND_SECONDS = 0.05
+MAX_CALLS = 1_000
+# Slowdowns smaller than this are timer noise, whatever their percentage
+NOISE_FLOOR_SECONDS = 0.5e-6
+
+# Times `calls` calls of one operation on a store of `size` entities, excluding setup
+Operation = Callable[[Repository, int, int], Awaitable[float]]
+
+
+def _entity(i: int | str, name: str = "Entity") -> Entity:
+    number = i if isinstance(i, int) else len(i)
+    return Entity(
+        id=str(i), name=f"{name} {i}", price=float(number % 1000), in_stock=number % 2 == 0
+    )
+
+
+async def _create(implementation: str, directory: Path, size: int) -> Repository:
+    if implementation == "memory":
+        return MemoryRepository()
+    if implementation == "memory-columnar":
+        return MemoryRepository(store=ColumnarEntityStore())
+    if implementation == "sqlite":
+        return SqliteRepository(str(directory / "bench.db"))
+    if implementation == "shared":
+        return SharedMemoryRepository(str(directory / "bench.shm"), capacity=size + 200_000)
+    persistent = PersistentRepository(MemoryRepository(), str(directory / "wal"), fsync=False)
+    await persistent.recover()
+    return persistent
+
+
+IMPLEMENTATIONS = ["memory", "memory-columnar", "sqlite", "shared", "persistent"]
+
+
+async def _timed(calls: Callable[[], Awaitable[Any]], count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        await calls()
+    return time.perf_counter() - started
+
+
+async def _save(repo: Repository, size: int, calls: int) -> float:
+    entities = [_entity(f"new-{i}") for i in range(calls)]
+    started = time.perf_counter()
+    for entity in entities:
+        await repo.save(entity)
+    elapsed = time.perf_counter() - started
+    await repo.delete_many([entity.id for entity in entities])
+    return elapsed
+
+
+async def _save_many(repo: Repository, size: int, calls: int) -> float:
+    batches = [[_entity(f"new-{c}-{i}") for i in range(BATCH)] for c in range(calls)]
+    started = time.perf_counter()
+    for batch in batches:
+        await repo.save_many(batch)
+    elapsed = time.perf_counter() - started
+    for batch in batches:
+        await repo.delete_many([entity.id for entity in batch])
+    return elapsed
+
+
+async def _get_entity_by_id(repo: Repository, size: int, calls: int) -> float:
+    ids = [str(i * 7919 % size) for i in range(calls)]
+    started = time.perf_counter()
+    for entity_id in ids:
+        await repo.get_entity_by_id(entity_id)
+    return time.perf_counter() - started
+
+
+async def _list_all(repo: Repository, size: int, calls: int) -> float:
+    return await _timed(lambda: repo.list_all(offset=size // 2, limit=PAGE), calls)
+
+
+async def _find(repo: Repository, size: int, calls: int) -> float:
+    query = EntityQuery(in_stock=True, min_price=500.0)
+    return await _timed(lambda: repo.find(query, offset=PAGE, limit=PAGE), calls)
+
+
+async def _list_page(repo: Repository, size: int, calls: int) -> float:
+    cursor = (await repo.list_page(limit=PAGE)).next_cursor
+    return await _timed(lambda: repo.list_page(limit=PAGE, cursor=cursor), calls)
+
+
+async def _count(repo: Repository, size: int, calls: int) -> float:
+    return await _timed(repo.count, calls)
+
+
+async def _count_query(repo: Repository, size: int, calls: int) -> float:
+    query = EntityQuery(in_stock=True, min_price=500.0)
+    return await _timed(lambda: repo.count(query), calls)
+
+
+async def _get_revision(repo: Repository, size: int, calls: int) -> float:
+    return await _timed(repo.get_revision, calls)
+
+
+async def _iter_all(repo: Repository, size: int, calls: int) -> float:
+    async def scan() -> None:
+        async for _ in repo.iter_all(chunk_size=FILL_BATCH):
+            pass
+
+    return await _timed(scan, calls)
+
+
+async def _update(repo: Repository, size: int, calls: int) -> float:
+    entities = [_entity(i * 7919 % size, "Updated") for i in range(calls)]
+    started = time.perf_counter()
+    for entity in entities:
+        await repo.update(entity)
+    return time.perf_counter() - started
+
+
+async def _update_many(repo: Repository, size: int, calls: int) -> float:
+    batches = [
+        [_entity((c * BATCH + i) * 7919 % size, "Updated") for i in range(BATCH)]
+        for c in range(calls)
+    ]
+    started = time.perf_counter()
+    for batch in batches:
+        await repo.update_many(batch)
+    return time.perf_counter() - started
+
+
+async def _delete(repo: Repository, size: int, calls: int) -> float:
+    entities = [_entity(f"old-{i}") for i in range(calls)]
+    await repo.save_many(entities)
+    started = time.perf_counter()
+    for entity in entities:
+        await repo.delete(entity.id)
+    return time.perf_counter() - started
+
+
+async def _delete_many(repo: Repository, size: int, calls: int) -> float:
+    batches = [[_entity(f"old-{c}-{i}") for i in range(BATCH)] for c in range(calls)]
+    for batch in batches:
+        await repo.save_many(batch)
+    started = time.perf_counter()
+    for batch in batches:
+        await repo.delete_many([entity.id for entity in batch])
+    return time.perf_counter() - started
+
+
+OPERATIONS: dict[str, Operation] = {
+    "save": _save,
+    "save_many": _save_many,
+    "get_entity_by_id": _get_entity_by_id,
+    "list_all": _list_all,
+    "find": _find,
+    "list_page": _list_page,
+    "count": _count,
+    "count_query": _count_query,
+    "get_revision": _get_revision,
+    "iter_all": _iter_all,
+    "update": _update,
+    "update_many": _update_many,
+    "delete": _delete,
+    "delete_many": _delete_many,
+}
+
+
+async def _seconds_per_call(operation: Operation, repo: Repository, size: int) -> float:
+    """Return the best time per call over several rounds of about ROUND_SECONDS each."""
+    warmup = await operation(repo, size, 1)
+    if warmup >= ROUND_SECONDS:
+        return min([await operation(repo, size, 1) for _ in range(SLOW_ROUNDS)])
+    calls = min(MAX_CALLS, int(ROUND_SECONDS / max(warmup, 1e-9)))
+    return min([await operation(repo, size, calls) / calls for _ in range(ROUNDS)])
+
+
+async def _measure(implementation: str, directory: Path) -> dict[str, float]:
+    results: dict[str, float] = {}
+    for size in SIZES:
+        repo = await _create(implementation, directory / str(size), size)
+        try:
+            started = time.perf_counter()
+            for start in range(0, size, FILL_BATCH):
+                batch = range(start, min(size, start + FILL_BATCH))
+                await repo.save_many([_entity(i) for i in batch])
+            results[f"{implementation}/{size}/fill"] = (time.perf_counter() - started) / size
+            for name, operation in OPERATIONS.items():
+                results[f"{implementation}/{size}/{name}"] = await _seconds_per_call(
+                    operation, repo, size
+                )
+        finally:
+            close = getattr(repo, "close", None)
+            if close is not None:
+                await close()
+    return results
+
+
+def _compare(results: dict[str, float]) -> list[str]:
+    """Update the baseline as configured and return the operations that regressed."""
+    baseline: dict[str, float] = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    regressions: list[str] = []
+    for key, seconds in results.items():
+        previous = baseline.get(key)
+        change = f"{(seconds / previous - 1) * 100:+7.1f}%" if previous else "    new"
+        print(f"  {key:<40} {seconds * 1e6:>12.2f} us/call  {change}")
+        if (
+            previous is not None
+            and not UPDATE_BASELINE
+            and seconds > previous * (1 + MAX_REGRESSION_PERCENT / 100)
+            and seconds - previous > NOISE_FLOOR_SECONDS
+        ):
+            regressions.append(f"{key}: {previous * 1e6:.2f} -> {seconds * 1e6:.2f} us/call")
+    recorded = {
+        key: value for key, value in results.items() if UPDATE_BASELINE or key not in baseline
+    }
+    if recorded:
+        BASELINE.write_text(json.dumps(baseline | recorded, indent=2, sort_keys=True) + "\n")
+    return regressions
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("implementation", IMPLEMENTATIONS)
+def test_repository_operations_against_baseline(implementation: str, tmp_path: Path) -> None:
+    """Fail if any operation is slower than the baseline beyond the allowed percentage."""
+    for size in SIZES:
+        (tmp_path / str(size)).mkdir()
+    results = asyncio.run(_measure(implementation, tmp_path))
+    print(f"\n{implementation} (regression threshold {MAX_REGRESSION_PERCENT:g}%):")
+    regressions = _compare(results)
+
+    assert not regressions, "Operations slower than the baseline:\n" + "\n".join(regressions)
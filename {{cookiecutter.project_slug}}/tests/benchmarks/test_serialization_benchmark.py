@@ -0,0 +1,85 @@
+"""
+Benchmark for the list response serialization path.
+
+Compares GET /entities returning 1,000 entities against the previous path, which
+copied each entity into an EntitySchema, let FastAPI re-validate the response
+model and encoded it with the stdlib json module.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+import httpx
+import pytest
+from fastapi import Depends
+from fastapi import FastAPI
+from fastapi import status
+
+from app.api.dependencies import get_entity_service
+from app.api.router import app
+from app.domain.models import Entity
+from app.repositories.memory_repository import MemoryRepository
+from app.schemas.entity import EntitiesListResponse
+from app.schemas.entity import EntitySchema
+from app.services.entity_service import EntityService
+
+ITEMS = 1_000
+REQUESTS = 300
+MIN_SPEEDUP = 1.3
+
+legacy_app = FastAPI()
+
+
+@legacy_app.get("/entities", response_model=EntitiesListResponse)
+async def legacy_list_entities(
+    limit: int, service: EntityService = Depends(get_entity_service)
+) -> EntitiesListResponse:
+    """The list endpoint as it was before the fast serialization path."""
+    entities = await service.get_entities(limit=limit)
+    count = await service.count_entities()
+    return EntitiesListResponse(
+        entities=[EntitySchema.from_domain(e) for e in entities], count=count
+    )
+
+
+async def _requests_per_second(target: FastAPI, url: str) -> tuple[float, Any]:
+    """Return requests/s for `url` and the JSON body it serves."""
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        first = await client.get(url)
+        assert first.status_code == status.HTTP_200_OK
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            await client.get(url)
+        return REQUESTS / (time.perf_counter() - started), first.json()
+
+
+@pytest.mark.benchmark
+def test_list_serialization_beats_revalidating_path() -> None:
+    """Serving 1,000 entities must be clearly faster than the revalidating path."""
+
+    async def run() -> tuple[tuple[float, Any], tuple[float, Any]]:
+        repository = MemoryRepository()
+        for i in range(ITEMS):
+            await repository.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+        service = EntityService(repository=repository)
+        app.dependency_overrides[get_entity_service] = lambda: service
+        legacy_app.dependency_overrides[get_entity_service] = lambda: service
+        try:
+            before = await _requests_per_second(legacy_app, f"/entities?limit={ITEMS}")
+            after = await _requests_per_second(app, f"{{ cookiecutter.api_prefix }}/entities?limit={ITEMS}")
+            return before, after
+        finally:
+            app.dependency_overrides.clear()
+            legacy_app.dependency_overrides.clear()
+
+    (before, legacy_body), (after, fast_body) = asyncio.run(run())
+    print(f"\nbefore: {before:>8.0f} req/s for {ITEMS} entities")
+    print(f"after:  {after:>8.0f} req/s for {ITEMS} entities ({after / before:.2f}x)")
+
+    assert len(fast_body["entities"]) == ITEMS
+    assert fast_body["entities"] == legacy_body["entities"]
+    assert after > before * MIN_SPEEDUP
@@ -0,0 +1,132 @@
+"""
+Benchmark for SharedMemoryRepository.
+
+Compares lookup throughput with the per-process MemoryRepository, and measures
+how aggregate read throughput scales when several processes read the same
+store while another process keeps writing to it.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.domain.models import Entity
+from app.domain.protocols import Repository
+from app.repositories.memory_repository import MemoryRepository
+from app.repositories.shared_memory_repository import SharedMemoryRepository
+
+ITEMS = 100_000
+LOOKUPS = 100_000
+SCALING_LOOKUPS = 50_000
+MAX_READERS = 4
+MIN_SCALING = 1.5
+
+
+def _cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+async def _fill(repository: Repository) -> None:
+    for i in range(ITEMS):
+        await repository.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+
+
+async def _lookups_per_second(repository: Repository, count: int) -> float:
+    started = time.perf_counter()
+    for i in range(count):
+        await repository.get_entity_by_id(str(i * 7 % ITEMS))
+    return count / (time.perf_counter() - started)
+
+
+def _reader(path: str, results: "multiprocessing.Queue[float]") -> None:
+    async def run() -> float:
+        repository = SharedMemoryRepository(path)
+        try:
+            return await _lookups_per_second(repository, SCALING_LOOKUPS)
+        finally:
+            await repository.close()
+
+    results.put(asyncio.run(run()))
+
+
+def _writer(path: str) -> None:
+    async def run() -> None:
+        repository = SharedMemoryRepository(path)
+        i = 0
+        while True:
+            await repository.update(Entity(id=str(i % ITEMS), name="Updated", price=1.0))
+            i += 1
+
+    asyncio.run(run())
+
+
+def _aggregate_reads(path: str, readers: int) -> float:
+    """Return total lookups/s of `readers` processes while a writer runs."""
+    context = multiprocessing.get_context("fork")
+    results: multiprocessing.Queue[float] = context.Queue()
+    writer = context.Process(target=_writer, args=(path,), daemon=True)
+    writer.start()
+    processes = [context.Process(target=_reader, args=(path, results)) for _ in range(readers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    writer.terminate()
+    writer.join()
+    return sum(results.get() for _ in range(readers))
+
+
+@pytest.mark.benchmark
+def test_shared_lookup_throughput(tmp_path: Path) -> None:
+    """Report lookups/s against the per-process MemoryRepository."""
+
+    async def run() -> tuple[float, float]:
+        memory = MemoryRepository()
+        shared = SharedMemoryRepository(str(tmp_path / "bench.shm"), capacity=ITEMS)
+        await _fill(memory)
+        await _fill(shared)
+        try:
+            return (
+                await _lookups_per_second(memory, LOOKUPS),
+                await _lookups_per_second(shared, LOOKUPS),
+            )
+        finally:
+            await shared.close()
+
+    memory_rate, shared_rate = asyncio.run(run())
+    print(f"\nget_entity_by_id at {ITEMS:,} entities:")
+    print(f"  memory (per process): {memory_rate:>10.0f} ops/s")
+    print(f"  shared (all workers): {shared_rate:>10.0f} ops/s ({shared_rate / memory_rate:.2f}x)")
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork start method"
+)
+def test_shared_reads_scale_across_processes(tmp_path: Path) -> None:
+    """Aggregate read throughput must grow with reader processes, under writes."""
+    path = str(tmp_path / "bench.shm")
+
+    async def fill() -> None:
+        repository = SharedMemoryRepository(path, capacity=ITEMS)
+        await _fill(repository)
+        await repository.close()
+
+    asyncio.run(fill())
+    readers = max(1, min(MAX_READERS, _cores() - 1))
+    single = _aggregate_reads(path, 1)
+    parallel = _aggregate_reads(path, readers)
+    print(f"\nlookups/s with a concurrent writer ({_cores()} cores):")
+    print(f"  1 reader:  {single:>10.0f}")
+    print(f"  {readers} readers: {parallel:>10.0f} ({parallel / single:.2f}x)")
+
+    if readers >= 2:
+        assert parallel > single * MIN_SCALING
@@ -0,0 +1,69 @@
+"""
+Benchmark for the SQLite repository.
+
+Run with `make bench`. Benchmarks are excluded from the default test run.
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from app.domain.models import Entity
+from app.domain.protocols import Repository
+from app.repositories.memory_repository import MemoryRepository
+from app.repositories.sqlite_repository import SqliteRepository
+
+WRITES = 2_000
+READS = 5_000
+CONCURRENCY = 100
+MIN_GROUP_COMMIT_SPEEDUP = 2.0
+
+
+async def _write_throughput(repository: Repository, concurrency: int) -> float:
+    """Save WRITES entities with `concurrency` requests in flight; return writes/s."""
+    entities = [Entity(id=str(i), name=f"Entity {i}", price=float(i)) for i in range(WRITES)]
+    started = time.perf_counter()
+    for start in range(0, WRITES, concurrency):
+        await asyncio.gather(*(repository.save(e) for e in entities[start : start + concurrency]))
+    return WRITES / (time.perf_counter() - started)
+
+
+async def _read_throughput(repository: Repository) -> float:
+    """Fetch READS entities by ID, CONCURRENCY at a time; return reads/s."""
+    started = time.perf_counter()
+    for start in range(0, READS, CONCURRENCY):
+        ids = (str(i % WRITES) for i in range(start, start + CONCURRENCY))
+        entities = await asyncio.gather(*(repository.get_entity_by_id(i) for i in ids))
+        assert all(entity is not None for entity in entities)
+    return READS / (time.perf_counter() - started)
+
+
+@pytest.mark.benchmark
+def test_concurrent_writes_are_group_committed(tmp_path: Path) -> None:
+    """Concurrent writes must share commits and beat one-commit-per-write throughput."""
+
+    async def run() -> tuple[float, float, float, float, float]:
+        serial_repository = SqliteRepository(str(tmp_path / "serial.db"))
+        serial = await _write_throughput(serial_repository, concurrency=1)
+        await serial_repository.close()
+
+        repository = SqliteRepository(str(tmp_path / "grouped.db"))
+        grouped = await _write_throughput(repository, concurrency=CONCURRENCY)
+        reads = await _read_throughput(repository)
+        await repository.close()
+
+        memory = MemoryRepository()
+        memory_writes = await _write_throughput(memory, concurrency=CONCURRENCY)
+        memory_reads = await _read_throughput(memory)
+        return serial, grouped, reads, memory_writes, memory_reads
+
+    serial, grouped, reads, memory_writes, memory_reads = asyncio.run(run())
+    print(f"\nsqlite writes, 1 in flight:   {serial:>10.0f}/s")
+    print(f"sqlite writes, {CONCURRENCY} in flight: {grouped:>10.0f}/s")
+    print(f"sqlite reads,  {CONCURRENCY} in flight: {reads:>10.0f}/s")
+    print(f"memory writes, {CONCURRENCY} in flight: {memory_writes:>10.0f}/s")
+    print(f"memory reads,  {CONCURRENCY} in flight: {memory_reads:>10.0f}/s")
+
+    assert grouped > serial * MIN_GROUP_COMMIT_SPEEDUP
@@ -6,6 +6,8 @@ To create integration test fixtures:
 2. Use them in your integration tests
 """
 
+from collections.abc import Iterator
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -30,9 +32,10 @@ def reset_container_before_test() -> None:
 
 
 @pytest.fixture
-def client() -> TestClient:
-    """Create a test client for integration tests."""
-    return TestClient(app)
+def client() -> Iterator[TestClient]:
+    """Create a test client for integration tests, running the application lifespan."""
+    with TestClient(app) as client:
+        yield client
 
 
 @pytest.fixture
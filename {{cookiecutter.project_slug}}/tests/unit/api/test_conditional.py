@@ -0,0 +1,47 @@
+"""Conditional request helper tests."""
+
+from fastapi import status
+
+from app.api.conditional import make_etag
+from app.api.conditional import matching_etags
+from app.api.conditional import none_match
+from app.api.conditional import not_modified
+from app.api.conditional import parse_etag
+
+
+def test_make_etag_quotes_value() -> None:
+    """Test entity tags are formatted as strong, quoted tags."""
+    assert make_etag(3) == '"3"'
+    assert make_etag("r7") == '"r7"'
+
+
+def test_parse_etag_reads_back_integer_tags() -> None:
+    """Test only strong, quoted integer tags parse back into a version."""
+    assert parse_etag(make_etag(3)) == 3
+    assert parse_etag('"abc"') is None
+    assert parse_etag('W/"3"') is None
+    assert parse_etag("3") is None
+    assert parse_etag('"-1"') is None
+
+
+def test_none_match_uses_weak_comparison() -> None:
+    """Test If-None-Match matches listed, weak and wildcard tags."""
+    assert none_match('"1", "2"', '"2"')
+    assert none_match('W/"2"', '"2"')
+    assert none_match("*", '"2"')
+    assert not none_match('"1"', '"2"')
+    assert not none_match(None, '"2"')
+
+
+def test_matching_etags_drops_weak_tags() -> None:
+    """Test If-Match only accepts strong tags, and `*` accepts anything."""
+    assert matching_etags('"1", W/"2"') == {'"1"'}
+    assert matching_etags("*") is None
+
+
+def test_not_modified_has_no_body() -> None:
+    """Test the 304 response is empty and carries the ETag."""
+    response = not_modified('"1"')
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.body == b""
+    assert response.headers["ETag"] == '"1"'
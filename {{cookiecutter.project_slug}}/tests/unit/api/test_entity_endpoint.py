@@ -8,15 +8,23 @@ To create endpoint tests:
 4. Seed test data via HTTP API to avoid async/sync issues
 """
 
+import json
+import pstats
+from pathlib import Path
 from uuid import uuid4
 
 import pytest
+from fastapi import FastAPI
 from fastapi import status
 from fastapi.testclient import TestClient
 
 from app.api.dependencies import get_entity_service
+from app.api.middleware import ProfilingMiddleware
 from app.api.router import app
+from app.api.v1.endpoints import entities
 from app.repositories.memory_repository import MemoryRepository
+from app.schemas.entity import EntitiesListResponse
+from app.schemas.entity import EntitySchema
 from app.services.entity_service import EntityService
 
 
@@ -138,6 +146,183 @@ def test_list_entities_with_pagination(client) -> None:
     assert data["count"] == 5
 
 
+def test_list_entities_with_cursor_pagination(client) -> None:
+    """Test walking all entities by following next_cursor."""
+    for i in range(5):
+        client.post("{{ cookiecutter.api_prefix }}/entities", json={"name": f"Entity {i}", "price": float(i)})
+
+    response = client.get("{{ cookiecutter.api_prefix }}/entities?limit=2")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    names = [e["name"] for e in data["entities"]]
+    assert data["count"] == 5
+
+    while data["next_cursor"] is not None:
+        response = client.get(
+            "{{ cookiecutter.api_prefix }}/entities",
+            params={"limit": 2, "cursor": data["next_cursor"]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        names.extend(e["name"] for e in data["entities"])
+
+    assert names == [f"Entity {i}" for i in range(5)]
+
+
+def test_list_entities_offset_pagination_has_no_cursor(client) -> None:
+    """Test that offset pages do not return a cursor."""
+    for i in range(3):
+        client.post("{{ cookiecutter.api_prefix }}/entities", json={"name": f"Entity {i}", "price": 1.0})
+
+    response = client.get("{{ cookiecutter.api_prefix }}/entities?offset=1&limit=1")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["next_cursor"] is None
+
+
+def test_list_entities_invalid_cursor(client) -> None:
+    """Test that a malformed cursor returns 400."""
+    response = client.get("{{ cookiecutter.api_prefix }}/entities?limit=2&cursor=bogus")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    etag = client.get("{{ cookiecutter.api_prefix }}/entities").headers["ETag"]
+    response = client.get(
+        "{{ cookiecutter.api_prefix }}/entities?limit=2&cursor=bogus", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_entities_cursor_with_offset(client) -> None:
+    """Test that combining cursor and offset returns 400."""
+    response = client.get("{{ cookiecutter.api_prefix }}/entities?limit=2&offset=1&cursor=abc")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_entities_with_filters(client) -> None:
+    """Test filtering entities by stock, price range and name prefix."""
+    catalog = [
+        {"name": "Widget", "price": 5.0, "in_stock": True},
+        {"name": "Widget XL", "price": 15.0, "in_stock": False},
+        {"name": "Gadget", "price": 8.0, "in_stock": True},
+    ]
+    for item in catalog:
+        client.post("{{ cookiecutter.api_prefix }}/entities", json=item)
+
+    response = client.get(
+        "{{ cookiecutter.api_prefix }}/entities",
+        params={"in_stock": "true", "min_price": 4, "max_price": 10},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert sorted(e["name"] for e in data["entities"]) == ["Gadget", "Widget"]
+    assert data["count"] == 2
+
+    response = client.get("{{ cookiecutter.api_prefix }}/entities?name_prefix=Widget&limit=1")
+    data = response.json()
+    assert [e["name"] for e in data["entities"]] == ["Widget"]
+    assert data["count"] == 2
+    assert data["next_cursor"] is not None
+
+
+def test_list_entities_by_ids(client) -> None:
+    """Test fetching a set of entities by ID in one request."""
+    created = [
+        client.post(
+            "{{ cookiecutter.api_prefix }}/entities", json={"name": f"E{i}", "price": 1.0}
+        ).json()
+        for i in range(3)
+    ]
+    ids = f"{created[2]['id']}, missing,{created[0]['id']},"
+    response = client.get("{{ cookiecutter.api_prefix }}/entities", params={"ids": ids})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["entities"] == [created[2], created[0]]
+    assert data["count"] == 2
+    assert data["next_cursor"] is None
+
+
+def test_list_entities_by_ids_rejects_filters_and_empty_lists(client) -> None:
+    """Test ids cannot be combined with filters or pagination and must list an ID."""
+    for params in ({"ids": "a", "limit": 1}, {"ids": "a", "in_stock": "true"}, {"ids": " , "}):
+        response = client.get("{{ cookiecutter.api_prefix }}/entities", params=params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_entities_with_invalid_price_range(client) -> None:
+    """Test that min_price greater than max_price returns 400."""
+    response = client.get("{{ cookiecutter.api_prefix }}/entities?min_price=10&max_price=5")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_export_entities_ndjson(client) -> None:
+    """Test exporting all entities as newline-delimited JSON."""
+    for i in range(3):
+        client.post("{{ cookiecutter.api_prefix }}/entities", json={"name": f"Entity {i}", "price": float(i)})
+
+    response = client.get("{{ cookiecutter.api_prefix }}/entities/export")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == ["Entity 0", "Entity 1", "Entity 2"]
+    assert set(rows[0]) >= {"id", "name", "price", "in_stock"}
+
+
+def test_export_entities_json_array(client) -> None:
+    """Test exporting all entities as a streamed JSON array."""
+    client.post("{{ cookiecutter.api_prefix }}/entities", json={"name": "Entity", "price": 1.0})
+
+    response = client.get("{{ cookiecutter.api_prefix }}/entities/export?format=json")
+    assert response.status_code == status.HTTP_200_OK
+    assert [row["name"] for row in response.json()] == ["Entity"]
+
+
+def test_export_entities_empty(client) -> None:
+    """Test exporting an empty store."""
+    response = client.get("{{ cookiecutter.api_prefix }}/entities/export?format=json")
+    assert response.json() == []
+
+
+def test_import_entities_ndjson(client) -> None:
+    """Test importing entities from NDJSON with rejected lines reported."""
+    body = "\n".join(
+        [
+            json.dumps({"id": "restored-1", "name": "Entity 1", "price": 1.0}),
+            json.dumps({"name": "Entity 2", "price": 2.0, "in_stock": False}),
+            "not json",
+            json.dumps({"name": "Entity 3", "price": -3.0}),
+            "",
+            json.dumps({"price": 4.0}),
+        ]
+    )
+    response = client.post(
+        "{{ cookiecutter.api_prefix }}/entities/import",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["accepted"] == 2
+    assert data["rejected"] == 3
+    assert [e["line"] for e in data["errors"]] == [3, 4, 6]
+    assert data["errors"][1]["error"] == "Entity price cannot be negative"
+    assert data["errors"][2]["error"].startswith("name:")
+
+    restored = client.get("{{ cookiecutter.api_prefix }}/entities/restored-1")
+    assert restored.status_code == status.HTTP_200_OK
+    assert client.get("{{ cookiecutter.api_prefix }}/entities").json()["count"] == 2
+
+
+def test_import_then_export_round_trip(client) -> None:
+    """Test that an export can be imported back unchanged."""
+    for i in range(3):
+        client.post("{{ cookiecutter.api_prefix }}/entities", json={"name": f"Entity {i}", "price": float(i)})
+    exported = client.get("{{ cookiecutter.api_prefix }}/entities/export").text
+
+    response = client.post("{{ cookiecutter.api_prefix }}/entities/import", content=exported)
+    assert response.json() == {"accepted": 3, "rejected": 0, "errors": []}
+    assert client.get("{{ cookiecutter.api_prefix }}/entities").json()["count"] == 3
+
+
 def test_update_entity(client) -> None:
     """Test updating an entity."""
     # Create entity
@@ -192,6 +377,129 @@ def test_update_entity_not_found(client) -> None:
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+def test_get_entity_returns_etag_and_honors_if_none_match(client) -> None:
+    """Test a matching If-None-Match gets an empty 304 until the entity changes."""
+    create_response = client.post(
+        "{{ cookiecutter.api_prefix }}/entities", json={"name": "Entity", "price": 10.0}
+    )
+    entity_id = create_response.json()["id"]
+    url = f"{{ cookiecutter.api_prefix }}/entities/{entity_id}"
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    assert etag == create_response.headers["ETag"]
+    assert etag == f'"{response.json()["version"]}"'
+
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    client.put(url, json={"price": 11.0})
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == status.HTTP_200_OK
+    assert changed.headers["ETag"] != etag
+
+
+def test_list_entities_etag_tracks_store_revision(client) -> None:
+    """Test list pages get 304 until any entity is written."""
+    url = "{{ cookiecutter.api_prefix }}/entities"
+    client.post(url, json={"name": "Entity", "price": 10.0})
+    etag = client.get(url).headers["ETag"]
+
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+
+    client.post(url, json={"name": "Another", "price": 5.0})
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == status.HTTP_200_OK
+    assert changed.json()["count"] == 2
+
+
+def test_update_entity_with_if_match(client) -> None:
+    """Test If-Match applies the update only against the current ETag."""
+    create_response = client.post(
+        "{{ cookiecutter.api_prefix }}/entities", json={"name": "Entity", "price": 10.0}
+    )
+    url = f"{{ cookiecutter.api_prefix }}/entities/{create_response.json()['id']}"
+    etag = create_response.headers["ETag"]
+
+    updated = client.put(url, json={"price": 12.0}, headers={"If-Match": etag})
+    assert updated.status_code == status.HTTP_200_OK
+    assert updated.headers["ETag"] != etag
+
+    stale = client.put(url, json={"price": 99.0}, headers={"If-Match": etag})
+    assert stale.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert stale.headers["ETag"] == updated.headers["ETag"]
+    assert client.get(url).json()["price"] == 12.0
+
+    wildcard = client.put(url, json={"price": 13.0}, headers={"If-Match": "*"})
+    assert wildcard.status_code == status.HTTP_200_OK
+
+
+def test_patch_entity(client) -> None:
+    """Test PATCH changes only the given fields and rejects empty or invalid patches."""
+    create_response = client.post(
+        "{{ cookiecutter.api_prefix }}/entities",
+        json={"name": "Entity", "price": 10.0, "in_stock": True},
+    )
+    url = f"{{ cookiecutter.api_prefix }}/entities/{create_response.json()['id']}"
+
+    response = client.patch(url, json={"in_stock": False})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["name"], data["price"], data["in_stock"]) == ("Entity", 10.0, False)
+    assert response.headers["ETag"] == f'"{data["version"]}"'
+    assert client.patch(url, json={}).status_code == status.HTTP_400_BAD_REQUEST
+    assert client.patch(url, json={"price": -1.0}).status_code == status.HTTP_400_BAD_REQUEST
+    missing = client.patch(f"{{ cookiecutter.api_prefix }}/entities/{uuid4()}", json={"price": 1})
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_patch_entity_with_expected_version(client) -> None:
+    """Test a stale expected_version gets 409 and a stale If-Match 412, without writing."""
+    create_response = client.post(
+        "{{ cookiecutter.api_prefix }}/entities", json={"name": "Entity", "price": 10.0}
+    )
+    url = f"{{ cookiecutter.api_prefix }}/entities/{create_response.json()['id']}"
+    version = create_response.json()["version"]
+
+    first = client.patch(url, json={"price": 11.0, "expected_version": version})
+    assert first.status_code == status.HTTP_200_OK
+
+    conflict = client.patch(url, json={"price": 12.0, "expected_version": version})
+    assert conflict.status_code == status.HTTP_409_CONFLICT
+    assert conflict.json()["version"] == first.json()["version"]
+    assert conflict.headers["ETag"] == first.headers["ETag"]
+
+    stale = client.patch(url, json={"price": 12.0}, headers={"If-Match": f'"{version}"'})
+    assert stale.status_code == status.HTTP_412_PRECONDITION_FAILED
+    unknown = client.patch(url, json={"price": 12.0}, headers={"If-Match": '"abc"'})
+    assert unknown.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert unknown.headers["ETag"] == first.headers["ETag"]
+    wildcard = client.patch(
+        url, json={"price": 12.0, "expected_version": version}, headers={"If-Match": "*"}
+    )
+    assert wildcard.status_code == status.HTTP_409_CONFLICT
+    assert wildcard.headers["ETag"] == first.headers["ETag"]
+    current = client.patch(url, json={"price": 13.0}, headers={"If-Match": first.headers["ETag"]})
+    assert current.status_code == status.HTTP_200_OK
+    assert client.get(url).json()["price"] == 13.0
+
+
+def test_entity_responses_match_response_models(client) -> None:
+    """Test directly encoded responses validate against the documented schemas."""
+    url = "{{ cookiecutter.api_prefix }}/entities"
+    created = client.post(url, json={"name": "Entity", "price": 10.0, "in_stock": False})
+    assert EntitySchema.model_validate_json(created.content).name == "Entity"
+
+    listed = EntitiesListResponse.model_validate_json(client.get(f"{url}?limit=1").content)
+    assert listed.count == 1
+    assert listed.entities[0] == EntitySchema.model_validate_json(created.content)
+    assert listed.next_cursor is None
+
+
 def test_delete_entity(client) -> None:
     """Test deleting an entity."""
     # Create entity
@@ -215,3 +523,100 @@ def test_delete_entity_not_found(client) -> None:
     response = client.delete(f"{{ cookiecutter.api_prefix }}/entities/{uuid4()}")
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
+
+def test_create_entities_batch(client) -> None:
+    """Test creating entities in bulk with one invalid item."""
+    response = client.post(
+        "{{ cookiecutter.api_prefix }}/entities:batch",
+        json={
+            "items": [
+                {"name": "Entity 1", "price": 10.0},
+                {"name": "Entity 2", "price": -1.0},
+                {"name": "Entity 3", "price": 30.0},
+            ]
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["succeeded"] == 2
+    assert data["failed"] == 1
+    assert [r["status"] for r in data["results"]] == [201, 400, 201]
+    assert data["results"][1]["error"] == "Entity price cannot be negative"
+    assert data["results"][2]["entity"]["name"] == "Entity 3"
+
+    list_response = client.get("{{ cookiecutter.api_prefix }}/entities")
+    assert list_response.json()["count"] == 2
+
+
+def test_update_entities_batch(client) -> None:
+    """Test replacing entities in bulk with one missing item."""
+    create_response = client.post(
+        "{{ cookiecutter.api_prefix }}/entities:batch",
+        json={"items": [{"name": "Entity 1", "price": 10.0}]},
+    )
+    entity_id = create_response.json()["results"][0]["id"]
+
+    response = client.put(
+        "{{ cookiecutter.api_prefix }}/entities:batch",
+        json={
+            "items": [
+                {"id": str(uuid4()), "name": "Ghost", "price": 1.0},
+                {"id": entity_id, "name": "Renamed", "price": 12.0, "in_stock": False},
+            ]
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [r["status"] for r in data["results"]] == [404, 200]
+
+    get_response = client.get(f"{{ cookiecutter.api_prefix }}/entities/{entity_id}")
+    assert get_response.json()["name"] == "Renamed"
+    assert get_response.json()["in_stock"] is False
+
+
+def test_delete_entities_batch(client) -> None:
+    """Test deleting entities in bulk with one missing ID."""
+    create_response = client.post(
+        "{{ cookiecutter.api_prefix }}/entities:batch",
+        json={"items": [{"name": "Entity 1", "price": 1.0}, {"name": "Entity 2", "price": 2.0}]},
+    )
+    ids = [r["id"] for r in create_response.json()["results"]]
+
+    response = client.request(
+        "DELETE",
+        "{{ cookiecutter.api_prefix }}/entities:batch",
+        json={"ids": [ids[0], "missing", ids[1]]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [r["status"] for r in data["results"]] == [204, 404, 204]
+    assert data["succeeded"] == 2
+
+    list_response = client.get("{{ cookiecutter.api_prefix }}/entities")
+    assert list_response.json()["count"] == 0
+
+
+def test_create_entities_batch_rejects_empty_batch(client) -> None:
+    """Test that an empty batch is rejected by request validation."""
+    response = client.post("{{ cookiecutter.api_prefix }}/entities:batch", json={"items": []})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_profile_covers_endpoint_service_and_repository(
+    entity_service: EntityService, tmp_path: Path
+) -> None:
+    """Test a profiled request records the endpoint, service and repository calls."""
+    profiled = FastAPI()
+    profiled.include_router(entities.router, prefix="{{ cookiecutter.api_prefix }}")
+    profiled.dependency_overrides[get_entity_service] = lambda: entity_service
+    profiled.add_middleware(ProfilingMiddleware, directory=str(tmp_path))
+    client = TestClient(profiled)
+    created = client.post("{{ cookiecutter.api_prefix }}/entities", json={"name": "A", "price": 1.0})
+
+    response = client.get(
+        f"{{ cookiecutter.api_prefix }}/entities/{created.json()['id']}", headers={"X-Profile": "1"}
+    )
+
+    stats = pstats.Stats(str(tmp_path / response.headers["X-Profile-File"])).stats
+    files = {Path(filename).name for filename, _, _ in stats}
+    assert {"entities.py", "entity_service.py", "memory_repository.py"} <= files
@@ -0,0 +1,51 @@
+"""Profiling middleware tests."""
+
+import pstats
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware import ProfilingMiddleware
+from app.api.middleware import RequestIdMiddleware
+
+
+def _expensive_step() -> int:
+    return sum(range(1_000))
+
+
+def _client(directory: Path, token: str | None = None) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/work/{item}")
+    async def work(item: str) -> dict[str, int]:
+        return {"total": _expensive_step()}
+
+    app.add_middleware(ProfilingMiddleware, directory=str(directory), token=token)
+    app.add_middleware(RequestIdMiddleware)
+    return TestClient(app)
+
+
+def test_requests_are_only_profiled_when_asked(tmp_path: Path) -> None:
+    """Test a profile is written for requests asking by header or query parameter."""
+    client = _client(tmp_path)
+    assert "X-Profile-File" not in client.get("/work/1").headers
+    assert not tmp_path.exists() or not any(tmp_path.iterdir())
+
+    by_header = client.get("/work/1", headers={"X-Profile": "1", "X-Request-ID": "req-1"})
+    by_query = client.get("/work/2?profile=yes")
+
+    assert by_header.json() == {"total": 499500}
+    name = by_header.headers["X-Profile-File"]
+    assert name.endswith("-GET-work_1-req-1.prof")
+    assert by_query.headers["X-Profile-File"] != name
+    assert len(list(tmp_path.iterdir())) == 2
+    functions = {function for _, _, function in pstats.Stats(str(tmp_path / name)).stats}
+    assert "_expensive_step" in functions
+
+
+def test_token_is_required_when_configured(tmp_path: Path) -> None:
+    """Test only the configured token triggers profiling."""
+    client = _client(tmp_path, token="s3cret")
+    assert "X-Profile-File" not in client.get("/work/1", headers={"X-Profile": "1"}).headers
+    assert "X-Profile-File" in client.get("/work/1?profile=s3cret").headers
@@ -0,0 +1,92 @@
+"""Rate limit middleware tests."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware import RateLimitMiddleware
+
+
+def _client(
+    now: list[float],
+    burst: float = 3.0,
+    costs: dict[str, float] | None = None,
+    key_header: str | None = None,
+    max_clients: int = 10_000,
+) -> tuple[TestClient, RateLimitMiddleware]:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items() -> list[int]:
+        return []
+
+    @app.post("/items:batch")
+    async def batch() -> dict[str, int]:
+        return {"count": 0}
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "healthy"}
+
+    limiter = RateLimitMiddleware(
+        app,
+        per_second=1.0,
+        burst=burst,
+        costs=costs,
+        key_header=key_header,
+        max_clients=max_clients,
+        clock=lambda: now[0],
+    )
+    return TestClient(limiter), limiter
+
+
+def test_requests_over_the_burst_get_429_until_refilled() -> None:
+    """Test a client is rejected with Retry-After once its bucket is empty, then let in again."""
+    now = [0.0]
+    client, _ = _client(now)
+
+    assert [client.get("/items").status_code for _ in range(3)] == [200, 200, 200]
+    rejected = client.get("/items")
+    assert rejected.status_code == 429
+    assert rejected.json() == {"detail": "Too many requests"}
+    assert rejected.headers["Retry-After"] == "1"
+
+    now[0] += 1.0
+    assert client.get("/items").status_code == 200
+    assert client.get("/items").status_code == 429
+
+
+def test_routes_are_priced_by_their_costs() -> None:
+    """Test expensive routes take more tokens, unpaginated lists only without a limit."""
+    now = [0.0]
+    costs = {"POST /items:batch": 2, "GET /items unpaginated": 3, "GET /health": 0}
+    client, _ = _client(now, burst=4.0, costs=costs)
+
+    assert client.post("/items:batch").status_code == 200
+    assert client.post("/items:batch").status_code == 200
+    assert client.get("/items?limit=10").status_code == 429
+    assert all(client.get("/health").status_code == 200 for _ in range(10))
+
+    now[0] += 2.0
+    assert client.get("/items").status_code == 429
+    assert client.get("/items").headers["Retry-After"] == "1"
+    assert client.get("/items?offset=0&limit=5").status_code == 200
+
+
+def test_cost_keys_are_validated() -> None:
+    """Test a cost key without a method and path is refused."""
+    with pytest.raises(ValueError, match="METHOD /path"):
+        _client([0.0], costs={"/items": 1})
+
+
+def test_clients_are_keyed_by_header_and_bounded() -> None:
+    """Test each API key gets its own bucket and only max_clients buckets are kept."""
+    now = [0.0]
+    client, limiter = _client(now, burst=1.0, key_header="X-API-Key", max_clients=2)
+
+    assert client.get("/items", headers={"X-API-Key": "a"}).status_code == 200
+    assert client.get("/items", headers={"X-API-Key": "a"}).status_code == 429
+    assert client.get("/items", headers={"X-API-Key": "b"}).status_code == 200
+    assert client.get("/items").status_code == 200
+    assert client.get("/items").status_code == 429
+    assert list(limiter._buckets) == ["key:b", "ip:testclient"]
@@ -1,8 +1,16 @@
 """API endpoint tests."""
 
+import inspect
+
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 
+from app.api.dependencies import get_repository
 from app.api.router import app
+from app.core.config import Settings
+from app.core.container import Container
+from app.core.container import get_container
 
 
 def test_root() -> None:
@@ -19,3 +27,89 @@ def test_health() -> None:
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
+
+
+@pytest.mark.asyncio
+async def test_ready_reports_startup(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test /ready is 503 until the container has started, and again after shutdown."""
+    container = Container(Settings(metrics_enabled=False))
+    monkeypatch.setattr("app.api.router.get_container", lambda: container)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/ready")
+        assert response.status_code == 503
+        assert response.json() == {"status": "starting"}
+        await container.startup()
+        response = await client.get("/ready")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ready"}
+        await container.shutdown()
+        assert (await client.get("/ready")).status_code == 503
+
+
+def test_failed_startup_is_logged_reported_and_raised(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a startup failure is logged, reported by /health and /ready, and raised on stop."""
+    container = Container(Settings(metrics_enabled=False))
+
+    async def recover() -> None:
+        raise OSError("corrupt snapshot")
+
+    monkeypatch.setattr(container, "recover", recover)
+    monkeypatch.setattr("app.api.router.get_container", lambda: container)
+    monkeypatch.setattr("app.api.router.setup_logging", lambda **_: None)
+    with pytest.raises(OSError, match="corrupt snapshot"), TestClient(app) as client:
+        for path in ("/health", "/ready"):
+            response = client.get(path)
+            assert response.status_code == 503
+            assert response.json() == {"status": "failed"}
+    assert "Startup failed" in caplog.text
+
+
+def test_lifespan_resolves_dependencies_onto_app_state() -> None:
+    """Test startup stores the container's repository for the async provider to read."""
+    assert inspect.iscoroutinefunction(get_repository)
+    with TestClient(app):
+        assert app.state.repository is get_container().repository
+
+
+def test_request_id_is_echoed_or_generated() -> None:
+    """Test well-formed request IDs are reused and others replaced with a new one."""
+    client = TestClient(app)
+    assert client.get("/", headers={"X-Request-ID": "trace-42"}).headers["X-Request-ID"] == (
+        "trace-42"
+    )
+    generated = client.get("/", headers={"X-Request-ID": "bad id\n"}).headers["X-Request-ID"]
+    assert len(generated) == 32
+    assert client.get("/").headers["X-Request-ID"] != generated
+
+
+def test_metrics_record_requests_by_route_template() -> None:
+    """Test requests are counted by route template, with unknown paths grouped together."""
+    client = TestClient(app)
+    client.get("/health")
+    client.get("/no/such/path")
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert any(
+        line.startswith(
+            'http_request_duration_seconds_count{method="GET",route="/health",status="200"}'
+        )
+        for line in lines
+    )
+    assert any('route="unmatched",status="404"' in line for line in lines)
+{%- if cookiecutter.include_entity_example == "yes" %}
+
+
+def test_metrics_label_included_routes_with_their_prefix() -> None:
+    """Test routes of an included router are labelled with the prefix it was included with."""
+    client = TestClient(app)
+    client.get("{{ cookiecutter.api_prefix }}/entities/missing")
+    response = client.get("/metrics")
+
+    label = 'method="GET",route="{{ cookiecutter.api_prefix }}/entities/{entity_id}",status="404"'
+    assert any(label in line for line in response.text.splitlines())
+{%- endif %}
@@ -0,0 +1,61 @@
+"""Streaming response helper tests."""
+
+import json
+from collections.abc import AsyncIterator
+
+import pytest
+
+from app.api.streaming import iter_lines
+from app.api.streaming import json_array_stream
+from app.api.streaming import ndjson_stream
+
+
+async def _chunks(*chunks: list[dict[str, int]]) -> AsyncIterator[list[dict[str, int]]]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _byte_chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(stream: AsyncIterator[bytes]) -> bytes:
+    return b"".join([part async for part in stream])
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_writes_one_line_per_item() -> None:
+    """Test that every item becomes its own JSON line."""
+    body = await _collect(ndjson_stream(_chunks([{"a": 1}, {"a": 2}], [], [{"a": 3}])))
+    lines = body.decode().splitlines()
+    assert [json.loads(line) for line in lines] == [{"a": 1}, {"a": 2}, {"a": 3}]
+
+
+@pytest.mark.asyncio
+async def test_json_array_stream_produces_valid_array() -> None:
+    """Test that chunks are joined into one JSON array."""
+    body = await _collect(json_array_stream(_chunks([{"a": 1}], [], [{"a": 2}, {"a": 3}])))
+    assert json.loads(body) == [{"a": 1}, {"a": 2}, {"a": 3}]
+
+
+@pytest.mark.asyncio
+async def test_json_array_stream_empty() -> None:
+    """Test that no chunks produce an empty array."""
+    assert json.loads(await _collect(json_array_stream(_chunks()))) == []
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_reassembles_lines_split_across_chunks() -> None:
+    """Test that lines spanning chunk boundaries are joined and blank lines skipped."""
+    stream = _byte_chunks(b'{"a":', b' 1}\n\n{"a": 2}\r\n{"a"', b": 3}")
+    lines = [item async for item in iter_lines(stream, max_line_bytes=100)]
+    assert lines == [(1, b'{"a": 1}'), (3, b'{"a": 2}'), (4, b'{"a": 3}')]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_drops_oversized_lines() -> None:
+    """Test that an oversized line is reported as None and the next line survives."""
+    stream = _byte_chunks(b"x" * 8, b"x" * 8, b"x\nok\n", b"y" * 20)
+    lines = [item async for item in iter_lines(stream, max_line_bytes=10)]
+    assert lines == [(1, None), (2, b"ok"), (3, None)]
@@ -0,0 +1,55 @@
+"""Load test harness tests."""
+
+import argparse
+
+import pytest
+
+from app.api.router import app
+from app.core.loadtest import LoadTestOptions
+from app.core.loadtest import _mix
+from app.core.loadtest import run_load_test
+
+
+@pytest.mark.asyncio
+async def test_load_test_reports_latency_and_memory() -> None:
+    """Test a short run exercises the mix and reports percentiles and memory samples."""
+    options = LoadTestOptions(duration=0.5, concurrency=4, entities=50, sample_interval=0.1)
+    report = await run_load_test(app, options)
+
+    assert report.requests > 0
+    assert set(report.latencies) <= set(options.mix)
+    assert report.server_errors == 0
+    percentiles = report.percentiles()
+    assert list(percentiles) == ["p50", "p95", "p99", "max"]
+    assert percentiles["p50"] <= percentiles["p99"] <= percentiles["max"]
+    assert len(report.memory) >= 3
+    assert "p99 ms" in report.format()
+
+
+@pytest.mark.asyncio
+async def test_target_rate_limits_requests() -> None:
+    """Test a target rate spreads requests over the run instead of sending them at once."""
+    options = LoadTestOptions(duration=0.5, concurrency=8, rate=100, entities=10)
+    report = await run_load_test(app, options)
+
+    assert 40 <= report.requests <= 50
+
+
+@pytest.mark.asyncio
+async def test_traced_memory_reports_allocation_growth() -> None:
+    """Test tracing adds traced memory samples and the largest allocation sites."""
+    options = LoadTestOptions(duration=0.2, concurrency=2, entities=10, trace_memory=True)
+    report = await run_load_test(app, options)
+
+    assert all(traced is not None for _, _, traced in report.memory)
+    assert report.allocation_growth
+    assert "traced memory:" in report.format()
+
+
+def test_mix_parsing() -> None:
+    """Test operation mixes are parsed and unknown operations rejected."""
+    assert _mix("get=3, create=1") == {"get": 3, "create": 1}
+    with pytest.raises(argparse.ArgumentTypeError, match="operation=weight"):
+        _mix("fetch=1")
+    with pytest.raises(argparse.ArgumentTypeError, match="positive weight"):
+        _mix("get=0")
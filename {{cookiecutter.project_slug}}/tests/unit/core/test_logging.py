@@ -0,0 +1,118 @@
+"""Logging pipeline tests."""
+
+import io
+import json
+import logging
+from collections.abc import Iterator
+
+import pytest
+
+from app.core import logging as app_logging
+from app.core.logging import JsonFormatter
+from app.core.logging import RateLimitFilter
+from app.core.logging import SamplingFilter
+from app.core.logging import request_id
+from app.core.logging import setup_logging
+from app.core.logging import shutdown_logging
+
+
+@pytest.fixture
+def stream() -> Iterator[io.StringIO]:
+    """Route logging to a buffer and restore the root logger afterwards."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    buffer = io.StringIO()
+    yield buffer
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def _record(
+    name: str = "app.test", level: int = logging.INFO, msg: str = "hello"
+) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+def test_records_are_written_by_the_listener_and_flushed_on_shutdown(
+    stream: io.StringIO,
+) -> None:
+    """Test queued records, with late arguments frozen, are all written at shutdown."""
+    setup_logging(stream=stream)
+    values = ["before"]
+    logger = logging.getLogger("app.test")
+    for i in range(100):
+        logger.info("record %d %s", i, values)
+    values[0] = "after"
+    shutdown_logging()
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 100
+    assert lines[-1].endswith("| INFO | app.test | record 99 ['before']")
+
+    logger.info("after shutdown")
+    assert stream.getvalue().splitlines()[-1].endswith("after shutdown")
+
+
+def test_json_format_includes_request_id_and_traceback(stream: io.StringIO) -> None:
+    """Test JSON lines carry the request ID of the logging context and the exception."""
+    setup_logging(log_format="json", stream=stream)
+    token = request_id.set("abc123")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("app.test").exception("failed %s", "here")
+    finally:
+        request_id.reset(token)
+    shutdown_logging()
+
+    entry = json.loads(stream.getvalue().splitlines()[0])
+    assert entry["message"] == "failed here"
+    assert entry["level"] == "ERROR"
+    assert entry["request_id"] == "abc123"
+    assert "ValueError: boom" in entry["exception"]
+    assert "request_id" not in json.loads(JsonFormatter().format(_record()))
+
+
+def test_full_queue_drops_records_instead_of_blocking(stream: io.StringIO) -> None:
+    """Test records beyond the queue size are dropped and reported at shutdown."""
+    setup_logging(queue_size=1, stream=stream)
+    listener = app_logging._listener
+    assert listener is not None
+    listener.stop()  # nothing drains the queue until it is restarted
+    for i in range(5):
+        logging.getLogger("app.test").info("record %d", i)
+    listener.start()
+    shutdown_logging()
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0].endswith("record 0")
+    assert lines[1].endswith("Dropped 4 log records while the queue was full")
+
+
+def test_sampling_keeps_a_fraction_per_logger_tree() -> None:
+    """Test sampling follows the nearest configured ancestor and spares warnings."""
+    sampler = SamplingFilter({"app": 0.25, "app.quiet": 0.0})
+    kept = [sampler.filter(_record("app.repo")) for _ in range(8)]
+
+    assert kept.count(True) == 2
+    assert not sampler.filter(_record("app.quiet.child"))
+    assert sampler.filter(_record("app.quiet", level=logging.WARNING))
+    assert sampler.filter(_record("other"))
+
+
+def test_rate_limit_suppresses_repeats_and_reports_them(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test repeats of one message beyond the rate are dropped and then counted."""
+    now = [100.0]
+    monkeypatch.setattr(app_logging.time, "monotonic", lambda: now[0])
+    limiter = RateLimitFilter(per_second=2, max_messages=2)
+
+    assert [limiter.filter(_record()) for _ in range(5)] == [True, True, False, False, False]
+    assert limiter.filter(_record(msg="other"))
+    now[0] += 1.0
+    record = _record()
+    assert limiter.filter(record)
+    assert record.getMessage() == "hello (3 similar messages suppressed)"
+
+    limiter.filter(_record(msg="third"))  # evicts the least recently logged message
+    assert list(limiter._buckets) == [("app.test", "hello"), ("app.test", "third")]
@@ -0,0 +1,91 @@
+"""Metrics tests."""
+
+from pathlib import Path
+
+import pytest
+
+from app.core import metrics as metrics_module
+from app.core.metrics import Registry
+
+
+def test_exposition_format() -> None:
+    """Test counters and histograms render as Prometheus text with cumulative buckets."""
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests served.", ("path",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("path",), buckets=(0.1, 1.0))
+    requests.labels('/a"b').inc()
+    requests.labels('/a"b').inc(2)
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.labels("/").observe(value)
+
+    assert registry.expose().splitlines() == [
+        "# HELP requests_total Requests served.",
+        "# TYPE requests_total counter",
+        'requests_total{path="/a\\"b"} 3',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{path="/",le="0.1"} 1',
+        'latency_seconds_bucket{path="/",le="1.0"} 3',
+        'latency_seconds_bucket{path="/",le="+Inf"} 4',
+        'latency_seconds_sum{path="/"} 4.05',
+        'latency_seconds_count{path="/"} 4',
+    ]
+
+
+def test_invalid_definitions_and_labels_are_rejected() -> None:
+    """Test duplicate names, unordered buckets and wrong label counts raise ValueError."""
+    registry = Registry()
+    counter = registry.counter("events_total", "Events.", ("kind",))
+    with pytest.raises(ValueError, match="already registered"):
+        registry.counter("events_total", "Events.")
+    with pytest.raises(ValueError, match="ascending"):
+        registry.histogram("sizes", "Sizes.", buckets=(2.0, 1.0))
+    with pytest.raises(ValueError, match="expects labels"):
+        counter.labels("a", "b")
+
+
+def test_workers_sharing_a_directory_are_added_up(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test per-process files are summed, including files that keep growing."""
+    workers: list[Registry] = []
+    for pid in (101, 102):
+        monkeypatch.setattr(metrics_module.os, "getpid", lambda pid=pid: pid)
+        registry = Registry()
+        counter = registry.counter("jobs_total", "Jobs.", ("queue",))
+        registry.use_directory(str(tmp_path))
+        counter.labels("default").inc(pid)
+        workers.append(registry)
+
+    # Enough series to grow the first worker's file past its initial size
+    jobs = workers[0]._metrics["jobs_total"]
+    assert isinstance(jobs, metrics_module.Counter)
+    for i in range(3_000):
+        jobs.labels(f"queue-{i}").inc()
+
+    lines = workers[1].expose().splitlines()
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert [name.split("-")[1] for name in names] == ["101", "102"]
+    assert 'jobs_total{queue="default"} 203' in lines
+    assert 'jobs_total{queue="queue-2999"} 1' in lines
+    assert len(lines) == 2 + 3_001
+
+
+def test_exited_workers_are_folded_into_the_archive(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test retiring a worker removes its file but keeps its counts in the totals."""
+    supervisor = Registry()
+    supervisor.use_directory(str(tmp_path))
+    for pid in (101, 102, 103):
+        monkeypatch.setattr(metrics_module.os, "getpid", lambda pid=pid: pid)
+        registry = Registry()
+        counter = registry.counter("jobs_total", "Jobs.", ("queue",))
+        registry.use_directory(str(tmp_path))
+        counter.labels("default").inc(pid)
+        if pid != 103:
+            supervisor.retire_process(pid)
+
+    supervisor.retire_process(999)
+    assert [path.name.split("-")[1] for path in tmp_path.glob("metrics-*.db")] == ["103"]
+    assert supervisor.store.totals() == {'["jobs_total", ["default"], ""]': 306.0}
@@ -0,0 +1,102 @@
+"""Server launcher tests."""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.core.config import Settings
+from app.core.server import build_config
+from app.core.server import describe
+from app.core.server import worker_count
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+
+def _get(url: str) -> httpx.Response:
+    """GET on a fresh connection, so consecutive requests spread over the workers."""
+    return httpx.get(url, headers={"Connection": "close"})
+
+
+def test_worker_count_defaults_to_cpu_count() -> None:
+    """Test workers default to the CPU count; debug mode and persistence run one process."""
+    expected = (os.cpu_count() or 1) if hasattr(os, "fork") else 1
+    assert worker_count(Settings()) == expected
+    assert worker_count(Settings(server_workers=3, debug=True)) == 1
+    assert worker_count(Settings(server_workers=3, persistence_enabled=True)) == 1
+
+
+def test_build_config_applies_server_settings() -> None:
+    """Test the uvicorn configuration is built from settings."""
+    settings = Settings(
+        server_host="127.0.0.1",
+        server_port=9000,
+        server_backlog=128,
+        server_keep_alive_seconds=7,
+        server_event_loop="asyncio",
+        server_http_parser="h11",
+        server_graceful_timeout_seconds=11,
+    )
+    config = build_config(settings, app=None, max_requests=50)
+
+    assert (config.host, config.port, config.backlog) == ("127.0.0.1", 9000, 128)
+    assert (config.loop, config.http) == ("asyncio", "h11")
+    assert config.timeout_keep_alive == 7
+    assert config.timeout_graceful_shutdown == 11
+    assert config.limit_max_requests == 50
+    assert "loop=asyncio http=h11" in describe(settings)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-forking needs os.fork")
+def test_workers_are_recycled_and_stop_gracefully() -> None:
+    """Test a multi-worker server keeps serving across recycling and exits cleanly."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    env = os.environ | {
+        "DEBUG": "false",
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port),
+        "SERVER_WORKERS": "2",
+        "SERVER_MAX_REQUESTS": "3",
+        "SERVER_GRACEFUL_TIMEOUT_SECONDS": "2",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/health"
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                httpx.get(url)
+                break
+            except httpx.TransportError:
+                assert time.monotonic() < deadline, "server did not start"
+                time.sleep(0.1)
+        statuses = [_get(url).status_code for _ in range(20)]
+        metrics = _get(f"http://127.0.0.1:{port}/metrics").text
+        process.send_signal(signal.SIGTERM)
+        output, _ = process.communicate(timeout=15)
+    finally:
+        process.kill()
+
+    assert statuses == [200] * 20
+    assert process.returncode == 0
+    assert "with 2 workers" in output
+    assert "replacing it" in output
+    # Counts from every worker, including recycled ones, are added up
+    sample = 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}'
+    health_requests = next(line for line in metrics.splitlines() if line.startswith(sample))
+    assert int(health_requests.split()[-1]) >= 21
@@ -12,6 +12,8 @@ from dataclasses import FrozenInstanceError
 import pytest
 
 from app.domain.models import Entity
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
 
 
 def test_create_valid_entity() -> None:
@@ -71,8 +73,49 @@ def test_create_entity_with_negative_price_raises_error() -> None:
         Entity(id="1", name="Test Entity", price=-10.0)
 
 
+def test_create_entity_with_nan_price_raises_error() -> None:
+    """Test that creating an entity with a NaN price raises ValueError."""
+    with pytest.raises(ValueError, match="Entity price must be a number"):
+        Entity(id="1", name="Test Entity", price=float("nan"))
+
+
 def test_entity_is_immutable() -> None:
     """Test that Entity is immutable (frozen dataclass)."""
     entity = Entity(id="1", name="Test Entity", price=10.0)
     with pytest.raises(FrozenInstanceError):
         entity.name = "New Name"  # type: ignore[arg-type]
+
+
+def test_entity_query_matches_all_criteria() -> None:
+    """Test that a query matches only entities satisfying every criterion."""
+    query = EntityQuery(in_stock=True, min_price=5.0, max_price=10.0, name_prefix="Wid")
+    assert query.matches(Entity(id="1", name="Widget", price=5.0))
+    assert not query.matches(Entity(id="2", name="Widget", price=5.0, in_stock=False))
+    assert not query.matches(Entity(id="3", name="Widget", price=10.5))
+    assert not query.matches(Entity(id="4", name="Gadget", price=7.0))
+
+
+def test_empty_entity_query() -> None:
+    """Test that a query without criteria is empty and matches everything."""
+    query = EntityQuery()
+    assert query.is_empty
+    assert query.matches(Entity(id="1", name="Anything", price=0.0, in_stock=False))
+    assert not EntityQuery(in_stock=False).is_empty
+
+
+def test_entity_query_with_inverted_price_range_raises_error() -> None:
+    """Test that min_price greater than max_price raises ValueError."""
+    with pytest.raises(ValueError, match="min_price cannot be greater than max_price"):
+        EntityQuery(min_price=10.0, max_price=5.0)
+
+
+def test_entity_patch_applies_only_set_fields() -> None:
+    """Test a patch replaces the fields it sets and validates them like an entity."""
+    entity = Entity(id="1", name="Widget", price=5.0, in_stock=True, version=3)
+    assert EntityPatch(price=0.0).apply(entity) == Entity(id="1", name="Widget", price=0.0)
+    assert EntityPatch().is_empty
+    assert not EntityPatch(in_stock=False).is_empty
+    with pytest.raises(ValueError, match="name cannot be empty"):
+        EntityPatch(name=" ")
+    with pytest.raises(ValueError, match="price cannot be negative"):
+        EntityPatch(price=-1.0)
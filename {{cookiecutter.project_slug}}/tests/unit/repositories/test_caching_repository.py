@@ -0,0 +1,227 @@
+"""Caching repository tests."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import Settings
+from app.core.container import Container
+from app.domain.models import Entity
+from app.domain.models import EntityPatch
+from app.repositories.caching_repository import CachingRepository
+from app.repositories.memory_repository import MemoryRepository
+
+
+class _CountingRepository(MemoryRepository):
+    """MemoryRepository counting lookups, optionally pausing them until released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+        self.gate: asyncio.Event | None = None
+
+    async def get_entity_by_id(self, entity_id: str) -> Entity | None:
+        self.lookups += 1
+        entity = await super().get_entity_by_id(entity_id)
+        if self.gate is not None:
+            await self.gate.wait()
+        return entity
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_hit_is_served_from_cache() -> None:
+    """Test repeated lookups only reach the wrapped repository once."""
+    inner = _CountingRepository()
+    await inner.save(Entity(id="1", name="A", price=1.0))
+    repo = CachingRepository(inner)
+    assert await repo.get_entity_by_id("1") == Entity(id="1", name="A", price=1.0)
+    assert await repo.get_entity_by_id("1") == Entity(id="1", name="A", price=1.0)
+    assert inner.lookups == 1
+    stats = repo.stats
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    assert stats.hit_ratio == 0.5
+
+
+@pytest.mark.asyncio
+async def test_misses_are_cached_for_negative_ttl() -> None:
+    """Test missing IDs are cached, but only for the negative TTL."""
+    inner = _CountingRepository()
+    clock = _Clock()
+    repo = CachingRepository(inner, ttl_seconds=60, negative_ttl_seconds=5, clock=clock)
+    assert await repo.get_entity_by_id("missing") is None
+    assert await repo.get_entity_by_id("missing") is None
+    assert inner.lookups == 1
+    clock.now = 6
+    assert await repo.get_entity_by_id("missing") is None
+    assert inner.lookups == 2
+    assert repo.stats.expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_negative_caching_can_be_disabled() -> None:
+    """Test a zero negative TTL never caches misses."""
+    inner = _CountingRepository()
+    repo = CachingRepository(inner, negative_ttl_seconds=0)
+    await repo.get_entity_by_id("missing")
+    await repo.get_entity_by_id("missing")
+    assert inner.lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl() -> None:
+    """Test cached entities are refetched once their TTL has passed."""
+    inner = _CountingRepository()
+    await inner.save(Entity(id="1", name="A", price=1.0))
+    clock = _Clock()
+    repo = CachingRepository(inner, ttl_seconds=10, clock=clock)
+    await repo.get_entity_by_id("1")
+    clock.now = 9
+    await repo.get_entity_by_id("1")
+    assert inner.lookups == 1
+    clock.now = 11
+    await repo.get_entity_by_id("1")
+    assert inner.lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted() -> None:
+    """Test the cache stays bounded and evicts the least recently used ID."""
+    inner = _CountingRepository()
+    for i in range(3):
+        await inner.save(Entity(id=str(i), name=f"E{i}", price=1.0))
+    repo = CachingRepository(inner, max_entries=2)
+    await repo.get_entity_by_id("0")
+    await repo.get_entity_by_id("1")
+    await repo.get_entity_by_id("0")
+    await repo.get_entity_by_id("2")
+    assert repo.stats.evictions == 1
+    assert repo.stats.size == 2
+
+    inner.lookups = 0
+    await repo.get_entity_by_id("0")
+    assert inner.lookups == 0
+    await repo.get_entity_by_id("1")
+    assert inner.lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_lookups() -> None:
+    """Test save, update, patch and delete drop the cached value, including cached misses."""
+    inner = _CountingRepository()
+    repo = CachingRepository(inner)
+    assert await repo.get_entity_by_id("1") is None
+    await repo.save(Entity(id="1", name="A", price=1.0))
+    assert await repo.get_entity_by_id("1") == Entity(id="1", name="A", price=1.0)
+    await repo.update(Entity(id="1", name="B", price=2.0))
+    assert await repo.get_entity_by_id("1") == Entity(id="1", name="B", price=2.0)
+    await repo.patch("1", EntityPatch(name="C"))
+    assert await repo.get_entity_by_id("1") == Entity(id="1", name="C", price=2.0)
+    await repo.delete("1")
+    assert await repo.get_entity_by_id("1") is None
+
+
+@pytest.mark.asyncio
+async def test_batch_writes_invalidate_cached_lookups() -> None:
+    """Test batch writes drop the cached values of every touched ID."""
+    inner = _CountingRepository()
+    repo = CachingRepository(inner)
+    await repo.get_entity_by_id("1")
+    await repo.get_entity_by_id("2")
+    await repo.save_many([Entity(id="1", name="A", price=1.0), Entity(id="2", name="B", price=1.0)])
+    assert await repo.get_entity_by_id("2") == Entity(id="2", name="B", price=1.0)
+    await repo.update_many([Entity(id="2", name="C", price=1.0)])
+    assert await repo.get_entity_by_id("2") == Entity(id="2", name="C", price=1.0)
+    await repo.delete_many(["1", "2"])
+    assert await repo.get_entity_by_id("1") is None
+    assert await repo.get_entity_by_id("2") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_write_still_invalidates() -> None:
+    """Test a write that raises still drops the cached value."""
+    inner = _CountingRepository()
+    repo = CachingRepository(inner)
+    await repo.get_entity_by_id("1")
+    with pytest.raises(ValueError):
+        await repo.delete("1")
+    await repo.get_entity_by_id("1")
+    assert inner.lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_lookup_racing_a_write_does_not_cache_stale_value() -> None:
+    """Test a lookup that started before a write doesn't repopulate the cache."""
+    inner = _CountingRepository()
+    await inner.save(Entity(id="1", name="Old", price=1.0))
+    repo = CachingRepository(inner)
+
+    inner.gate = asyncio.Event()
+    slow_lookup = asyncio.create_task(repo.get_entity_by_id("1"))
+    await asyncio.sleep(0)
+    await repo.update(Entity(id="1", name="New", price=1.0))
+    inner.gate.set()
+    assert (await slow_lookup) == Entity(id="1", name="Old", price=1.0)
+    inner.gate = None
+
+    assert await repo.get_entity_by_id("1") == Entity(id="1", name="New", price=1.0)
+
+
+@pytest.mark.asyncio
+async def test_reads_pass_through() -> None:
+    """Test list, query and count calls reach the wrapped repository."""
+    inner = MemoryRepository()
+    repo = CachingRepository(inner)
+    await repo.save(Entity(id="1", name="A", price=1.0))
+    assert await repo.list_all() == await inner.list_all()
+    assert await repo.count() == 1
+    assert (await repo.list_page(limit=10)).entities == await inner.list_all()
+    assert [chunk async for chunk in repo.iter_all()] == [await inner.list_all()]
+
+
+@pytest.mark.asyncio
+async def test_get_many_fetches_only_uncached_ids() -> None:
+    """Test a multi-get serves cached lookups, including misses, and caches the rest."""
+    inner = _CountingRepository()
+    for i in range(3):
+        await inner.save(Entity(id=str(i), name="E", price=1.0))
+    repo = CachingRepository(inner)
+    await repo.get_entity_by_id("0")
+    await repo.get_entity_by_id("missing")
+
+    found = await repo.get_many(["0", "1", "missing", "gone"])
+    assert sorted(found) == ["0", "1"]
+    assert (repo.stats.hits, repo.stats.misses, repo.stats.size) == (2, 4, 4)
+
+    assert sorted(await repo.get_many(["1", "gone"])) == ["1"]
+    assert repo.stats.hits == 4
+
+
+@pytest.mark.asyncio
+async def test_startup_primes_cache() -> None:
+    """Test startup loads the first stored entities so their lookups are hits."""
+    inner = _CountingRepository()
+    for i in range(5):
+        await inner.save(Entity(id=str(i), name="E", price=1.0))
+    repo = CachingRepository(inner, warmup_entries=3)
+    await repo.startup()
+
+    assert repo.stats.size == 3
+    assert await repo.get_entity_by_id("2") == Entity(id="2", name="E", price=1.0)
+    assert inner.lookups == 0
+    assert repo.stats.hits == 1
+
+
+def test_container_wraps_repository_when_cache_enabled() -> None:
+    """Test the container adds the cache only when enabled in settings."""
+    enabled = Container(Settings(cache_enabled=True, metrics_enabled=False))
+    assert isinstance(enabled.repository, CachingRepository)
+    disabled = Container(Settings(cache_enabled=False, metrics_enabled=False))
+    assert isinstance(disabled.repository, MemoryRepository)
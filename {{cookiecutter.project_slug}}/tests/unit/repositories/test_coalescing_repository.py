@@ -0,0 +1,165 @@
+"""Coalescing repository tests."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import Settings
+from app.core.container import Container
+from app.core.metrics import registry
+from app.domain.models import Entity
+from app.domain.models import EntityQuery
+from app.repositories.coalescing_repository import CoalescingRepository
+from app.repositories.memory_repository import MemoryRepository
+
+
+class _GatedRepository(MemoryRepository):
+    """MemoryRepository counting reads and holding them until the gate opens."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+        self.finds = 0
+        self.gate = asyncio.Event()
+        self.error: Exception | None = None
+
+    async def get_entity_by_id(self, entity_id: str) -> Entity | None:
+        self.lookups += 1
+        await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return await super().get_entity_by_id(entity_id)
+
+    async def find(
+        self, query: EntityQuery, offset: int = 0, limit: int | None = None
+    ) -> list[Entity]:
+        self.finds += 1
+        await self.gate.wait()
+        return await super().find(query, offset=offset, limit=limit)
+
+
+def _coalesced(operation: str) -> float:
+    """Return the current coalesced call count for `operation`."""
+    prefix = 'repository_coalesced_calls_total{operation="' + operation + '"} '
+    for line in registry.expose().splitlines():
+        if line.startswith(prefix):
+            return float(line.removeprefix(prefix))
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_call() -> None:
+    """Test identical lookups in flight reach the backend once and are counted."""
+    inner = _GatedRepository()
+    entity = await inner.save(Entity(id="1", name="A", price=1.0))
+    repo = CoalescingRepository(inner)
+    before = _coalesced("get_entity_by_id")
+
+    lookups = [asyncio.ensure_future(repo.get_entity_by_id("1")) for _ in range(5)]
+    other = asyncio.ensure_future(repo.get_entity_by_id("2"))
+    await asyncio.sleep(0)
+    inner.gate.set()
+
+    assert await asyncio.gather(*lookups) == [entity] * 5
+    assert await other is None
+    assert inner.lookups == 2
+    assert (repo.stats.calls, repo.stats.coalesced) == (2, 4)
+    assert _coalesced("get_entity_by_id") - before == 4
+    inner.gate.clear()
+    follow_up = asyncio.ensure_future(repo.get_entity_by_id("1"))
+    await asyncio.sleep(0)
+    inner.gate.set()
+    assert await follow_up == entity
+    assert inner.lookups == 3
+
+
+@pytest.mark.asyncio
+async def test_identical_list_queries_share_one_call() -> None:
+    """Test only finds with the same arguments are coalesced, each caller getting its own list."""
+    inner = _GatedRepository()
+    await inner.save(Entity(id="1", name="A", price=1.0))
+    repo = CoalescingRepository(inner)
+    query = EntityQuery(in_stock=True)
+
+    calls = [
+        repo.find(query, limit=10),
+        repo.find(EntityQuery(in_stock=True), limit=10),
+        repo.find(query, limit=5),
+    ]
+    pending = asyncio.gather(*calls)
+    await asyncio.sleep(0)
+    inner.gate.set()
+    first, second, third = await pending
+
+    assert first == second == third == [Entity(id="1", name="A", price=1.0)]
+    assert first is not second
+    assert inner.finds == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller() -> None:
+    """Test an exception from the shared call is raised to each caller."""
+    inner = _GatedRepository()
+    inner.error = RuntimeError("backend down")
+    repo = CoalescingRepository(inner)
+
+    pending = asyncio.gather(
+        *(repo.get_entity_by_id("1") for _ in range(3)), return_exceptions=True
+    )
+    await asyncio.sleep(0)
+    inner.gate.set()
+
+    errors = await pending
+    assert [str(error) for error in errors] == ["backend down"] * 3
+    assert inner.lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_callers_do_not_cancel_the_others() -> None:
+    """Test cancelling a waiting caller, or the one running the call, leaves the others served."""
+    inner = _GatedRepository()
+    entity = await inner.save(Entity(id="1", name="A", price=1.0))
+    repo = CoalescingRepository(inner)
+
+    leader = asyncio.ensure_future(repo.get_entity_by_id("1"))
+    waiting = asyncio.ensure_future(repo.get_entity_by_id("1"))
+    impatient = asyncio.ensure_future(repo.get_entity_by_id("1"))
+    await asyncio.sleep(0)
+    impatient.cancel()
+    leader.cancel()
+    await asyncio.sleep(0)
+    inner.gate.set()
+
+    assert await waiting == entity
+    assert leader.cancelled()
+    assert impatient.cancelled()
+    # The call was restarted once for the caller still waiting
+    assert inner.lookups == 2
+    assert await repo.get_entity_by_id("1") == entity
+
+
+@pytest.mark.asyncio
+async def test_reads_after_a_write_do_not_join_earlier_calls() -> None:
+    """Test a lookup issued after a write starts a new call instead of sharing a stale one."""
+    inner = _GatedRepository()
+    repo = CoalescingRepository(inner)
+
+    stale = asyncio.ensure_future(repo.get_entity_by_id("1"))
+    await asyncio.sleep(0)
+    saved = await repo.save(Entity(id="1", name="A", price=1.0))
+    fresh = asyncio.ensure_future(repo.get_entity_by_id("1"))
+    await asyncio.sleep(0)
+    inner.gate.set()
+
+    assert await fresh == saved
+    await stale
+    assert inner.lookups == 2
+    assert repo.stats.coalesced == 0
+
+
+def test_container_coalesces_when_enabled() -> None:
+    """Test the container adds the single-flight layer only when enabled in settings."""
+    enabled = Container(Settings(coalescing_enabled=True, metrics_enabled=False))
+    assert isinstance(enabled.repository, CoalescingRepository)
+    disabled = Container(Settings(coalescing_enabled=False, metrics_enabled=False))
+    assert isinstance(disabled.repository, MemoryRepository)
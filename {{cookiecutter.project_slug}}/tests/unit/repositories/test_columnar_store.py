@@ -0,0 +1,85 @@
+"""Columnar storage engine tests."""
+
+import pytest
+
+from app.core.config import Settings
+from app.core.container import Container
+from app.domain.models import Entity
+from app.domain.models import EntityQuery
+from app.repositories.columnar_store import ColumnarEntityStore
+from app.repositories.memory_repository import MemoryRepository
+
+
+def test_store_round_trips_every_field() -> None:
+    """Test an entity reads back with the same fields it was stored with."""
+    store = ColumnarEntityStore()
+    for i in range(20):
+        store[str(i)] = Entity(
+            id=str(i), name=f"Entity {i}", price=i / 3, in_stock=i % 3 == 0, version=i
+        )
+    for i in range(20):
+        entity = store[str(i)]
+        assert entity == Entity(id=str(i), name=f"Entity {i}", price=i / 3, in_stock=i % 3 == 0)
+        assert entity.version == i
+    assert store.get("missing") is None
+    assert len(store) == 20
+
+
+def test_store_keeps_dict_ordering_semantics() -> None:
+    """Test replacing keeps position, and deleted IDs re-added go to the end."""
+    store = ColumnarEntityStore()
+    for entity_id in "abc":
+        store[entity_id] = Entity(id=entity_id, name=entity_id, price=1.0)
+    store["a"] = Entity(id="a", name="A2", price=2.0, in_stock=False)
+    del store["b"]
+    store["b"] = Entity(id="b", name="B2", price=3.0)
+
+    assert [e.id for e in store.values()] == ["a", "c", "b"]
+    assert store["a"] == Entity(id="a", name="A2", price=2.0, in_stock=False)
+    assert "b" in store
+    with pytest.raises(KeyError):
+        del store["missing"]
+
+
+def test_store_reuses_freed_rows() -> None:
+    """Test deletes free rows for later inserts instead of growing the columns."""
+    store = ColumnarEntityStore()
+    for i in range(10):
+        store[str(i)] = Entity(id=str(i), name="E", price=1.0)
+    for i in range(5):
+        del store[str(i)]
+    for i in range(10, 15):
+        store[str(i)] = Entity(id=str(i), name="E", price=1.0, in_stock=False)
+
+    assert len(store) == 10
+    assert len(store._prices) == 10
+    assert all(not store[str(i)].in_stock for i in range(10, 15))
+    assert all(store[str(i)].in_stock for i in range(5, 10))
+
+
+@pytest.mark.asyncio
+async def test_memory_repository_behaves_the_same_on_columnar_store() -> None:
+    """Test the repository returns identical results on both engines."""
+    dict_repo = MemoryRepository()
+    columnar_repo = MemoryRepository(store=ColumnarEntityStore())
+    for repo in (dict_repo, columnar_repo):
+        for i in range(30):
+            await repo.save(Entity(id=str(i), name=f"E{i}", price=float(i), in_stock=i % 2 == 0))
+        await repo.update(Entity(id="3", name="Renamed", price=99.0))
+        await repo.delete("4")
+
+    query = EntityQuery(in_stock=True, min_price=10)
+    assert await columnar_repo.list_all() == await dict_repo.list_all()
+    assert await columnar_repo.find(query) == await dict_repo.find(query)
+    assert await columnar_repo.get_entity_by_id("3") == await dict_repo.get_entity_by_id("3")
+    assert (await columnar_repo.list_page(limit=7)).entities == (
+        await dict_repo.list_page(limit=7)
+    ).entities
+
+
+def test_container_selects_storage_engine_from_settings() -> None:
+    """Test the container builds the memory backend on the configured engine."""
+    container = Container(Settings(storage_engine="columnar", metrics_enabled=False))
+    repository = container.repository
+    assert isinstance(repository, MemoryRepository)
+    assert isinstance(repository._items, ColumnarEntityStore)
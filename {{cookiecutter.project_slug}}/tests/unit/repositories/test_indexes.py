@@ -0,0 +1,130 @@
+"""Tests for in-memory repository index structures."""
+
+import pytest
+
+from app.repositories.cursor import decode_cursor
+from app.repositories.cursor import encode_cursor
+from app.repositories.indexes import BooleanIndex
+from app.repositories.indexes import OrderedIndex
+from app.repositories.indexes import PrefixIndex
+from app.repositories.indexes import RangeIndex
+
+
+def test_ordered_index_keeps_insertion_order() -> None:
+    """Test that keys are yielded in insertion order."""
+    index = OrderedIndex()
+    for key in ("b", "a", "c"):
+        index.add(key)
+    assert [key for _, key in index.iter_after()] == ["b", "a", "c"]
+    assert len(index) == 3
+
+
+def test_ordered_index_readd_keeps_position() -> None:
+    """Test that re-adding an existing key does not move it."""
+    index = OrderedIndex()
+    first = index.add("a")
+    index.add("b")
+    assert index.add("a") == first
+    assert [key for _, key in index.iter_after()] == ["a", "b"]
+
+
+def test_ordered_index_iter_after_seeks_past_removed_keys() -> None:
+    """Test scanning after a sequence number whose key was removed."""
+    index = OrderedIndex()
+    seqs = {key: index.add(key) for key in ("a", "b", "c", "d")}
+    index.remove("b")
+    assert [key for _, key in index.iter_after(seqs["b"])] == ["c", "d"]
+    assert "b" not in index
+    assert index.seq_of("b") is None
+
+
+def test_ordered_index_compacts_tombstones() -> None:
+    """Test that heavy removal keeps order and live keys intact."""
+    index = OrderedIndex()
+    for i in range(1000):
+        index.add(str(i))
+    for i in range(0, 1000, 3):
+        index.remove(str(i))
+    for i in range(1, 1000, 3):
+        index.remove(str(i))
+    remaining = [key for _, key in index.iter_after()]
+    assert remaining == [str(i) for i in range(2, 1000, 3)]
+    assert len(index) == len(remaining)
+
+
+def test_cursor_round_trip() -> None:
+    """Test that cursors decode to the encoded position."""
+    assert decode_cursor(encode_cursor(42)) == 42
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "!!!"])
+def test_decode_invalid_cursor_raises_error(cursor: str) -> None:
+    """Test that malformed cursors raise ValueError."""
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_range_index_between_bounds() -> None:
+    """Test inclusive range lookups with open and closed bounds."""
+    index = RangeIndex()
+    for key, value in {"a": 5.0, "b": 1.0, "c": 10.0, "d": 5.0}.items():
+        index.put(key, value)
+
+    assert sorted(index.between(5.0, 5.0)) == ["a", "d"]
+    assert sorted(index.between(low=5.0)) == ["a", "c", "d"]
+    assert sorted(index.between(high=4.0)) == ["b"]
+    assert index.count(1.0, 10.0) == 4
+    assert index.count(11.0, None) == 0
+
+
+def test_range_index_put_replaces_value() -> None:
+    """Test that re-indexing a key moves it to its new value."""
+    index = RangeIndex()
+    index.put("a", 1.0)
+    index.put("a", 9.0)
+    assert list(index.between(0.0, 2.0)) == []
+    assert list(index.between(8.0, 10.0)) == ["a"]
+    index.remove("a")
+    assert len(index) == 0
+
+
+def test_put_many_matches_individual_puts() -> None:
+    """Test bulk indexing gives the same result as one put per key."""
+    bulk = RangeIndex()
+    bulk.put("a", 5.0)
+    bulk.put_many([("b", 1.0), ("a", 3.0), ("c", 2.0)])
+    names = PrefixIndex()
+    names.put_many([("1", "pear"), ("2", "peach"), ("3", "plum")])
+
+    assert list(bulk.between(None, None)) == ["b", "c", "a"]
+    assert len(bulk) == 3
+    assert sorted(names.prefix("pea")) == ["1", "2"]
+    names.put("2", "apple")
+    assert sorted(names.prefix("pea")) == ["1"]
+
+
+def test_prefix_index_prefix_lookup() -> None:
+    """Test prefix lookups return exactly the matching keys."""
+    index = PrefixIndex()
+    for key, value in {"1": "apple", "2": "apricot", "3": "banana", "4": "ap"}.items():
+        index.put(key, value)
+
+    assert sorted(index.prefix("ap")) == ["1", "2", "4"]
+    assert sorted(index.prefix("apr")) == ["2"]
+    assert list(index.prefix("c")) == []
+    assert index.count("a") == 3
+
+    index.put("2", "cherry")
+    assert sorted(index.prefix("ap")) == ["1", "4"]
+
+
+def test_boolean_index_moves_keys_between_sets() -> None:
+    """Test that re-indexing a key moves it to the other set."""
+    index = BooleanIndex()
+    index.put("a", True)
+    index.put("b", False)
+    index.put("a", False)
+    assert index.keys(True) == set()
+    assert index.keys(False) == {"a", "b"}
+    index.remove("b")
+    assert index.count(False) == 1
@@ -0,0 +1,52 @@
+"""Instrumented repository tests."""
+
+import pytest
+
+from app.core.config import Settings
+from app.core.container import Container
+from app.core.metrics import registry
+from app.domain.models import Entity
+from app.repositories.instrumented_repository import InstrumentedRepository
+from app.repositories.memory_repository import MemoryRepository
+
+
+def _sample(name: str, operation: str) -> float:
+    """Return the current value of a repository metric sample for `operation`."""
+    prefix = name + '{operation="' + operation + '"} '
+    for line in registry.expose().splitlines():
+        if line.startswith(prefix):
+            return float(line.removeprefix(prefix))
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_operations_are_timed_and_errors_counted() -> None:
+    """Test each operation records a duration, and failures are counted as errors."""
+    repo = InstrumentedRepository(MemoryRepository())
+    operations = ("save", "get_entity_by_id", "list_all", "update", "delete")
+    count = "repository_operation_duration_seconds_count"
+    before = {op: _sample(count, op) for op in operations}
+    errors_before = _sample("repository_operation_errors_total", "delete")
+
+    saved = await repo.save(Entity(id="1", name="A", price=1.0))
+    assert await repo.get_entity_by_id("1") == saved
+    assert await repo.list_all() == [saved]
+    await repo.update(Entity(id="1", name="B", price=2.0))
+    await repo.delete("1")
+    with pytest.raises(ValueError, match="not found"):
+        await repo.delete("1")
+
+    assert {op: _sample(count, op) - before[op] for op in operations} == {
+        "save": 1,
+        "get_entity_by_id": 1,
+        "list_all": 1,
+        "update": 1,
+        "delete": 2,
+    }
+    assert _sample("repository_operation_errors_total", "delete") - errors_before == 1
+
+
+def test_container_instruments_repository_when_metrics_enabled() -> None:
+    """Test the container times the backend only when metrics are enabled."""
+    assert isinstance(Container(Settings()).repository, InstrumentedRepository)
+    assert isinstance(Container(Settings(metrics_enabled=False)).repository, MemoryRepository)
@@ -10,7 +10,10 @@ To create repository tests:
 import pytest
 
 {% if cookiecutter.include_entity_example == "yes" %}
+from app.domain.errors import EntityVersionConflictError
 from app.domain.models import Entity
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
 {% endif %}
 from app.repositories.memory_repository import MemoryRepository
 
@@ -57,6 +60,178 @@ async def test_repository_list_all_with_pagination() -> None:
     # Test offset and limit
     items = await repo.list_all(offset=1, limit=2)
     assert len(items) == 2
+    assert [item.id for item in items] == ["1", "2"]
+
+    # Test offset past the end
+    items = await repo.list_all(offset=10)
+    assert items == []
+
+
+@pytest.mark.asyncio
+async def test_repository_list_page_walks_all_entities() -> None:
+    """Test following cursors visits every entity exactly once."""
+    repo = MemoryRepository()
+    for i in range(5):
+        await repo.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+
+    seen: list[str] = []
+    page = await repo.list_page(limit=2)
+    seen.extend(e.id for e in page.entities)
+    while page.next_cursor is not None:
+        page = await repo.list_page(limit=2, cursor=page.next_cursor)
+        seen.extend(e.id for e in page.entities)
+
+    assert seen == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_repository_list_page_stable_under_concurrent_changes() -> None:
+    """Test that inserts and deletes between pages do not skip or repeat entities."""
+    repo = MemoryRepository()
+    for i in range(4):
+        await repo.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+
+    first = await repo.list_page(limit=2)
+    assert [e.id for e in first.entities] == ["0", "1"]
+
+    # Delete the cursor entity and one already seen, insert a new one
+    await repo.delete("1")
+    await repo.delete("0")
+    await repo.save(Entity(id="4", name="Entity 4", price=4.0))
+
+    second = await repo.list_page(limit=2, cursor=first.next_cursor)
+    assert [e.id for e in second.entities] == ["2", "3"]
+    third = await repo.list_page(limit=2, cursor=second.next_cursor)
+    assert [e.id for e in third.entities] == ["4"]
+    assert third.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_repository_list_page_invalid_cursor() -> None:
+    """Test that a malformed cursor raises error."""
+    repo = MemoryRepository()
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await repo.list_page(limit=2, cursor="bogus")
+
+
+@pytest.mark.asyncio
+async def test_repository_iter_all_yields_chunks() -> None:
+    """Test iterating over all entities in bounded chunks."""
+    repo = MemoryRepository()
+    for i in range(5):
+        await repo.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+
+    chunks = [chunk async for chunk in repo.iter_all(chunk_size=2)]
+
+    assert [[e.id for e in chunk] for chunk in chunks] == [["0", "1"], ["2", "3"], ["4"]]
+
+
+@pytest.mark.asyncio
+async def test_repository_iter_all_tolerates_writes_between_chunks() -> None:
+    """Test that deletes and inserts during iteration do not break it."""
+    repo = MemoryRepository()
+    for i in range(4):
+        await repo.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+
+    seen: list[str] = []
+    async for chunk in repo.iter_all(chunk_size=2):
+        seen.extend(e.id for e in chunk)
+        if seen == ["0", "1"]:
+            await repo.delete("1")
+            await repo.delete("2")
+            await repo.save(Entity(id="4", name="Entity 4", price=4.0))
+
+    assert seen == ["0", "1", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_repository_count() -> None:
+    """Test counting entities in repository."""
+    repo = MemoryRepository()
+    assert await repo.count() == 0
+
+    for i in range(3):
+        await repo.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+    assert await repo.count() == 3
+
+    await repo.delete("0")
+    assert await repo.count() == 2
+
+
+@pytest.mark.asyncio
+async def test_repository_get_many() -> None:
+    """Test fetching several entities by ID, leaving out missing ones."""
+    repo = MemoryRepository()
+    for i in range(3):
+        await repo.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+
+    found = await repo.get_many(["2", "missing", "0", "2"])
+    assert found == {
+        "2": Entity(id="2", name="Entity 2", price=2.0),
+        "0": Entity(id="0", name="Entity 0", price=0.0),
+    }
+    assert await repo.get_many([]) == {}
+
+
+async def _seed_catalog(repo: MemoryRepository) -> None:
+    catalog = [
+        ("1", "Widget", 5.0, True),
+        ("2", "Widget XL", 15.0, True),
+        ("3", "Gadget", 8.0, False),
+        ("4", "Wine", 25.0, True),
+        ("5", "Gizmo", 12.0, True),
+    ]
+    for entity_id, name, price, in_stock in catalog:
+        await repo.save(Entity(id=entity_id, name=name, price=price, in_stock=in_stock))
+
+
+@pytest.mark.asyncio
+async def test_repository_find_with_filters() -> None:
+    """Test querying entities through the secondary indexes."""
+    repo = MemoryRepository()
+    await _seed_catalog(repo)
+
+    in_stock_range = EntityQuery(in_stock=True, min_price=5.0, max_price=15.0)
+    assert [e.id for e in await repo.find(in_stock_range)] == ["1", "2", "5"]
+    assert await repo.count(in_stock_range) == 3
+
+    by_prefix = EntityQuery(name_prefix="Wi")
+    assert [e.id for e in await repo.find(by_prefix)] == ["1", "2", "4"]
+    assert await repo.count(by_prefix) == 3
+
+    out_of_stock = EntityQuery(in_stock=False)
+    assert [e.id for e in await repo.find(out_of_stock)] == ["3"]
+
+    # Pagination applies to the ordered matches
+    assert [e.id for e in await repo.find(by_prefix, offset=1, limit=1)] == ["2"]
+
+
+@pytest.mark.asyncio
+async def test_repository_indexes_follow_updates_and_deletes() -> None:
+    """Test that writes keep the secondary indexes current."""
+    repo = MemoryRepository()
+    await _seed_catalog(repo)
+
+    await repo.update(Entity(id="3", name="Widget Mini", price=3.0, in_stock=True))
+    await repo.delete("2")
+
+    assert [e.id for e in await repo.find(EntityQuery(name_prefix="Widget"))] == ["1", "3"]
+    assert await repo.count(EntityQuery(in_stock=False)) == 0
+    assert await repo.count(EntityQuery(max_price=5.0)) == 2
+
+
+@pytest.mark.asyncio
+async def test_repository_list_page_with_query() -> None:
+    """Test cursor pagination over filtered results."""
+    repo = MemoryRepository()
+    await _seed_catalog(repo)
+    query = EntityQuery(in_stock=True)
+
+    page = await repo.list_page(limit=2, query=query)
+    assert [e.id for e in page.entities] == ["1", "2"]
+    page = await repo.list_page(limit=2, cursor=page.next_cursor, query=query)
+    assert [e.id for e in page.entities] == ["4", "5"]
+    assert page.next_cursor is None
 
 
 @pytest.mark.asyncio
@@ -105,6 +280,117 @@ async def test_repository_delete_not_found() -> None:
 
     with pytest.raises(ValueError, match="Entity with id '1' not found"):
         await repo.delete("1")
+
+
+@pytest.mark.asyncio
+async def test_repository_save_many() -> None:
+    """Test saving a batch of entities."""
+    repo = MemoryRepository()
+    entities = [Entity(id=str(i), name=f"Entity {i}", price=float(i)) for i in range(3)]
+
+    results = await repo.save_many(entities)
+
+    assert [r.entity_id for r in results] == ["0", "1", "2"]
+    assert all(r.ok for r in results)
+    assert await repo.count() == 3
+
+
+@pytest.mark.asyncio
+async def test_repository_update_many_reports_missing_items() -> None:
+    """Test that a missing entity fails alone without aborting the batch."""
+    repo = MemoryRepository()
+    await repo.save(Entity(id="1", name="Original", price=1.0))
+
+    results = await repo.update_many(
+        [
+            Entity(id="missing", name="Ghost", price=1.0),
+            Entity(id="1", name="Updated", price=2.0),
+        ]
+    )
+
+    assert not results[0].ok
+    assert isinstance(results[0].error, ValueError)
+    assert results[1].ok
+    retrieved = await repo.get_entity_by_id("1")
+    assert retrieved is not None
+    assert retrieved.name == "Updated"
+
+
+@pytest.mark.asyncio
+async def test_repository_delete_many_reports_missing_items() -> None:
+    """Test deleting a batch where some IDs do not exist."""
+    repo = MemoryRepository()
+    await repo.save_many([Entity(id=str(i), name=f"Entity {i}", price=1.0) for i in range(3)])
+
+    results = await repo.delete_many(["0", "missing", "2"])
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert [e.id for e in await repo.list_all()] == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_repository_assigns_increasing_versions() -> None:
+    """Test every write returns the entity under a new, higher version."""
+    repo = MemoryRepository()
+    created = await repo.save(Entity(id="1", name="Entity", price=1.0))
+    assert created.version == 1
+    updated = await repo.update(Entity(id="1", name="Renamed", price=1.0))
+    assert updated.version > created.version
+    retrieved = await repo.get_entity_by_id("1")
+    assert retrieved is not None
+    assert retrieved.version == updated.version
+
+
+@pytest.mark.asyncio
+async def test_repository_revision_changes_on_every_write() -> None:
+    """Test the store-wide revision moves on saves, updates and deletes only."""
+    repo = MemoryRepository()
+    assert await repo.get_revision() == 0
+    await repo.save(Entity(id="1", name="Entity", price=1.0))
+    after_save = await repo.get_revision()
+    await repo.list_all()
+    await repo.get_entity_by_id("1")
+    assert await repo.get_revision() == after_save
+    await repo.delete("1")
+    assert await repo.get_revision() > after_save
+
+
+@pytest.mark.asyncio
+async def test_repository_update_with_expected_version() -> None:
+    """Test a stale expected_version is rejected without applying the update."""
+    repo = MemoryRepository()
+    created = await repo.save(Entity(id="1", name="Entity", price=1.0))
+
+    with pytest.raises(EntityVersionConflictError):
+        await repo.update(
+            Entity(id="1", name="Stale", price=1.0), expected_version=created.version + 1
+        )
+    updated = await repo.update(
+        Entity(id="1", name="Fresh", price=1.0), expected_version=created.version
+    )
+
+    assert updated.name == "Fresh"
+    retrieved = await repo.get_entity_by_id("1")
+    assert retrieved is not None
+    assert retrieved.name == "Fresh"
+
+
+@pytest.mark.asyncio
+async def test_repository_patch() -> None:
+    """Test a patch changes only the given fields, keeps indexes current and checks versions."""
+    repo = MemoryRepository()
+    created = await repo.save(Entity(id="1", name="Entity", price=1.0, in_stock=True))
+
+    patched = await repo.patch("1", EntityPatch(price=5.0), expected_version=created.version)
+
+    assert patched == Entity(id="1", name="Entity", price=5.0, in_stock=True)
+    assert patched.version > created.version
+    assert [e.id for e in await repo.find(EntityQuery(min_price=4.0))] == ["1"]
+    with pytest.raises(EntityVersionConflictError):
+        await repo.patch("1", EntityPatch(name="Stale"), expected_version=created.version)
+    with pytest.raises(ValueError, match="not found"):
+        await repo.patch("2", EntityPatch(name="Missing"))
+    assert await repo.get_entity_by_id("1") == patched
 {% else %}
 # Example: Add your repository tests here
 # 
@@ -0,0 +1,224 @@
+"""Write-ahead log persistence tests."""
+
+import asyncio
+import os
+import threading
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.api.router import app
+from app.core.config import Settings
+from app.core.container import Container
+from app.domain.models import Entity
+from app.domain.models import EntityPatch
+from app.repositories.memory_repository import MemoryRepository
+from app.repositories.persistent_repository import PersistentRepository
+
+
+def _open(directory: Path, **options: float) -> PersistentRepository:
+    return PersistentRepository(MemoryRepository(), str(directory), **options)
+
+
+async def _reopen(directory: Path) -> PersistentRepository:
+    repository = _open(directory)
+    await repository.recover()
+    return repository
+
+
+@pytest_asyncio.fixture
+async def repo(tmp_path: Path) -> AsyncIterator[PersistentRepository]:
+    """Create a recovered repository logging to a temporary directory."""
+    repository = await _reopen(tmp_path)
+    yield repository
+    await repository.close()
+
+
+@pytest.mark.asyncio
+async def test_writes_survive_restart(repo: PersistentRepository, tmp_path: Path) -> None:
+    """Test every kind of write is recovered with its version and the revision."""
+    await repo.save_many([Entity(id=str(i), name=f"E{i}", price=float(i)) for i in range(5)])
+    await repo.clear()
+    await repo.save_many([Entity(id=str(i), name=f"E{i}", price=float(i)) for i in range(5)])
+    await repo.update(Entity(id="1", name="Renamed", price=10.0, in_stock=False))
+    await repo.delete("2")
+    await repo.delete_many(["3", "missing"])
+    await repo.update_many([Entity(id="4", name="Four", price=4.5)])
+    await repo.patch("0", EntityPatch(price=0.5))
+    expected = await repo.list_all()
+    revision = await repo.get_revision()
+    await repo.close()
+
+    recovered = await _reopen(tmp_path)
+    entities = await recovered.list_all()
+    assert entities == expected
+    assert [e.version for e in entities] == [e.version for e in expected]
+    assert await recovered.get_revision() == revision
+    await recovered.close()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_replaces_covered_log(repo: PersistentRepository, tmp_path: Path) -> None:
+    """Test a snapshot drops old segments and recovery replays the log after it."""
+    for i in range(20):
+        await repo.save(Entity(id=str(i), name=f"E{i}", price=float(i)))
+    await repo.snapshot()
+    await repo.delete("0")
+    await repo.save(Entity(id="20", name="E20", price=20.0))
+    expected = await repo.list_all()
+    await repo.close()
+
+    assert [p.name for p in sorted(tmp_path.glob("wal-*.log"))] == ["wal-0000000002.log"]
+    recovered = await _reopen(tmp_path)
+    assert await recovered.list_all() == expected
+    assert await recovered.get_revision() == 22
+    await recovered.close()
+
+
+@pytest.mark.asyncio
+async def test_torn_tail_is_discarded(repo: PersistentRepository, tmp_path: Path) -> None:
+    """Test a partial record at the end of the log is dropped, not fatal."""
+    await repo.save(Entity(id="1", name="A", price=1.0))
+    await repo.close()
+    segment = next(tmp_path.glob("wal-*.log"))
+    with segment.open("ab") as file:
+        file.write(b"\x40\x00\x00\x00partial")
+
+    recovered = await _reopen(tmp_path)
+    assert await recovered.list_all() == [Entity(id="1", name="A", price=1.0)]
+    await recovered.save(Entity(id="2", name="B", price=2.0))
+    await recovered.close()
+    assert len(await (await _reopen(tmp_path)).list_all()) == 2
+
+
+@pytest.mark.asyncio
+async def test_corrupt_segment_before_the_last_fails_recovery(
+    repo: PersistentRepository, tmp_path: Path
+) -> None:
+    """Test corruption anywhere but the tail stops recovery."""
+    await repo.save(Entity(id="1", name="A", price=1.0))
+    await repo.close()
+    first = next(tmp_path.glob("wal-*.log"))
+    reopened = await _reopen(tmp_path)
+    await reopened.save(Entity(id="2", name="B", price=2.0))
+    await reopened.close()
+    first.write_bytes(first.read_bytes()[:-3])
+
+    with pytest.raises(ValueError, match="Corrupt log segment"):
+        await _reopen(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_fsyncs(
+    repo: PersistentRepository, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test group commit: concurrent writers are made durable by a few fsyncs."""
+    fsyncs = 0
+    real_fsync = os.fsync
+
+    def counting_fsync(fd: int) -> None:
+        nonlocal fsyncs
+        fsyncs += 1
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", counting_fsync)
+    await asyncio.gather(*(repo.save(Entity(id=str(i), name="E", price=1.0)) for i in range(50)))
+    assert 1 <= fsyncs < 5
+    assert await repo.count() == 50
+
+
+@pytest.mark.asyncio
+async def test_health_reports_recovery(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test /health is 503 until the container has recovered persisted data."""
+    container = Container(
+        Settings(persistence_enabled=True, persistence_dir=str(tmp_path), metrics_enabled=False)
+    )
+    assert isinstance(container.repository, PersistentRepository)
+    monkeypatch.setattr("app.api.router.get_container", lambda: container)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/health")
+        assert response.status_code == 503
+        assert response.json() == {"status": "recovering"}
+        await container.recover()
+        assert (await client.get("/health")).json() == {"status": "healthy"}
+    await container.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failed_commit_fails_the_repository(
+    repo: PersistentRepository, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a write whose commit fails is not served afterwards, nor anything else."""
+    await repo.save(Entity(id="1", name="A", price=1.0))
+
+    def failing_write(fd: int, data: bytes) -> None:
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(repo, "_write", failing_write)
+    with pytest.raises(OSError, match="No space left"):
+        await repo.save(Entity(id="2", name="B", price=2.0))
+    assert isinstance(repo.failure, OSError)
+    with pytest.raises(OSError, match="restart to recover"):
+        await repo.get_entity_by_id("2")
+    with pytest.raises(OSError, match="restart to recover"):
+        await repo.save(Entity(id="3", name="C", price=3.0))
+    await repo.close()
+
+    recovered = await _reopen(tmp_path)
+    assert await recovered.list_all() == [Entity(id="1", name="A", price=1.0, version=1)]
+    await recovered.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_commit_still_releases_its_writers(
+    repo: PersistentRepository, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a commit cancelled during its write finishes it and releases the waiting writer."""
+    started = threading.Event()
+    release = threading.Event()
+    write = repo._write
+
+    def slow_write(fd: int, data: bytes) -> None:
+        started.set()
+        release.wait(5)
+        write(fd, data)
+
+    monkeypatch.setattr(repo, "_write", slow_write)
+    writer = asyncio.create_task(repo.save(Entity(id="1", name="A", price=1.0)))
+    await asyncio.to_thread(started.wait, 5)
+    committer = repo._committer
+    assert committer is not None
+    committer.cancel()
+    await asyncio.wait([committer])
+    release.set()
+    await asyncio.wait_for(writer, 5)
+    await repo.close()
+
+    recovered = await _reopen(tmp_path)
+    assert await recovered.count() == 1
+    await recovered.close()
+
+
+@pytest.mark.asyncio
+async def test_container_startup_recovers_before_ready(tmp_path: Path) -> None:
+    """Test container startup recovers persisted data and shutdown makes it not ready."""
+    settings = Settings(
+        persistence_enabled=True, persistence_dir=str(tmp_path), metrics_enabled=False
+    )
+    first = Container(settings)
+    await first.startup()
+    await first.repository.save(Entity(id="1", name="A", price=1.0))
+    await first.shutdown()
+    assert not first.ready
+
+    container = Container(settings)
+    assert not container.ready
+    await container.startup()
+    assert container.recovered
+    assert container.ready
+    assert await container.repository.count() == 1
+    await container.shutdown()
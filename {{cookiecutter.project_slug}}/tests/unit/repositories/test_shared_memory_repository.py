@@ -0,0 +1,193 @@
+"""Shared memory repository tests."""
+
+import asyncio
+import multiprocessing
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+from app.core.config import Settings
+from app.core.container import Container
+from app.domain.errors import EntityVersionConflictError
+from app.domain.models import Entity
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
+from app.repositories.memory_repository import MemoryRepository
+from app.repositories.shared_memory_repository import MAX_NAME_BYTES
+from app.repositories.shared_memory_repository import SharedMemoryRepository
+
+
+@pytest_asyncio.fixture
+async def repo(tmp_path: Path) -> AsyncIterator[SharedMemoryRepository]:
+    """Create a repository backed by a temporary store file."""
+    repository = SharedMemoryRepository(str(tmp_path / "store.shm"), capacity=64)
+    yield repository
+    await repository.close()
+
+
+@pytest.mark.asyncio
+async def test_behaves_like_memory_repository(repo: SharedMemoryRepository) -> None:
+    """Test the repository returns the same results as MemoryRepository."""
+    reference = MemoryRepository()
+    for target in (reference, repo):
+        for i in range(30):
+            await target.save(Entity(id=str(i), name=f"E{i}", price=float(i), in_stock=i % 2 == 0))
+        await target.update(Entity(id="3", name="Renamed", price=99.0))
+        await target.delete("4")
+        await target.save(Entity(id="4", name="Back", price=4.0))
+
+    query = EntityQuery(in_stock=True, min_price=10)
+    assert await repo.list_all() == await reference.list_all()
+    assert await repo.list_all(offset=5, limit=3) == await reference.list_all(offset=5, limit=3)
+    assert await repo.find(query, offset=1) == await reference.find(query, offset=1)
+    assert await repo.count(query) == await reference.count(query)
+    assert await repo.count() == 30
+    assert await repo.get_revision() == await reference.get_revision()
+    assert await repo.get_entity_by_id("4") == Entity(id="4", name="Back", price=4.0)
+    assert await repo.get_entity_by_id("missing") is None
+    ids = ["4", "missing", "3"]
+    assert await repo.get_many(ids) == await reference.get_many(ids)
+
+
+@pytest.mark.asyncio
+async def test_pages_and_chunks_follow_insertion_order(repo: SharedMemoryRepository) -> None:
+    """Test cursor pages and iter_all chunks cover every entity exactly once."""
+    for i in range(25):
+        await repo.save(Entity(id=str(i), name=f"E{i}", price=float(i)))
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = await repo.list_page(limit=10, cursor=cursor)
+        seen.extend(e.id for e in page.entities)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    chunks = [[e.id for e in chunk] async for chunk in repo.iter_all(chunk_size=10)]
+
+    assert seen == [str(i) for i in range(25)]
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    filtered = await repo.list_page(limit=50, query=EntityQuery(name_prefix="E1"))
+    assert [e.id for e in filtered.entities] == ["1", *(str(i) for i in range(10, 20))]
+
+
+@pytest.mark.asyncio
+async def test_versions_and_conflicts(repo: SharedMemoryRepository) -> None:
+    """Test writes assign the store revision as version and honour expected_version."""
+    first = await repo.save(Entity(id="1", name="A", price=1.0))
+    second = await repo.update(Entity(id="1", name="B", price=2.0), expected_version=1)
+    assert (first.version, second.version) == (1, 2)
+
+    with pytest.raises(EntityVersionConflictError):
+        await repo.update(Entity(id="1", name="C", price=3.0), expected_version=1)
+    with pytest.raises(ValueError, match="not found"):
+        await repo.update(Entity(id="2", name="C", price=3.0))
+    with pytest.raises(ValueError, match="not found"):
+        await repo.delete("2")
+    with pytest.raises(ValueError, match="cannot exceed"):
+        await repo.save(Entity(id="3", name="x" * (MAX_NAME_BYTES + 1), price=1.0))
+
+
+@pytest.mark.asyncio
+async def test_patch(repo: SharedMemoryRepository) -> None:
+    """Test a patch changes only the given fields under the write lock and checks versions."""
+    created = await repo.save(Entity(id="1", name="A", price=1.0))
+
+    patched = await repo.patch("1", EntityPatch(in_stock=False), expected_version=1)
+
+    assert (patched, patched.version) == (Entity(id="1", name="A", price=1.0, in_stock=False), 2)
+    with pytest.raises(EntityVersionConflictError):
+        await repo.patch("1", EntityPatch(name="B"), expected_version=created.version)
+    with pytest.raises(ValueError, match="not found"):
+        await repo.patch("2", EntityPatch(name="B"))
+    assert await repo.get_entity_by_id("1") == patched
+
+
+@pytest.mark.asyncio
+async def test_full_store_compacts_deleted_records(tmp_path: Path) -> None:
+    """Test deleted records are reclaimed once the store is full, keeping order."""
+    repo = SharedMemoryRepository(str(tmp_path / "small.shm"), capacity=4)
+    for i in range(4):
+        await repo.save(Entity(id=str(i), name=f"E{i}", price=1.0))
+    await repo.delete("0")
+    await repo.delete("2")
+    await repo.save(Entity(id="4", name="E4", price=1.0))
+    await repo.save(Entity(id="5", name="E5", price=1.0))
+
+    assert [e.id for e in await repo.list_all()] == ["1", "3", "4", "5"]
+    assert await repo.get_entity_by_id("3") == Entity(id="3", name="E3", price=1.0)
+    results = await repo.save_many([Entity(id="6", name="E6", price=1.0)])
+    assert isinstance(results[0].error, ValueError)
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_store_is_shared_between_mappings(tmp_path: Path) -> None:
+    """Test a second mapping sees writes and keeps the original capacity."""
+    path = str(tmp_path / "store.shm")
+    writer = SharedMemoryRepository(path, capacity=8)
+    reader = SharedMemoryRepository(path, capacity=1_000)
+    await writer.save(Entity(id="1", name="A", price=1.0))
+    assert await reader.get_entity_by_id("1") == Entity(id="1", name="A", price=1.0)
+    await reader.delete("1")
+    assert await writer.count() == 0
+    assert reader._capacity == 8
+    await writer.close()
+    await reader.close()
+
+    not_a_store = tmp_path / "other.shm"
+    not_a_store.write_bytes(b"x" * 100)
+    with pytest.raises(ValueError, match="not a compatible"):
+        SharedMemoryRepository(str(not_a_store))
+
+
+def _save_from_process(path: str, prefix: str, count: int) -> None:
+    """Save `count` entities from a separate process."""
+
+    async def run() -> None:
+        repo = SharedMemoryRepository(path)
+        for i in range(count):
+            await repo.save(Entity(id=f"{prefix}{i}", name=prefix, price=float(i)))
+        await repo.close()
+
+    asyncio.run(run())
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork start method"
+)
+@pytest.mark.asyncio
+async def test_concurrent_writers_in_separate_processes(tmp_path: Path) -> None:
+    """Test writes from several processes all land with distinct versions."""
+    path = str(tmp_path / "store.shm")
+    repo = SharedMemoryRepository(path, capacity=64)
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=_save_from_process, args=(path, prefix, 15)) for prefix in "abc"
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+    entities = await repo.list_all()
+    assert len(entities) == 45
+    assert sorted(e.version for e in entities) == list(range(1, 46))
+    assert await repo.get_revision() == 45
+    await repo.close()
+
+
+def test_container_selects_shared_repository(tmp_path: Path) -> None:
+    """Test the container builds the shared backend from settings."""
+    settings = Settings(
+        repository_type="shared",
+        shared_store_path=str(tmp_path / "app.shm"),
+        shared_store_capacity=16,
+        metrics_enabled=False,
+    )
+    repository = Container(settings).repository
+    assert isinstance(repository, SharedMemoryRepository)
+    asyncio.run(repository.close())
@@ -0,0 +1,251 @@
+"""SQLite repository tests."""
+
+import asyncio
+import sqlite3
+import threading
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+from app.core.config import Settings
+from app.core.container import Container
+from app.domain.errors import EntityVersionConflictError
+from app.domain.models import Entity
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
+from app.repositories.memory_repository import MemoryRepository
+from app.repositories.sqlite_repository import SqliteRepository
+
+
+@pytest_asyncio.fixture
+async def repo(tmp_path: Path) -> AsyncIterator[SqliteRepository]:
+    """Create a repository backed by a temporary database file."""
+    repository = SqliteRepository(str(tmp_path / "test.db"), pool_size=2)
+    yield repository
+    await repository.close()
+
+
+@pytest.mark.asyncio
+async def test_save_and_get(repo: SqliteRepository) -> None:
+    """Test saving an entity and reading it back."""
+    await repo.save(Entity(id="1", name="Widget", price=9.5, in_stock=False))
+    entity = await repo.get_entity_by_id("1")
+    assert entity == Entity(id="1", name="Widget", price=9.5, in_stock=False)
+    assert await repo.get_entity_by_id("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_save_replaces_existing_keeping_position(repo: SqliteRepository) -> None:
+    """Test saving an existing ID replaces it without moving it to the end."""
+    await repo.save(Entity(id="1", name="A", price=1.0))
+    await repo.save(Entity(id="2", name="B", price=2.0))
+    await repo.save(Entity(id="1", name="A2", price=3.0))
+    items = await repo.list_all()
+    assert [(e.id, e.name) for e in items] == [("1", "A2"), ("2", "B")]
+
+
+@pytest.mark.asyncio
+async def test_get_many_across_parameter_chunks(repo: SqliteRepository) -> None:
+    """Test fetching more IDs than one statement binds, leaving out missing ones."""
+    await repo.save_many([Entity(id=str(i), name=f"E{i}", price=float(i)) for i in range(700)])
+    ids = [str(i) for i in range(0, 1400, 2)]
+    found = await repo.get_many([*ids, "0"])
+    assert sorted(found, key=int) == [str(i) for i in range(0, 700, 2)]
+    assert found["698"] == Entity(id="698", name="E698", price=698.0)
+
+
+@pytest.mark.asyncio
+async def test_list_all_pagination(repo: SqliteRepository) -> None:
+    """Test offset/limit pagination in insertion order."""
+    for i in range(5):
+        await repo.save(Entity(id=str(i), name=f"E{i}", price=float(i)))
+    items = await repo.list_all(offset=1, limit=2)
+    assert [e.id for e in items] == ["1", "2"]
+    assert [e.id for e in await repo.list_all(offset=3)] == ["3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete(repo: SqliteRepository) -> None:
+    """Test updating and deleting entities, including missing ones."""
+    await repo.save(Entity(id="1", name="A", price=1.0))
+    await repo.update(Entity(id="1", name="B", price=2.0))
+    assert await repo.get_entity_by_id("1") == Entity(id="1", name="B", price=2.0)
+    with pytest.raises(ValueError, match="not found"):
+        await repo.update(Entity(id="2", name="X", price=1.0))
+    await repo.delete("1")
+    assert await repo.count() == 0
+    with pytest.raises(ValueError, match="not found"):
+        await repo.delete("1")
+
+
+@pytest.mark.asyncio
+async def test_patch(repo: SqliteRepository) -> None:
+    """Test a patch changes only the given fields in one write and checks versions."""
+    created = await repo.save(Entity(id="1", name="A", price=1.0, in_stock=False))
+
+    patched = await repo.patch("1", EntityPatch(name="B"), expected_version=created.version)
+
+    assert patched == Entity(id="1", name="B", price=1.0, in_stock=False)
+    assert patched.version == await repo.get_revision()
+    with pytest.raises(EntityVersionConflictError):
+        await repo.patch("1", EntityPatch(price=2.0), expected_version=created.version)
+    with pytest.raises(ValueError, match="not found"):
+        await repo.patch("2", EntityPatch(price=2.0))
+    stored = await repo.get_entity_by_id("1")
+    assert stored == patched
+    assert stored is not None and stored.version == patched.version
+
+
+@pytest.mark.asyncio
+async def test_queries_match_memory_repository(repo: SqliteRepository) -> None:
+    """Test find/count/list_page agree with MemoryRepository for the same data."""
+    memory = MemoryRepository()
+    for i in range(40):
+        name = f"{'ab' if i % 3 else 'b'}{i}"
+        entity = Entity(id=str(i), name=name, price=float(i % 7), in_stock=i % 2 == 0)
+        await repo.save(entity)
+        await memory.save(entity)
+    queries = [
+        EntityQuery(),
+        EntityQuery(in_stock=True),
+        EntityQuery(min_price=2, max_price=4),
+        EntityQuery(name_prefix="ab"),
+        EntityQuery(in_stock=False, min_price=3, name_prefix="ab1"),
+    ]
+    for query in queries:
+        assert await repo.find(query) == await memory.find(query)
+        assert await repo.find(query, offset=2, limit=3) == await memory.find(
+            query, offset=2, limit=3
+        )
+        assert await repo.count(query) == await memory.count(query)
+
+        collected: list[Entity] = []
+        cursor = None
+        while True:
+            page = await repo.list_page(limit=4, cursor=cursor, query=query)
+            collected.extend(page.entities)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert collected == await memory.find(query)
+
+
+@pytest.mark.asyncio
+async def test_list_page_rejects_invalid_cursor(repo: SqliteRepository) -> None:
+    """Test an invalid cursor raises ValueError."""
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await repo.list_page(limit=2, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_iter_all_chunks(repo: SqliteRepository) -> None:
+    """Test iter_all yields every entity in chunks."""
+    for i in range(7):
+        await repo.save(Entity(id=str(i), name=f"E{i}", price=1.0))
+    chunks = [chunk async for chunk in repo.iter_all(chunk_size=3)]
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert [e.id for chunk in chunks for e in chunk] == [str(i) for i in range(7)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_group_committed(repo: SqliteRepository) -> None:
+    """Test concurrent writes all commit and a failing one doesn't affect others."""
+    await repo.save(Entity(id="existing", name="E", price=1.0))
+    writes = [repo.save(Entity(id=str(i), name=f"E{i}", price=1.0)) for i in range(50)]
+    results = await asyncio.gather(
+        *writes, repo.delete("missing"), repo.delete("existing"), return_exceptions=True
+    )
+    saved = [result for result in results[:50] if isinstance(result, Entity)]
+    assert len({entity.version for entity in saved}) == 50
+    assert isinstance(results[50], ValueError)
+    assert results[51] is None
+    assert await repo.count() == 50
+    assert await repo.get_revision() == 52
+
+
+@pytest.mark.asyncio
+async def test_batch_operations(repo: SqliteRepository) -> None:
+    """Test batch methods report per-item outcomes."""
+    saved = await repo.save_many(
+        [Entity(id="1", name="A", price=1.0), Entity(id="2", name="B", price=2.0)]
+    )
+    assert all(result.ok for result in saved)
+    updated = await repo.update_many(
+        [Entity(id="1", name="A2", price=1.0), Entity(id="3", name="C", price=3.0)]
+    )
+    assert [result.ok for result in updated] == [True, False]
+    deleted = await repo.delete_many(["2", "3"])
+    assert [result.ok for result in deleted] == [True, False]
+    assert await repo.list_all() == [Entity(id="1", name="A2", price=1.0)]
+
+
+@pytest.mark.asyncio
+async def test_data_persists_across_instances(tmp_path: Path) -> None:
+    """Test entities are still present after reopening the database."""
+    url = f"sqlite:///{tmp_path / 'persist.db'}"
+    first = SqliteRepository.from_url(url)
+    await first.save(Entity(id="1", name="A", price=1.0))
+    await first.close()
+    second = SqliteRepository.from_url(url)
+    assert await second.get_entity_by_id("1") == Entity(id="1", name="A", price=1.0)
+    await second.close()
+
+
+def test_from_url_rejects_unsupported_urls() -> None:
+    """Test non-sqlite and in-memory URLs are rejected."""
+    with pytest.raises(ValueError, match="Unsupported database URL"):
+        SqliteRepository.from_url("postgres://localhost/db")
+    with pytest.raises(ValueError, match="not supported"):
+        SqliteRepository.from_url("sqlite:///:memory:")
+
+
+@pytest.mark.asyncio
+async def test_startup_opens_every_reader(repo: SqliteRepository) -> None:
+    """Test startup starts the whole reader pool before the first query."""
+
+    def readers() -> int:
+        return sum(thread.name.startswith("sqlite-read") for thread in threading.enumerate())
+
+    before = readers()
+    await repo.startup()
+    assert readers() - before == 2
+    await repo.save(Entity(id="1", name="A", price=1.0))
+    assert await repo.get_entity_by_id("1") == Entity(id="1", name="A", price=1.0)
+
+
+@pytest.mark.asyncio
+async def test_failed_startup_does_not_block_close(
+    repo: SqliteRepository, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a reader failing to connect fails startup without leaving the others waiting."""
+    connect = repo._connect
+    calls: list[None] = []
+
+    def flaky_connect() -> sqlite3.Connection:
+        calls.append(None)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("unable to open database file")
+        return connect()
+
+    monkeypatch.setattr(repo, "_connect", flaky_connect)
+    with pytest.raises(sqlite3.OperationalError):
+        await repo.startup()
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_container_selects_repository_from_settings(tmp_path: Path) -> None:
+    """Test the container builds the repository configured in settings."""
+    memory = Container(Settings(repository_type="memory", metrics_enabled=False))
+    assert isinstance(memory.repository, MemoryRepository)
+    container = Container(
+        Settings(
+            repository_type="sqlite",
+            database_url=f"sqlite:///{tmp_path / 'app.db'}",
+            metrics_enabled=False,
+        )
+    )
+    assert isinstance(container.repository, SqliteRepository)
+    await container.shutdown()
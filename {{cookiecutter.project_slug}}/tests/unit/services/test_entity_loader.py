@@ -0,0 +1,107 @@
+"""Entity loader tests."""
+
+import asyncio
+from collections.abc import Sequence
+
+import pytest
+
+from app.domain.models import Entity
+from app.repositories.memory_repository import MemoryRepository
+from app.services.entity_loader import EntityLoader
+
+
+class _RecordingRepository(MemoryRepository):
+    """MemoryRepository recording the IDs of each get_many call."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[list[str]] = []
+        self.error: Exception | None = None
+
+    async def get_many(self, entity_ids: Sequence[str]) -> dict[str, Entity]:
+        self.batches.append(list(entity_ids))
+        if self.error is not None:
+            raise self.error
+        return await super().get_many(entity_ids)
+
+
+async def _seeded(count: int) -> _RecordingRepository:
+    repository = _RecordingRepository()
+    for i in range(count):
+        await repository.save(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+    return repository
+
+
+@pytest.mark.asyncio
+async def test_lookups_in_one_tick_share_a_get_many() -> None:
+    """Test concurrent lookups are fetched in one call and later lookups hit the cache."""
+    repository = await _seeded(3)
+    loader = EntityLoader(repository)
+
+    first, missing, again, last = await asyncio.gather(
+        loader.load("0"), loader.load("missing"), loader.load("0"), loader.load("2")
+    )
+    assert first == again == Entity(id="0", name="Entity 0", price=0.0)
+    assert missing is None
+    assert last == Entity(id="2", name="Entity 2", price=2.0)
+    assert repository.batches == [["0", "missing", "2"]]
+
+    assert await loader.load_many(["2", "1"]) == [last, await repository.get_entity_by_id("1")]
+    assert repository.batches[1:] == [["1"]]
+    assert loader.batches == 2
+
+
+@pytest.mark.asyncio
+async def test_batches_are_split_at_max_batch_size() -> None:
+    """Test a tick with more lookups than max_batch_size makes several calls."""
+    repository = await _seeded(5)
+    loader = EntityLoader(repository, max_batch_size=2)
+
+    entities = await loader.load_many([str(i) for i in range(5)])
+    assert [entity.id for entity in entities if entity is not None] == ["0", "1", "2", "3", "4"]
+    assert repository.batches == [["0", "1"], ["2", "3"], ["4"]]
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_lookup_and_are_not_cached() -> None:
+    """Test a failed get_many fails each of its lookups, and a later lookup retries."""
+    repository = await _seeded(2)
+    repository.error = RuntimeError("backend down")
+    loader = EntityLoader(repository)
+
+    outcomes = await asyncio.gather(loader.load("0"), loader.load("1"), return_exceptions=True)
+    assert [str(outcome) for outcome in outcomes] == ["backend down"] * 2
+
+    repository.error = None
+    assert await loader.load("0") == Entity(id="0", name="Entity 0", price=0.0)
+    assert len(repository.batches) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_lookup_does_not_cancel_the_batch() -> None:
+    """Test cancelling one caller leaves the shared lookup to the others."""
+    repository = await _seeded(1)
+    loader = EntityLoader(repository)
+
+    cancelled = asyncio.ensure_future(loader.load("0"))
+    kept = asyncio.ensure_future(loader.load("0"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await kept == Entity(id="0", name="Entity 0", price=0.0)
+    assert cancelled.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_prime_and_clear_follow_writes() -> None:
+    """Test primed entities are served without a call and cleared ones are fetched again."""
+    repository = await _seeded(1)
+    loader = EntityLoader(repository)
+    await loader.load("0")
+
+    updated = await repository.update(Entity(id="0", name="Renamed", price=1.0))
+    loader.prime(updated)
+    assert await loader.load("0") == updated
+    loader.clear("0")
+    assert await loader.load("0") == updated
+    assert len(repository.batches) == 2
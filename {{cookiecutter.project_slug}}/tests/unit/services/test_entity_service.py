@@ -10,11 +10,22 @@ To create service tests:
 import pytest
 
 from app.domain.errors import EntityNotFoundError
+from app.domain.errors import EntityValidationError
 from app.domain.models import Entity
+from app.domain.models import EntityPatch
+from app.domain.models import EntityQuery
 from app.repositories.memory_repository import MemoryRepository
+from app.services.entity_loader import EntityLoader
 from app.services.entity_service import EntityService
 
 
+class _ForeignCursorRepository(MemoryRepository):
+    """Repository whose cursors have a format of their own."""
+
+    def validate_cursor(self, cursor: str) -> None:
+        raise ValueError(f"Cursor '{cursor}' was not issued here")
+
+
 @pytest.mark.asyncio
 async def test_entity_service_create() -> None:
     """Test creating an entity through service."""
@@ -26,6 +37,33 @@ async def test_entity_service_create() -> None:
     assert created.name == "Test Entity"
 
 
+@pytest.mark.asyncio
+async def test_entity_service_get_entities_by_ids() -> None:
+    """Test getting several entities by ID, in request order without missing or repeated IDs."""
+    service = EntityService(repository=MemoryRepository())
+    for i in range(3):
+        await service.create_entity(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+
+    entities = await service.get_entities_by_ids(["2", "missing", "0", "2"])
+    assert [entity.id for entity in entities] == ["2", "0"]
+
+
+@pytest.mark.asyncio
+async def test_entity_service_get_entities_by_ids_reuses_loader() -> None:
+    """Test a request's loader fetches the IDs once and answers repeated lookups itself."""
+    repository = MemoryRepository()
+    service = EntityService(repository=repository)
+    for i in range(3):
+        await service.create_entity(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+    loader = EntityLoader(repository)
+
+    first = await service.get_entities_by_ids(["0", "1"], loader)
+    again = await service.get_entities_by_ids(["1", "0"], loader)
+    assert [entity.id for entity in first] == ["0", "1"]
+    assert [entity.id for entity in again] == ["1", "0"]
+    assert loader.batches == 1
+
+
 @pytest.mark.asyncio
 async def test_entity_service_get_entities() -> None:
     """Test getting all entities through service."""
@@ -70,6 +108,77 @@ async def test_entity_service_get_entities_with_pagination() -> None:
     assert len(entities) == 2
 
 
+@pytest.mark.asyncio
+async def test_entity_service_get_entities_page() -> None:
+    """Test getting entities with cursor pagination."""
+    repo = MemoryRepository()
+    service = EntityService(repository=repo)
+    for i in range(3):
+        await service.create_entity(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+
+    page = await service.get_entities_page(limit=2)
+    assert [e.id for e in page.entities] == ["0", "1"]
+    assert page.next_cursor is not None
+
+    page = await service.get_entities_page(limit=2, cursor=page.next_cursor)
+    assert [e.id for e in page.entities] == ["2"]
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_entity_service_get_entities_page_invalid_cursor() -> None:
+    """Test that an invalid cursor raises a validation error."""
+    repo = MemoryRepository()
+    service = EntityService(repository=repo)
+    with pytest.raises(EntityValidationError):
+        await service.get_entities_page(limit=2, cursor="bogus")
+
+
+@pytest.mark.asyncio
+async def test_entity_service_validate_cursor_asks_the_repository() -> None:
+    """Test cursors are validated by the injected repository, not by one cursor format."""
+    repo = MemoryRepository()
+    service = EntityService(repository=repo)
+    for i in range(3):
+        await service.create_entity(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+    cursor = (await service.get_entities_page(limit=2)).next_cursor
+    assert cursor is not None
+
+    service.validate_cursor(cursor)
+    with pytest.raises(EntityValidationError):
+        service.validate_cursor("bogus")
+    with pytest.raises(EntityValidationError, match="not issued here"):
+        EntityService(repository=_ForeignCursorRepository()).validate_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_entity_service_count_entities() -> None:
+    """Test counting entities through service."""
+    repo = MemoryRepository()
+    service = EntityService(repository=repo)
+    assert await service.count_entities() == 0
+
+    for i in range(3):
+        await service.create_entity(Entity(id=str(i), name=f"Entity {i}", price=float(i)))
+    assert await service.count_entities() == 3
+
+
+@pytest.mark.asyncio
+async def test_entity_service_get_entities_with_query() -> None:
+    """Test that filters are pushed down to the repository."""
+    repo = MemoryRepository()
+    service = EntityService(repository=repo)
+    for i in range(5):
+        await service.create_entity(
+            Entity(id=str(i), name=f"Entity {i}", price=float(i * 10), in_stock=i % 2 == 0)
+        )
+
+    query = EntityQuery(in_stock=True, min_price=10.0)
+    entities = await service.get_entities(query=query)
+    assert [e.id for e in entities] == ["2", "4"]
+    assert await service.count_entities(query) == 2
+
+
 @pytest.mark.asyncio
 async def test_entity_service_update_entity() -> None:
     """Test updating an entity through service."""
@@ -100,6 +209,19 @@ async def test_entity_service_update_entity_not_found() -> None:
         await service.update_entity(entity)
 
 
+@pytest.mark.asyncio
+async def test_entity_service_patch_entity() -> None:
+    """Test patching changes the given fields and maps a missing entity to not found."""
+    service = EntityService(repository=MemoryRepository())
+    await service.create_entity(Entity(id="1", name="Original Name", price=10.0))
+
+    patched = await service.patch_entity("1", EntityPatch(price=20.0))
+
+    assert (patched.name, patched.price) == ("Original Name", 20.0)
+    with pytest.raises(EntityNotFoundError):
+        await service.patch_entity("2", EntityPatch(price=20.0))
+
+
 @pytest.mark.asyncio
 async def test_entity_service_delete_entity() -> None:
     """Test deleting an entity through service."""
@@ -124,3 +246,45 @@ async def test_entity_service_delete_entity_not_found() -> None:
     with pytest.raises(EntityNotFoundError):
         await service.delete_entity("non-existent")
 
+
+@pytest.mark.asyncio
+async def test_entity_service_create_entities() -> None:
+    """Test creating entities in bulk through service."""
+    repo = MemoryRepository()
+    service = EntityService(repository=repo)
+    entities = [Entity(id=str(i), name=f"Entity {i}", price=float(i)) for i in range(3)]
+
+    results = await service.create_entities(entities)
+
+    assert all(r.ok for r in results)
+    assert await service.count_entities() == 3
+
+
+@pytest.mark.asyncio
+async def test_entity_service_update_entities_maps_missing_to_not_found() -> None:
+    """Test that bulk update failures are reported as domain errors."""
+    repo = MemoryRepository()
+    service = EntityService(repository=repo)
+    await service.create_entity(Entity(id="1", name="Original", price=1.0))
+
+    results = await service.update_entities(
+        [Entity(id="1", name="Updated", price=2.0), Entity(id="2", name="Ghost", price=1.0)]
+    )
+
+    assert results[0].ok
+    assert isinstance(results[1].error, EntityNotFoundError)
+    assert results[1].error.entity_id == "2"
+
+
+@pytest.mark.asyncio
+async def test_entity_service_delete_entities_maps_missing_to_not_found() -> None:
+    """Test that bulk delete reports missing IDs as domain errors."""
+    repo = MemoryRepository()
+    service = EntityService(repository=repo)
+    await service.create_entity(Entity(id="1", name="Entity", price=1.0))
+
+    results = await service.delete_entities(["1", "2"])
+
+    assert results[0].ok
+    assert isinstance(results[1].error, EntityNotFoundError)
+    assert await service.count_entities() == 0